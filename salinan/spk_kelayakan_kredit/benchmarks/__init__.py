@@ -0,0 +1,4 @@
+"""Benchmark jalur panas perhitungan (AHP / SAW) dan database, tanpa UI.
+Usage: python -m benchmarks [--full] [--only nama] [--save-baseline] [--threshold 0.25]
+Lihat benchmarks/run.py.
+"""
@@ -0,0 +1,243 @@
+# benchmarks/cases.py
+import os
+import shutil
+import sqlite3
+import tempfile
+from itertools import chain
+import numpy as np
+from models import database
+from models import nasabah_model
+from models import nasabah_query
+from methods import ahp as ahp_method
+from methods import ahp_parallel
+from methods import saw as saw_method
+from methods import datagen
+from methods import mapping as mapping_method
+from methods import profiles as profile_method
+from methods import snapshot as snapshot_method
+from benchmarks.harness import Case
+
+CRITERIA = ["Usia", "Pendapatan", "Pekerjaan", "Jaminan"]
+COLUMNS = ["usia", "pendapatan", "pekerjaan", "jaminan"]
+WEIGHTS = [0.35, 0.25, 0.2, 0.2]
+BENEFIT = [False, True, True, True]
+SAATY = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9], dtype=float)
+# proses worker untuk case *.parallel (semua CPU; bandingkan dengan case serial yang sama)
+WORKERS = ahp_parallel.resolve_workers(0)
+
+# ukuran per profil: quick untuk cek cepat, full untuk skala produksi
+SIZES = {
+    "quick": {
+        "pairwise_n": [3, 5, 10, 20, 50],
+        "experts": [10, 100, 1000],
+        "rows": [1000, 10000, 100000],
+        "ahp_exact": [100, 300],
+        "ahp_bounded": [1000],
+        "db_rows": [10000, 100000],
+        "move_rows": [1000, 10000],
+    },
+    "full": {
+        "pairwise_n": [3, 5, 10, 20, 30, 50],
+        "experts": [10, 100, 1000, 10000],
+        "rows": [1000, 10000, 100000, 1000000],
+        "ahp_exact": [100, 300, 1000, 2000],
+        "ahp_bounded": [1000, 3000, 10000],
+        "db_rows": [10000, 100000, 1000000],
+        "move_rows": [1000, 10000, 100000],
+    },
+}
+
+
+def random_pairwise(n, rng):
+    """Matriks reciprocal acak skala Saaty (tidak konsisten -> jalur eig)."""
+    A = np.ones((n, n))
+    iu = np.triu_indices(n, 1)
+    vals = rng.choice(SAATY, size=iu[0].size)
+    flip = rng.random(iu[0].size) < 0.5
+    vals = np.where(flip, 1.0 / vals, vals)
+    A[iu] = vals
+    A[(iu[1], iu[0])] = 1.0 / vals
+    return A
+
+
+def code_matrix(n, seed=0, preset="realistic"):
+    """Kode kategori nasabah (n, 4) dengan urutan COLUMNS."""
+    chunk = next(datagen.generate_chunks(n, seed, datagen.make_distribution(preset), chunk_size=max(n, 1)))
+    return np.column_stack([chunk[c] for c in COLUMNS]).astype(float)
+
+
+def mapped_matrix(n, seed=0):
+    """Matriks keputusan setelah mapping ahp_mapping.json (seperti snapshot)."""
+    compiled = mapping_method.get_compiled_mapping()
+    codes = code_matrix(n, seed).astype(np.int64)
+    return np.column_stack([compiled.map_column(c, codes[:, j].tolist())[0] for j, c in enumerate(COLUMNS)])
+
+
+def zero_matrix(n_alt, seed=0):
+    # nilai mapping + sedikit nol supaya kolom memakai matriks rasio (eig / power), bukan closed form
+    rng = np.random.default_rng(seed)
+    return rng.choice([0.0, 1.0, 2.0, 3.0, 3.5, 4.0], size=(n_alt, 4), p=[0.02, 0.2, 0.2, 0.2, 0.18, 0.2])
+
+
+# ---------------- database ----------------
+def _temp_db(n_rows, seed=0):
+    """Database sementara (schema aplikasi) berisi n_rows nasabah sintetis."""
+    tmp = tempfile.mkdtemp(prefix="spk_bench_")
+    database.DB_NAME = os.path.join(tmp, "bench.db")
+    database.init_db()
+    if n_rows:
+        rows = chain.from_iterable(datagen.db_rows(c) for c in datagen.generate_chunks(n_rows, seed))
+        nasabah_model.tambah_nasabah_bulk(rows)
+    return {"dir": tmp}
+
+
+def _drop_db(state):
+    database.close_all()
+    snapshot_method.invalidate()
+    shutil.rmtree(state["dir"], ignore_errors=True)
+
+
+def _insert_setup(n):
+    state = _temp_db(0)
+    chunk = next(datagen.generate_chunks(n, 0, chunk_size=n))
+    state["rows"] = datagen.db_rows(chunk)
+    return state
+
+
+def _move_setup(n):
+    state = _temp_db(n)
+    cur = database.get_connection().cursor()
+    state["ids"] = [r[0] for r in cur.execute("SELECT id FROM nasabah")]
+    return state
+
+
+def _load_setup(n):
+    state = _temp_db(n)
+    state["compiled"] = mapping_method.get_compiled_mapping()
+    return state
+
+
+def _page_setup(n):
+    state = _temp_db(n)
+    state["starts"] = np.random.default_rng(0).integers(0, n, size=20).tolist()
+    return state
+
+
+def _page_jumps(state, sort):
+    # lompat ke 20 posisi acak (drag scrollbar), pager baru tiap run -> tanpa cache page
+    pager = nasabah_query.NasabahPager(sort)
+    for start in state["starts"]:
+        pager.rows(start, 40)
+
+
+# kombinasi filter bar nasabah: nama (FTS5), kategori (index komposit), keduanya
+SEARCHES = (
+    ("pu", {}),
+    ("budi", {}),
+    ("", {"usia": 4, "jaminan": 3}),
+    ("", {"pendapatan": 2, "pekerjaan": 1}),
+    ("sa", {"usia": 2}),
+    ("dewi", {"pendapatan": 4, "jaminan": 1}),
+)
+
+
+def _search(state, sort):
+    # seperti satu pencarian di NasabahFrame: page pertama + jumlah hasil
+    for text, codes in SEARCHES:
+        pager = nasabah_query.NasabahPager(sort)
+        pager.set_filter(text, **codes)
+        pager.rows(0, 200)
+        pager.count()
+
+
+def _matrix_rows_setup(n):
+    # sqlite3.Row seperti hasil SELECT * di aplikasi
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE nasabah (id INTEGER PRIMARY KEY, nama TEXT, usia INTEGER, "
+                 "pekerjaan TEXT, pendapatan REAL, jaminan TEXT)")
+    chunk = next(datagen.generate_chunks(n, 0, chunk_size=n))
+    conn.executemany("INSERT INTO nasabah (nama, usia, pekerjaan, pendapatan, jaminan) VALUES (?, ?, ?, ?, ?)",
+                     datagen.db_rows(chunk))
+    rows = conn.execute("SELECT * FROM nasabah").fetchall()
+    conn.close()
+    return rows
+
+
+def _parallel_setup(n):
+    # pool dibuat (dan proses di-start) sebelum pengukuran
+    M = zero_matrix(n)
+    ahp_method.ahp_full_local_priorities(zero_matrix(8), BENEFIT, mode="exact", workers=WORKERS,
+                                         parallel_min_alt=0)
+    return M
+
+
+def _ahp_full_parallel(M, mode):
+    return ahp_method.ahp_full_local_priorities(M, BENEFIT, mode=mode, workers=WORKERS, parallel_min_alt=0)
+
+
+def _ahp_full_profiles(M):
+    profiles_u, inverse, counts = profile_method.unique_profiles(M)
+    local_u, _, _ = ahp_method.ahp_full_local_priorities(profiles_u, BENEFIT, counts=counts)
+    return local_u.dot(np.asarray(WEIGHTS))[inverse]
+
+
+def get_cases(profile="quick"):
+    s = SIZES[profile]
+    return [
+        Case("ahp.ahp_from_pairwise", s["pairwise_n"],
+             lambda n: random_pairwise(n, np.random.default_rng(n)),
+             lambda A: ahp_method.ahp_from_pairwise(A)),
+        Case("ahp.aggregate_pairwise", s["experts"],
+             lambda k: [random_pairwise(10, np.random.default_rng(i)) for i in range(k)],
+             lambda mats: ahp_method.aggregate_pairwise(mats)),
+        Case("saw.saw", s["rows"],
+             lambda n: code_matrix(n),
+             lambda M: saw_method.saw(M, WEIGHTS, BENEFIT)),
+        Case("saw.build_decision_matrix", s["rows"],
+             _matrix_rows_setup,
+             lambda rows: saw_method.build_decision_matrix(rows, CRITERIA)),
+        Case("ahp_full.exact", s["ahp_exact"],
+             zero_matrix,
+             lambda M: ahp_method.ahp_full_local_priorities(M, BENEFIT, mode="exact")),
+        Case("ahp_full.bounded", s["ahp_bounded"],
+             zero_matrix,
+             lambda M: ahp_method.ahp_full_local_priorities(M, BENEFIT, mode="bounded")),
+        Case("ahp_full.exact.parallel", s["ahp_exact"],
+             _parallel_setup,
+             lambda M: _ahp_full_parallel(M, "exact")),
+        Case("ahp_full.bounded.parallel", s["ahp_bounded"],
+             _parallel_setup,
+             lambda M: _ahp_full_parallel(M, "bounded")),
+        Case("ahp_full.profiles", s["rows"],
+             mapped_matrix,
+             _ahp_full_profiles),
+        Case("db.insert", s["db_rows"],
+             _insert_setup,
+             lambda st: nasabah_model.tambah_nasabah_bulk(st["rows"]),
+             fresh=True, teardown=_drop_db),
+        Case("db.load_snapshot", s["db_rows"],
+             _load_setup,
+             lambda st: snapshot_method.build_snapshot(CRITERIA, st["compiled"]),
+             teardown=_drop_db),
+        Case("db.page_jump.id", s["db_rows"],
+             _page_setup,
+             lambda st: _page_jumps(st, "id"),
+             teardown=_drop_db),
+        Case("db.page_jump.nama", s["db_rows"],
+             _page_setup,
+             lambda st: _page_jumps(st, "nama"),
+             teardown=_drop_db),
+        Case("db.search.id", s["db_rows"],
+             _page_setup,
+             lambda st: _search(st, "id"),
+             teardown=_drop_db),
+        Case("db.search.nama", s["db_rows"],
+             _page_setup,
+             lambda st: _search(st, "nama"),
+             teardown=_drop_db),
+        Case("db.move_to_processed", s["move_rows"],
+             _move_setup,
+             lambda st: nasabah_model.pindahkan_ke_processed(st["ids"]),
+             fresh=True, teardown=_drop_db),
+    ]
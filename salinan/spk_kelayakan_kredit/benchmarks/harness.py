@@ -0,0 +1,97 @@
+# benchmarks/harness.py
+import gc
+import time
+import statistics
+import tracemalloc
+from methods import sysinfo
+
+
+class Case:
+    """
+    Satu benchmark: setup(param) -> state, run(state). fresh=True: setup diulang
+    sebelum tiap pengulangan (untuk benchmark yang mengubah data, mis. insert / move).
+    teardown(state) opsional.
+    """
+
+    def __init__(self, name, params, setup, run, fresh=False, teardown=None, group=None):
+        self.name = name
+        self.params = list(params)
+        self.setup = setup
+        self.run = run
+        self.fresh = fresh
+        self.teardown = teardown
+        self.group = group or name.split(".")[0]
+
+    def key(self, param):
+        return f"{self.name}[{param}]"
+
+
+def _timed(case, state):
+    gc.collect()
+    t0 = time.perf_counter()
+    case.run(state)
+    return time.perf_counter() - t0
+
+
+def measure(case, param, min_time=0.2, max_repeat=5, memory=True):
+    """
+    Jalankan case untuk satu parameter. Pengulangan sampai total >= min_time
+    (paling banyak max_repeat). Peak memori (tracemalloc, termasuk array NumPy)
+    diukur di satu run terpisah supaya tidak memperlambat waktu yang dicatat.
+    """
+    times = []
+    state = None if case.fresh else case.setup(param)
+    try:
+        while len(times) < max_repeat and (not times or sum(times) < min_time):
+            if case.fresh:
+                state = case.setup(param)
+            times.append(_timed(case, state))
+            if case.fresh and case.teardown:
+                case.teardown(state)
+        peak_kb = None
+        if memory:
+            if case.fresh:
+                state = case.setup(param)
+            gc.collect()
+            tracemalloc.start()
+            try:
+                case.run(state)
+                peak_kb = tracemalloc.get_traced_memory()[1] / 1024.0
+            finally:
+                tracemalloc.stop()
+            if case.fresh and case.teardown:
+                case.teardown(state)
+    finally:
+        if not case.fresh and case.teardown and state is not None:
+            case.teardown(state)
+    return {
+        "name": case.name,
+        "param": param,
+        "repeat": len(times),
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "peak_kb": peak_kb,
+        "process_peak_rss_mb": sysinfo.peak_rss_mb(),
+    }
+
+
+def compare(results, baseline, threshold=0.25, min_abs_s=0.005, min_abs_kb=1024.0):
+    """
+    Bandingkan hasil dengan baseline (dict key -> hasil). Regresi jika waktu median /
+    peak memori naik lebih dari threshold (relatif) DAN lebih dari batas absolut
+    (menghindari noise pada benchmark yang sangat cepat). Return list regresi.
+    """
+    flagged = []
+    for key, res in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        checks = [("median_s", min_abs_s)]
+        if res.get("peak_kb") is not None and base.get("peak_kb") is not None:
+            checks.append(("peak_kb", min_abs_kb))
+        for metric, min_abs in checks:
+            old, new = base[metric], res[metric]
+            if new > old * (1.0 + threshold) and new - old > min_abs:
+                flagged.append({"key": key, "metric": metric, "baseline": old, "current": new,
+                                "ratio": new / old if old else float("inf")})
+    return flagged
@@ -0,0 +1,131 @@
+"""Jalankan benchmark, simpan hasil JSON per commit, bandingkan dengan baseline.
+Usage: python -m benchmarks [--full] [--only nama ...] [--no-mem] [--threshold 0.25]
+                            [--baseline file] [--save-baseline] [--check]
+  --full          : ukuran sampai 1e6 baris (default: profil quick)
+  --only nama     : hanya case yang namanya mengandung teks ini (bisa diulang)
+  --no-mem        : lewati pengukuran peak memori (tracemalloc)
+  --save-baseline : simpan hasil ini sebagai baseline (default benchmarks/baseline.json)
+  --check         : exit code 1 jika ada regresi terhadap baseline
+Hasil disimpan di benchmarks/results/<commit>[-dirty]-<profil>.json.
+"""
+import sys
+import os
+import json
+import argparse
+import time
+import platform
+import subprocess
+import numpy as np
+
+# pastikan bisa akses models / methods
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from models import database
+from benchmarks import harness
+from benchmarks.cases import get_cases
+
+HERE = os.path.join(ROOT, "benchmarks")
+RESULTS_DIR = os.path.join(HERE, "results")
+BASELINE = os.path.join(HERE, "baseline.json")
+
+
+def git_commit():
+    """(hash pendek, ada perubahan belum di-commit) atau ("nogit", False)."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip() != ""
+        return commit, dirty
+    except Exception:
+        return "nogit", False
+
+
+def parse_args(argv=None):
+    """Opsi command line (lihat docstring modul); opsi tidak dikenal -> error, bukan jalan semua case."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Jalankan benchmark dan bandingkan dengan baseline.")
+    parser.add_argument("--full", action="store_true", help="ukuran sampai 1e6 baris (default: profil quick)")
+    parser.add_argument("--only", action="append", metavar="nama",
+                        help="hanya case yang namanya mengandung teks ini (bisa diulang)")
+    parser.add_argument("--no-mem", action="store_true", help="lewati pengukuran peak memori (tracemalloc)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="batas regresi relatif (default 0.25)")
+    parser.add_argument("--baseline", default=BASELINE, metavar="file", help="file baseline JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="simpan hasil ini sebagai baseline")
+    parser.add_argument("--check", action="store_true", help="exit code 1 jika ada regresi terhadap baseline")
+    return parser.parse_args(argv)
+
+
+def run_all(cases, only=None, memory=True, log=print):
+    results = {}
+    for case in cases:
+        if only and not any(o in case.name for o in only):
+            continue
+        for param in case.params:
+            res = harness.measure(case, param, memory=memory)
+            results[case.key(param)] = res
+            peak = f"{res['peak_kb'] / 1024:9.1f} MB" if res["peak_kb"] is not None else "        -"
+            log(f"{case.key(param):40s} median {res['median_s'] * 1000:10.2f} ms  "
+                f"min {res['min_s'] * 1000:10.2f} ms  peak {peak}  (x{res['repeat']})")
+    return results
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    profile = "full" if args.full else "quick"
+    threshold = args.threshold
+    baseline_path = args.baseline
+
+    commit, dirty = git_commit()
+    print(f"Benchmark profil={profile} commit={commit}{' (dirty)' if dirty else ''}")
+    db_name = database.DB_NAME
+    try:
+        results = run_all(get_cases(profile), only=args.only, memory=not args.no_mem)
+    finally:
+        database.DB_NAME = db_name
+
+    regressions = []
+    if os.path.exists(baseline_path):
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = harness.compare(results, baseline.get("results", {}), threshold)
+        print(f"\nBaseline: {baseline.get('commit')} ({baseline.get('created_at')}), threshold {threshold:.0%}")
+        for r in regressions:
+            unit = "ms" if r["metric"] == "median_s" else "KB"
+            scale = 1000.0 if r["metric"] == "median_s" else 1.0
+            print(f"  REGRESI {r['key']} {r['metric']}: {r['baseline'] * scale:.2f} -> "
+                  f"{r['current'] * scale:.2f} {unit} (x{r['ratio']:.2f})")
+        if not regressions:
+            print("  tidak ada regresi")
+    else:
+        print(f"\nBelum ada baseline ({baseline_path}); jalankan dengan --save-baseline.")
+
+    report = {
+        "commit": commit,
+        "dirty": dirty,
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "profile": profile,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sqlite": database.sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+        "regressions": regressions,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out = os.path.join(RESULTS_DIR, f"{commit}{'-dirty' if dirty else ''}-{profile}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Hasil disimpan: {out}")
+    if args.save_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline disimpan: {baseline_path}")
+    if args.check and regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
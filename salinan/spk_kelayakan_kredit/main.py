@@ -4,6 +4,8 @@ from ttkbootstrap.constants import *
 import tkinter as tk
 from tkinter import messagebox
 
+from models import database, nasabah_query
+
 # UI frames (from ui package)
 from ui.login import LoginFrame
 from ui.dashboard_ui import DashboardFrame
@@ -137,5 +139,9 @@ class App(tb.Window):
             self.current_theme = self.alt_theme
 
 if __name__ == "__main__":
+    # koneksi pool + schema disiapkan sekali saat start
+    database.init_db()
+    # database lama tanpa index pencarian: diisi di thread latar, bukan menahan start
+    nasabah_query.start_search_index_build()
     app = App()
     app.mainloop()
\ No newline at end of file
@@ -6,32 +6,103 @@ RI_TABLE = {
     6: 1.24, 7: 1.32, 8: 1.41, 9: 1.45, 10: 1.49
 }
 
-def ahp_from_pairwise(matrix):
+def is_consistent_matrix(matrix, rtol=1e-9):
+    """
+    Cek apakah matriks pairwise positif dan konsisten sempurna (a_ij = w_i / w_j).
+    Syaratnya a_ij == a_i0 * a_0j untuk semua i, j  -> cukup O(n^2), tanpa eig.
+    """
+    M = np.asarray(matrix, dtype=float)
+    if M.ndim != 2 or M.shape[0] != M.shape[1] or M.size == 0:
+        return False
+    if not np.all(M > 0) or not np.all(np.isfinite(M)):
+        return False
+    return bool(np.allclose(M, np.outer(M[:, 0], M[0, :]), rtol=rtol, atol=0.0))
+
+
+def ahp_from_pairwise(matrix, check_consistent=True, solver="eig", tol=1e-10, max_iter=1000,
+                      x0=None, return_info=False):
     """
     Hitung bobot, CI, CR dari matriks perbandingan berpasangan (square matrix).
     Menggunakan eigenvector utama.
+    Jika matriks konsisten sempurna (mis. dibangun dari rasio nilai), eigenvector
+    utama = kolom pertama yang dinormalisasi dan lambda_max = n, jadi eig dilewati.
+    check_consistent=False memaksa jalur solver (dipakai juga sebagai verifikasi).
+
+    solver:
+      - "eig"      : np.linalg.eig penuh (default)
+      - "power"    : power iteration, hanya lambda_max + eigenvector utama
+      - "rayleigh" : power iteration singkat lalu Rayleigh quotient iteration
+    tol, max_iter: kriteria berhenti untuk "power" / "rayleigh"
+    x0: vektor awal (warm start), mis. bobot sebelumnya saat satu nilai Saaty diubah
+    return_info=True -> return tambahan dict {"solver", "iterations", "residual", "lambda_max"}
     """
     M = np.array(matrix, dtype=float)
     n = M.shape[0]
     if n == 0 or M.shape[1] != n:
         raise ValueError("Pairwise matrix harus berbentuk n x n dan n>0")
+    if solver not in ("eig", "power", "rayleigh"):
+        raise ValueError(f"Solver tidak dikenal: {solver}")
 
-    eigvals, eigvecs = np.linalg.eig(M)
-    # pilih eigenvector yang punya eigenvalue terbesar (real part)
-    max_idx = np.argmax(eigvals.real)
-    max_eigval = eigvals.real[max_idx]
-    principal_vec = eigvecs[:, max_idx].real
-    # pastikan bobot positif dan sum=1
-    principal_vec = np.abs(principal_vec)
-    weights = principal_vec / principal_vec.sum()
+    if check_consistent and is_consistent_matrix(M):
+        col = M[:, 0]
+        weights = col / col.sum()
+        info = {"solver": "consistent", "iterations": 0, "residual": 0.0, "lambda_max": float(n)}
+        return (weights, 0.0, 0.0, info) if return_info else (weights, 0.0, 0.0)
+
+    if solver == "eig":
+        eigvals, eigvecs = np.linalg.eig(M)
+        # pilih eigenvector yang punya eigenvalue terbesar (real part)
+        max_idx = np.argmax(eigvals.real)
+        lambda_max = eigvals.real[max_idx]
+        principal_vec = eigvecs[:, max_idx].real
+        # pastikan bobot positif dan sum=1
+        principal_vec = np.abs(principal_vec)
+        weights = principal_vec / principal_vec.sum()
+        iterations = 0
+    else:
+        lambda_max, weights, iterations = _principal_eigen_iterative(M, solver, tol, max_iter, x0)
 
     # consistency
-    lambda_max = max_eigval
-    CI = (lambda_max - n) / (n - 1) if n > 1 else 0.0
-    RI = RI_TABLE.get(n, 1.49)
-    CR = CI / RI if RI != 0 else 0.0
+    CI, CR = _consistency(lambda_max, n)
+    if not return_info:
+        return weights, CI, CR
+    residual = float(np.abs(M.dot(weights) - lambda_max * weights).sum() / abs(lambda_max)) if lambda_max else 0.0
+    info = {"solver": solver, "iterations": iterations, "residual": residual, "lambda_max": float(lambda_max)}
+    return weights, CI, CR, info
+
+
+def _principal_eigen_iterative(M, solver, tol, max_iter, x0):
+    """lambda_max, eigenvector utama (sum = 1) dan jumlah iterasi via power / Rayleigh."""
+    n = M.shape[0]
+    if x0 is not None and np.asarray(x0).size != n:
+        x0 = None
+    # matriks positif: eigenvalue Perron dominan tegas, tidak perlu shift
+    shift = 0.0 if np.all(M > 0) else None
+    if solver == "power":
+        lam, vec, iters, _ = power_iteration(M.dot, n, tol=tol, max_iter=max_iter, x0=x0, shift=shift)
+        return lam, vec, iters
+
+    # Rayleigh quotient iteration: mulai dari perkiraan power iteration kasar agar
+    # konvergen ke eigenvalue Perron (bukan eigenvalue lain)
+    lam, x, iters, _ = power_iteration(M.dot, n, tol=min(1e-3, tol * 1e7), max_iter=max_iter, x0=x0, shift=shift)
+    eye = np.eye(n)
+    for _ in range(max_iter - iters):
+        residual = np.abs(M.dot(x) - lam * x).sum() / abs(lam)
+        if residual < tol:
+            break
+        iters += 1
+        try:
+            y = np.linalg.solve(M - lam * eye, x)
+        except np.linalg.LinAlgError:
+            # shift tepat di eigenvalue -> x sudah eigenvector
+            break
+        if not np.all(np.isfinite(y)) or y.sum() == 0:
+            break
+        x = np.abs(y / y.sum())
+        x = x / x.sum()
+        lam = float(x.dot(M.dot(x)) / x.dot(x))
+    return lam, x, iters
 
-    return weights, CI, CR
 
 def ahp_from_weights(db_weights):
     """
@@ -56,6 +127,323 @@ def ahp_from_weights(db_weights):
     weights, CI, CR = ahp_from_pairwise(pairwise)
     return weights, CI, CR, pairwise
 
+def ahp_from_values(values, benefit=True):
+    """
+    Bobot lokal alternatif untuk satu kriteria langsung dari kolom nilai, O(n).
+
+    Matriks a_ik = v_i / v_k (benefit) atau v_k / v_i (cost) selalu konsisten
+    jika semua nilai > 0, sehingga eigenvector utamanya = v (atau 1/v) yang
+    dinormalisasi dan CI = CR = 0. Matriks tidak perlu dibangun sama sekali.
+    Jika ada nilai nol (sel diisi 1e9, tidak konsisten), fallback ke
+    build_ratio_matrix + ahp_from_pairwise (eig).
+
+    Returns: weights, CI, CR (sama seperti ahp_from_pairwise)
+    """
+    v = np.array(values, dtype=float).ravel()
+    if v.size == 0:
+        raise ValueError("values kosong")
+    if np.all(v > 0) and np.all(np.isfinite(v)):
+        p = v if benefit else 1.0 / v
+        return p / p.sum(), 0.0, 0.0
+    return ahp_from_pairwise(build_ratio_matrix(v, benefit), check_consistent=False)
+
+
+def build_ratio_matrices(matrix, benefit_flags=None, big=1e9):
+    """
+    Bangun matriks pairwise antar alternatif untuk SEMUA kriteria sekaligus
+    (NumPy broadcasting, tanpa loop i/k per sel).
+
+    matrix: array shape (n_alt, n_crit) berisi nilai (sudah dimapping)
+    benefit_flags: list bool len n_crit (True = benefit, False = cost)
+    big: nilai pengganti untuk pembagian dengan nol
+
+    Aturan per sel sama dengan loop lama:
+      - v_i == 0 dan v_k == 0     -> 1
+      - v_k == 0                  -> big
+      - benefit                   -> v_i / v_k
+      - cost                      -> v_k / v_i (big jika v_i == 0)
+
+    Returns: array shape (n_crit, n_alt, n_alt)
+    """
+    M = np.array(matrix, dtype=float)
+    if M.ndim == 1:
+        M = M[:, None]
+    n_alt, n_crit = M.shape
+    if benefit_flags is None:
+        benefit_flags = [True] * n_crit
+    if len(benefit_flags) != n_crit:
+        raise ValueError("benefit_flags harus panjangnya sama dengan jumlah kriteria")
+
+    vi = M.T[:, :, None]   # (n_crit, n_alt, 1)
+    vk = M.T[:, None, :]   # (n_crit, 1, n_alt)
+    benefit = np.array(benefit_flags, dtype=bool)[:, None, None]
+    return _ratio_cells(vi, vk, benefit, big)
+
+
+def _ratio_cells(vi, vk, benefit, big):
+    """Isi sel rasio untuk v_i (baris) dan v_k (kolom) yang sudah di-broadcast."""
+    # benefit -> v_i / v_k, cost -> v_k / v_i
+    num = np.where(benefit, vi, vk)
+    den = np.where(benefit, vk, vi)
+    pair = np.full(num.shape, big, dtype=float)
+    np.divide(num, den, out=pair, where=(den != 0))
+
+    # v_k == 0 selalu big (untuk cost juga), kecuali dua-duanya nol -> 1
+    pair[np.broadcast_to(vk == 0, pair.shape)] = big
+    pair[np.broadcast_to((vi == 0) & (vk == 0), pair.shape)] = 1.0
+    return pair
+
+
+def build_ratio_matrix(values, benefit=True, big=1e9):
+    """Versi satu kriteria dari build_ratio_matrices: values shape (n_alt,) -> (n_alt, n_alt)."""
+    return build_ratio_matrices(np.asarray(values, dtype=float)[:, None], [benefit], big=big)[0]
+
+
+# perkiraan byte per sel saat matriks rasio n_alt x n_alt dibangun (hasil + temporaries)
+_BYTES_PER_CELL = 40
+
+
+def ratio_matvec(values, x, benefit=True, big=1e9):
+    """
+    Hitung A @ x untuk matriks rasio A (aturan sama dengan build_ratio_matrix)
+    tanpa membangun A (matrix-free, O(n) waktu dan memori).
+
+    Dengan Z = {k: v_k == 0}, P = {k: v_k != 0}:
+      benefit: (Ax)_i = v_i * sum_P(x_k / v_k) + (1 jika v_i == 0 else big) * sum_Z(x_k)
+      cost   : v_i != 0 -> sum_P(v_k x_k) / v_i + big * sum_Z(x_k)
+               v_i == 0 -> sum_Z(x_k) + big * sum_P(x_k)
+    """
+    v = np.asarray(values, dtype=float).ravel()
+    x = np.asarray(x, dtype=float).ravel()
+    zero = (v == 0)
+    s_zero = x[zero].sum()
+    safe_v = np.where(zero, 1.0, v)
+    if benefit:
+        t = (x[~zero] / v[~zero]).sum()
+        return v * t + np.where(zero, 1.0, big) * s_zero
+    u = (v[~zero] * x[~zero]).sum()
+    s_pos = x[~zero].sum()
+    return np.where(zero, s_zero + big * s_pos, u / safe_v + big * s_zero)
+
+
+def power_iteration(matvec, n, tol=1e-10, max_iter=1000, x0=None, shift=None):
+    """
+    Power iteration untuk eigenvalue terbesar dari operator non-negatif.
+    matvec: fungsi x -> A @ x (boleh matrix-free)
+    shift: iterasi dilakukan pada (A + shift*I) agar pasangan eigenvalue +/-
+           (umum pada matriks rasio dengan nilai nol) tidak berosilasi.
+           None = pakai estimasi lambda saat ini (x <- (Ax/lambda + x) / 2).
+
+    Returns: lambda_max, vector (sum = 1), jumlah iterasi, residual
+    residual = ||A x - lambda x||_1 / lambda pada iterasi terakhir.
+    """
+    if x0 is None:
+        x = np.full(n, 1.0 / n)
+    else:
+        x = np.abs(np.asarray(x0, dtype=float).ravel())
+        if x.size != n or x.sum() == 0:
+            raise ValueError("x0 harus berukuran n dan tidak semua nol")
+        x = x / x.sum()
+
+    lam = 0.0
+    residual = np.inf
+    it = 0
+    for it in range(1, max_iter + 1):
+        y = matvec(x)
+        lam = float(y.sum())
+        if lam == 0:
+            break
+        residual = float(np.abs(y - lam * x).sum() / abs(lam))
+        y = y + (lam if shift is None else shift) * x
+        x = y / y.sum()
+        if residual < tol:
+            break
+    return lam, x, it, residual
+
+
+def _consistency(lambda_max, n):
+    CI = (lambda_max - n) / (n - 1) if n > 1 else 0.0
+    RI = RI_TABLE.get(n, 1.49)
+    CR = CI / RI if RI != 0 else 0.0
+    return CI, CR
+
+
+def ahp_from_pairwise_batch(matrices, check_consistent=True):
+    """
+    Versi batch dari ahp_from_pairwise untuk tumpukan matriks (mis. satu per
+    kriteria, per ahli, atau per skenario cabang) dalam satu panggilan
+    np.linalg.eig bertumpuk.
+
+    matrices: array shape (k, n, n)
+    Returns:
+      weights: array shape (k, n), tiap baris sum = 1
+      lambda_max, CI, CR: array shape (k,)
+    Matriks yang konsisten sempurna (jika check_consistent) tidak ikut eig.
+    """
+    A = np.array(matrices, dtype=float)
+    if A.ndim == 2:
+        A = A[None, :, :]
+    if A.ndim != 3 or A.shape[1] != A.shape[2] or A.shape[1] == 0:
+        raise ValueError("Pairwise matrices harus berbentuk (k, n, n) dan n>0")
+    k, n, _ = A.shape
+
+    weights = np.zeros((k, n), dtype=float)
+    lambda_max = np.zeros(k, dtype=float)
+
+    consistent = np.zeros(k, dtype=bool)
+    if check_consistent and k > 0:
+        positive = np.all((A > 0) & np.isfinite(A), axis=(1, 2))
+        outer = A[:, :, :1] * A[:, :1, :]
+        with np.errstate(invalid="ignore"):
+            close = np.all(np.isclose(A, outer, rtol=1e-9, atol=0.0), axis=(1, 2))
+        consistent = positive & close
+    if consistent.any():
+        col = A[consistent, :, 0]
+        weights[consistent] = col / col.sum(axis=1, keepdims=True)
+        lambda_max[consistent] = n
+
+    rest = ~consistent
+    if rest.any():
+        eigvals, eigvecs = np.linalg.eig(A[rest])
+        max_idx = np.argmax(eigvals.real, axis=1)
+        lambda_max[rest] = np.take_along_axis(eigvals.real, max_idx[:, None], axis=1)[:, 0]
+        vecs = np.abs(np.take_along_axis(eigvecs.real, max_idx[:, None, None], axis=2)[:, :, 0])
+        weights[rest] = vecs / vecs.sum(axis=1, keepdims=True)
+
+    CI, CR = _consistency(lambda_max, n)
+    # n == 1 -> _consistency memberi skalar 0.0
+    CI = np.zeros(k) + CI
+    CR = np.zeros(k) + CR
+    return weights, lambda_max, CI, CR
+
+
+def _local_column(col, c, benefit, method, n_total, tol=1e-10, max_iter=1000):
+    """
+    Bobot lokal satu kolom kriteria lewat matriks rasio ("eig") atau power iteration
+    matrix-free ("power"). c: jumlah alternatif per baris. Return (bobot, CR, info).
+    """
+    if method == "eig":
+        A = build_ratio_matrix(col, benefit) * c[None, :]
+        w, lam, _, _ = ahp_from_pairwise_batch(A[None, :, :], check_consistent=False)
+        w, lam, iters, residual = w[0], lam[0], 0, 0.0
+    else:
+        matvec = (lambda x: ratio_matvec(col, c * x, benefit))
+        lam, w, iters, residual = power_iteration(matvec, col.size, tol=tol, max_iter=max_iter)
+    info = {"method": method, "iterations": iters, "residual": residual}
+    return w / c.dot(w), float(_consistency(lam, n_total)[1]), info
+
+
+def ahp_full_local_priorities(matrix, benefit_flags, mode="auto", memory_limit_bytes=None,
+                              tol=1e-10, max_iter=1000, counts=None, progress=None, workers=1,
+                              parallel_min_alt=None):
+    """
+    Bobot lokal alternatif untuk semua kriteria (AHP Full).
+
+    mode:
+      - "exact"   : kolom dengan nilai nol dihitung lewat matriks n_alt x n_alt + eig
+                    (semua kolom tsb dalam satu panggilan ahp_from_pairwise_batch)
+      - "bounded" : kolom dengan nilai nol dihitung lewat power iteration atas
+                    operator matrix-free (ratio_matvec, memori O(n_alt))
+      - "auto"    : "exact" jika matriks muat di memory_limit_bytes, selain itu "bounded"
+    Kolom yang semua nilainya > 0 selalu memakai closed form (O(n_alt)),
+    dihitung sekaligus untuk semua kolom tsb.
+    memory_limit_bytes: batas memori untuk matriks (None = tanpa batas)
+    counts: jika matrix berisi profil unik (lihat methods/profiles.py), jumlah
+            alternatif asli per profil. Hasil sama dengan menghitung matriks
+            n_total x n_total penuh, tetapi eigenproblem cukup berukuran
+            n_profile: A x = lambda x  <=>  (F diag(c)) y = lambda y, x = y[profil].
+            Bobot dinormalisasi sehingga sum(counts * w) = 1 dan CI/CR memakai n_total.
+    progress: fn(kriteria_selesai, n_crit) opsional, dipanggil setelah tiap blok / kriteria
+              (exception dari fn, mis. pembatalan, menghentikan perhitungan)
+    workers: > 1 (atau 0 / None = jumlah CPU) -> kolom eig / power dihitung paralel per
+             kriteria di process pool (methods/ahp_parallel.py) jika ada >= 2 kolom dan
+             n_alt >= parallel_min_alt (None = ahp_parallel.DEFAULT_MIN_ALT); selain itu serial.
+             Hanya untuk pemakaian library / benchmark: aplikasi selalu serial (lihat ahp_parallel)
+
+    Returns:
+      local: array shape (n_alt, n_crit) (atau (n_profile, n_crit) jika counts)
+      crs: list CR per kriteria
+      info: dict per kriteria {"method", "iterations", "residual"}
+    """
+    M = np.array(matrix, dtype=float)
+    n_alt, n_crit = M.shape
+    if len(benefit_flags) != n_crit:
+        raise ValueError("benefit_flags harus panjangnya sama dengan jumlah kriteria")
+    if counts is None:
+        c = np.ones(n_alt, dtype=float)
+    else:
+        c = np.asarray(counts, dtype=float).ravel()
+        if c.size != n_alt:
+            raise ValueError("counts harus panjangnya sama dengan jumlah baris matrix")
+    n_total = int(round(c.sum()))
+    if mode not in ("auto", "exact", "bounded"):
+        raise ValueError(f"Mode AHP Full tidak dikenal: {mode}")
+
+    benefit = np.array(benefit_flags, dtype=bool)
+    closed = np.all(M > 0, axis=0) & np.all(np.isfinite(M), axis=0)
+    need_matrix = np.flatnonzero(~closed)
+
+    full_bytes = n_alt * n_alt * _BYTES_PER_CELL * len(need_matrix)
+    if mode == "auto":
+        mode = "exact" if memory_limit_bytes is None or full_bytes <= memory_limit_bytes else "bounded"
+    elif mode == "exact" and memory_limit_bytes is not None and full_bytes > memory_limit_bytes:
+        raise ValueError(f"Matriks {len(need_matrix)} x {n_alt}x{n_alt} melebihi batas memori "
+                         f"({memory_limit_bytes / 2**20:.0f} MB). Gunakan mode 'bounded'.")
+
+    local = np.zeros((n_alt, n_crit), dtype=float)
+    crs = np.zeros(n_crit, dtype=float)
+    info = [None] * n_crit
+
+    # closed form untuk semua kolom positif sekaligus
+    if closed.any():
+        P = M[:, closed]
+        P = np.where(benefit[closed], P, 1.0 / P)
+        local[:, closed] = P / c.dot(P)
+        for j in np.flatnonzero(closed):
+            info[j] = {"method": "closed_form", "iterations": 0, "residual": 0.0}
+    done = int(closed.sum())
+    if progress is not None:
+        progress(done, n_crit)
+
+    method = "eig" if mode == "exact" else "power"
+    if len(need_matrix) > 1 and workers != 1:
+        from methods import ahp_parallel
+        if ahp_parallel.use_parallel(n_alt, len(need_matrix), workers, method, parallel_min_alt):
+            cols = ahp_parallel.local_columns(M, c, need_matrix, benefit, method, n_total,
+                                              tol, max_iter, workers)
+            try:
+                for j, w, cr, col_info in cols:
+                    local[:, j], crs[j], info[j] = w, cr, col_info
+                    done += 1
+                    if progress is not None:
+                        progress(done, n_crit)
+            finally:
+                # pembatalan di progress: task yang belum jalan dibatalkan, shared memory dilepas
+                cols.close()
+            return local, crs.tolist(), info
+
+    if len(need_matrix) and mode == "exact":
+        stack = build_ratio_matrices(M[:, need_matrix], benefit[need_matrix])
+        if counts is not None:
+            stack *= c[None, None, :]
+        w, lam, _, _ = ahp_from_pairwise_batch(stack, check_consistent=False)
+        del stack
+        local[:, need_matrix] = (w / w.dot(c)[:, None]).T
+        crs[need_matrix] = _consistency(lam, n_total)[1]
+        for j in need_matrix:
+            info[j] = {"method": "eig", "iterations": 0, "residual": 0.0}
+        if progress is not None:
+            progress(n_crit, n_crit)
+    else:
+        for j in need_matrix:
+            local[:, j], crs[j], info[j] = _local_column(M[:, j], c, bool(benefit[j]), "power",
+                                                         n_total, tol, max_iter)
+            done += 1
+            if progress is not None:
+                progress(done, n_crit)
+    return local, crs.tolist(), info
+
+
 def aggregate_pairwise(matrices):
     """
     matrices: list of 2D lists/numpy arrays (all same shape NxN)
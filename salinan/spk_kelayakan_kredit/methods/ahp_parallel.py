@@ -0,0 +1,102 @@
+# methods/ahp_parallel.py
+# Jalur library saja (dipanggil lewat ahp_full_local_priorities(workers=...) dan
+# benchmark ahp_full.*.parallel), tidak dari aplikasi: dengan ahp_mapping.json bawaan
+# semua nilai mapping > 0 sehingga tiap kolom memakai closed form, dan dedup profil
+# membatasi n_alt <= 192 (< DEFAULT_MIN_ALT). Keuntungan hanya terukur di mesin
+# multi-core dengan matriks yang memang butuh eig / power (bandingkan case serial).
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+import numpy as np
+from methods import ahp as ahp_method
+
+# n_alt minimum per metode; di bawah ini overhead process pool lebih besar dari
+# eig (O(n^3)) / power iteration matrix-free (O(n) per iterasi)-nya
+DEFAULT_MIN_ALT = {"eig": 300, "power": 100000}
+
+# pool dipakai ulang antar perhitungan (start proses hanya sekali)
+_pool = None
+_pool_workers = 0
+_lock = threading.Lock()
+
+
+def resolve_workers(workers):
+    """None / 0 / 'auto' -> jumlah CPU; selain itu int >= 1."""
+    if workers in (None, 0, "auto"):
+        return os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+def use_parallel(n_alt, n_columns, workers, method="eig", min_alt=None):
+    """True jika AHP Full layak dihitung paralel (>= 2 kolom, >= 2 worker, n_alt cukup besar)."""
+    min_alt = DEFAULT_MIN_ALT.get(method, 0) if min_alt is None else min_alt
+    return n_columns > 1 and resolve_workers(workers) > 1 and n_alt >= min_alt
+
+
+def get_pool(workers):
+    """ProcessPoolExecutor bersama (spawn: aman dipanggil dari thread worker UI)."""
+    global _pool, _pool_workers
+    n = resolve_workers(workers)
+    with _lock:
+        if _pool is None or _pool_workers != n:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = ProcessPoolExecutor(max_workers=n, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = n
+        return _pool
+
+
+def shutdown():
+    global _pool, _pool_workers
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool, _pool_workers = None, 0
+
+
+def _column_task(shm_name, shape, j, benefit, method, n_total, tol, max_iter):
+    # matriks keputusan (+ kolom counts terakhir) dibaca dari shared memory, bukan di-pickle
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        data = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        col = data[:, j].copy()
+        c = data[:, -1].copy()
+        del data
+    finally:
+        shm.close()
+    w, cr, info = ahp_method._local_column(col, c, benefit, method, n_total, tol, max_iter)
+    return j, w, cr, info
+
+
+def local_columns(M, c, columns, benefit, method, n_total, tol=1e-10, max_iter=1000, workers=None):
+    """
+    Generator (j, bobot, CR, info) untuk tiap kolom di columns, satu task per kriteria
+    di process pool, urut selesai. Hasil sama dengan jalur serial ahp_full_local_priorities.
+    close() sebelum habis: task yang belum jalan dibatalkan.
+    """
+    n_alt, n_crit = M.shape
+    shm = shared_memory.SharedMemory(create=True, size=max(1, n_alt * (n_crit + 1) * 8))
+    futures = []
+    try:
+        data = np.ndarray((n_alt, n_crit + 1), dtype=np.float64, buffer=shm.buf)
+        data[:, :n_crit] = M
+        data[:, -1] = c
+        del data
+        pool = get_pool(workers)
+        futures = [pool.submit(_column_task, shm.name, (n_alt, n_crit + 1), int(j), bool(benefit[j]),
+                               method, n_total, tol, max_iter) for j in columns]
+        for fut in as_completed(futures):
+            yield fut.result()
+    except BrokenProcessPool:
+        # proses worker mati (mis. kehabisan memori): pool dibuat ulang di panggilan berikutnya
+        shutdown()
+        raise
+    finally:
+        for fut in futures:
+            fut.cancel()
+        # task yang sedang jalan sudah memegang handle sendiri
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,187 @@
+# methods/datagen.py
+import csv
+import numpy as np
+
+# kolom kategori nasabah (kode 1..4, aturan encoding = scripts/seed_nasabah.py)
+COLUMNS = ("usia", "pekerjaan", "pendapatan", "jaminan")
+N_CODES = 4
+
+FIRST = ["Andi", "Budi", "Citra", "Dewi", "Eko", "Fajar", "Gita", "Hendra", "Intan", "Joko",
+         "Kiki", "Lina", "Made", "Nisa", "Oka", "Putra", "Qori", "Rian", "Sinta", "Tono",
+         "Uli", "Vina", "Wahyu", "Xena", "Yoga", "Zaki", "Amanda", "Bayu", "Clara", "Dani"]
+LAST = ["Pratama", "Santoso", "Wijaya", "Rahma", "Saputra", "Kusuma", "Suryanto", "Irawan", "Putri", "Halim"]
+
+# distribusi kode 1..4 per kolom (probabilitas kode 1, 2, 3, 4)
+PRESETS = {
+    "uniform": {c: [0.25, 0.25, 0.25, 0.25] for c in COLUMNS},
+    # kira-kira sama dengan tools/add_random_nasabah.py versi lama (usia 20-60, pilihan acak)
+    "realistic": {
+        "usia": [0.0, 0.12, 0.37, 0.51],
+        "pekerjaan": [0.2, 0.4, 0.2, 0.2],
+        "pendapatan": [1 / 7, 2 / 7, 2 / 7, 2 / 7],
+        "jaminan": [0.25, 0.25, 0.25, 0.25],
+    },
+    # data produksi yang berat sebelah: sebagian besar nasabah punya profil yang sama
+    "skewed": {c: [0.85, 0.1, 0.04, 0.01] for c in COLUMNS},
+    # semua baris identik (kasus tepi: max == min, semua skor sama / tie)
+    "identical": {c: [0.0, 1.0, 0.0, 0.0] for c in COLUMNS},
+}
+
+# nilai asli per kode untuk fixture --raw (kebalikan normalize_* / encode_* di seed_nasabah.py)
+USIA_RANGES = {4: (20, 40), 3: (41, 55), 2: (56, 65), 1: (66, 75)}
+PENDAPATAN_RANGES = {4: (6000000, 12000000), 3: (4000000, 5950000), 2: (2000000, 3950000), 1: (1000000, 1950000)}
+PEKERJAAN_TEXT = {4: ["PNS"], 3: ["Karyawan"], 2: ["Wiraswasta", "Petani"], 1: ["Mahasiswa"]}
+JAMINAN_TEXT = {4: ["Sertifikat"], 3: ["BPKB Mobil"], 2: ["BPKB Motor"], 1: ["-"]}
+
+
+def parse_probs(spec):
+    """
+    '0.7,0.2,0.05,0.05' -> probabilitas kode 1..4 (dinormalisasi);
+    satu angka '3' -> semua baris kode 3 (kolom identik).
+    """
+    if isinstance(spec, str):
+        parts = [p for p in spec.replace(";", ",").split(",") if p.strip()]
+        spec = [float(p) for p in parts]
+    spec = list(spec)
+    if len(spec) == 1:
+        code = int(spec[0])
+        if not 1 <= code <= N_CODES:
+            raise ValueError(f"Kode harus 1..{N_CODES}: {spec[0]}")
+        p = np.zeros(N_CODES)
+        p[code - 1] = 1.0
+        return p
+    p = np.asarray(spec, dtype=float)
+    if p.size != N_CODES or (p < 0).any() or p.sum() <= 0:
+        raise ValueError(f"Distribusi harus {N_CODES} angka >= 0 (kode 1..{N_CODES}): {spec}")
+    return p / p.sum()
+
+
+def make_distribution(preset="realistic", overrides=None):
+    """Distribusi per kolom dari preset + override {kolom: spec} (lihat parse_probs)."""
+    if preset not in PRESETS:
+        raise ValueError(f"Preset tidak dikenal: {preset} (pilihan: {', '.join(PRESETS)})")
+    dist = {c: np.asarray(p, dtype=float) / np.sum(p) for c, p in PRESETS[preset].items()}
+    for col, spec in (overrides or {}).items():
+        if col not in dist:
+            raise ValueError(f"Kolom tidak dikenal: {col} (pilihan: {', '.join(COLUMNS)})")
+        dist[col] = parse_probs(spec)
+    return dist
+
+
+def _column_rngs(seed):
+    # satu stream per kolom: hasil sama untuk seed yang sama, berapapun chunk_size
+    seq = np.random.SeedSequence(seed)
+    names = ("nama_first", "nama_last") + COLUMNS
+    return dict(zip(names, (np.random.Generator(np.random.PCG64(s)) for s in seq.spawn(len(names)))))
+
+
+def _sample_codes(rng, p, m):
+    # inverse-CDF atas uniform: satu draw per baris -> deterministik per chunk
+    cdf = np.cumsum(p)
+    cdf[-1] = 1.0
+    return np.searchsorted(cdf, rng.random(m), side="right").astype(np.int64) + 1
+
+
+def generate_chunks(n, seed=0, dist=None, chunk_size=100000, start_id=1):
+    """
+    Generator chunk nasabah sintetis. Tiap chunk: dict array NumPy
+    id, nama_first, nama_last (indeks FIRST/LAST), usia, pekerjaan, pendapatan, jaminan (kode).
+    """
+    dist = dist or make_distribution()
+    rngs = _column_rngs(seed)
+    done = 0
+    while done < n:
+        m = min(chunk_size, n - done)
+        chunk = {
+            "id": np.arange(start_id + done, start_id + done + m, dtype=np.int64),
+            "nama_first": (rngs["nama_first"].random(m) * len(FIRST)).astype(np.int64),
+            "nama_last": (rngs["nama_last"].random(m) * len(LAST)).astype(np.int64),
+        }
+        for col in COLUMNS:
+            chunk[col] = _sample_codes(rngs[col], dist[col], m)
+        yield chunk
+        done += m
+
+
+def names_of(chunk):
+    first = np.asarray(FIRST, dtype=object)[chunk["nama_first"]]
+    last = np.asarray(LAST, dtype=object)[chunk["nama_last"]]
+    return (first + " " + last).tolist()
+
+
+def db_rows(chunk):
+    """Tuple (nama, usia, pekerjaan, pendapatan, jaminan) untuk executemany."""
+    return list(zip(names_of(chunk), *(chunk[c].tolist() for c in COLUMNS)))
+
+
+def _ranges(codes, table, rng, step=1):
+    lo = np.array([0] + [table[c][0] for c in range(1, N_CODES + 1)])
+    hi = np.array([0] + [table[c][1] for c in range(1, N_CODES + 1)])
+    span = (hi[codes] - lo[codes]) // step + 1
+    return lo[codes] + (rng.random(codes.size) * span).astype(np.int64) * step
+
+
+def _texts(codes, table, rng):
+    pick = rng.random(codes.size)
+    out = np.empty(codes.size, dtype=object)
+    for code, choices in table.items():
+        mask = codes == code
+        if mask.any():
+            out[mask] = np.asarray(choices, dtype=object)[(pick[mask] * len(choices)).astype(np.int64)]
+    return out
+
+
+def raw_columns(chunk, rng):
+    """
+    Nilai asli (tahun, rupiah, teks) yang di-encode kembali ke kode chunk -
+    untuk fixture import (models/nasabah_import.py).
+    """
+    return {
+        "usia": _ranges(chunk["usia"], USIA_RANGES, rng),
+        "pekerjaan": _texts(chunk["pekerjaan"], PEKERJAAN_TEXT, rng),
+        "pendapatan": _ranges(chunk["pendapatan"], PENDAPATAN_RANGES, rng, step=50000),
+        "jaminan": _texts(chunk["jaminan"], JAMINAN_TEXT, rng),
+    }
+
+
+def write_csv(path, chunks, raw=False, seed=0):
+    """
+    Tulis chunk ke CSV (header id,nama,usia,pekerjaan,pendapatan,jaminan seperti
+    'data_set contoh.csv'). raw=True: nilai asli, bukan kode. Return jumlah baris.
+    """
+    rng = np.random.Generator(np.random.PCG64(seed))
+    total = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(("id", "nama") + COLUMNS)
+        for chunk in chunks:
+            cols = raw_columns(chunk, rng) if raw else {c: chunk[c] for c in COLUMNS}
+            w.writerows(zip(chunk["id"].tolist(), names_of(chunk), *(cols[c].tolist() for c in COLUMNS)))
+            total += chunk["id"].size
+    return total
+
+
+def write_parquet(path, chunks, raw=False, seed=0):
+    """Tulis chunk ke Parquet (butuh pyarrow), satu row group per chunk. Return jumlah baris."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Export Parquet membutuhkan paket pyarrow (pip install pyarrow).")
+    rng = np.random.Generator(np.random.PCG64(seed))
+    writer = None
+    total = 0
+    try:
+        for chunk in chunks:
+            cols = raw_columns(chunk, rng) if raw else {c: chunk[c] for c in COLUMNS}
+            data = {"id": chunk["id"], "nama": names_of(chunk)}
+            data.update({c: cols[c].tolist() if cols[c].dtype == object else cols[c] for c in COLUMNS})
+            table = pa.table(data)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            total += chunk["id"].size
+    finally:
+        if writer is not None:
+            writer.close()
+    return total
@@ -0,0 +1,212 @@
+# methods/mapping.py
+import os
+import json
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_PATH = os.path.join(ROOT, 'ahp_mapping.json')
+
+
+def load_ahp_mapping(path=CONFIG_PATH):
+    """Baca ahp_mapping.json (opsional). Return {} jika tidak ada / gagal dibaca."""
+    try:
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except Exception:
+        pass
+    return {}
+
+
+def map_value(cfg, colname, raw):
+    """
+    Map satu nilai mentah kolom nasabah ke nilai numerik memakai
+    categorical_mappings ("<kolom>_code" atau "<kolom>"). Jika tidak ada
+    mapping, nilai dikonversi ke float (0.0 jika gagal).
+    """
+    # prefer categorical_mappings keyed by field name patterns
+    try:
+        cat_maps = cfg.get('categorical_mappings', {})
+        # try specific keys
+        key = f"{colname}_code"
+        if key in cat_maps:
+            return float(cat_maps[key].get(str(raw), raw))
+        # fallback: try generic mapping by column name
+        if colname in cat_maps:
+            return float(cat_maps[colname].get(str(raw), raw))
+    except Exception:
+        pass
+    # default: try convert to float
+    try:
+        return float(raw)
+    except Exception:
+        return 0.0
+
+
+class CompiledMapping:
+    """
+    categorical_mappings yang sudah dikompilasi ke array NumPy: per kolom
+    array kunci (string, terurut) + array nilai float. Satu kolom nasabah
+    dimapping sekaligus: kode unik dicari sekali (searchsorted), lalu disebar
+    ke seluruh kolom dengan satu operasi indexing. Hasil sama persis dengan
+    map_value per sel:
+      - kunci dicocokkan dengan str(raw) (mis. 3.0 -> "3.0", tidak sama dengan "3")
+      - kode yang tidak ada di mapping -> float(raw), 0.0 jika gagal
+    """
+
+    def __init__(self, cfg):
+        self.cfg = cfg or {}
+        cat_maps = self.cfg.get('categorical_mappings', {}) or {}
+        self._tables = {}
+        for name, mp in cat_maps.items():
+            if not isinstance(mp, dict):
+                continue
+            keys, vals = [], []
+            for k, v in mp.items():
+                try:
+                    vals.append(float(v))
+                except Exception:
+                    # nilai mapping tidak numerik: map_value juga mengabaikannya
+                    continue
+                keys.append(str(k))
+            order = np.argsort(np.array(keys, dtype=str)) if keys else np.array([], dtype=int)
+            self._tables[name] = (np.array(keys, dtype=str)[order], np.array(vals, dtype=float)[order])
+
+    def table_for(self, colname):
+        """(keys, values) untuk kolom, "<kolom>_code" diutamakan; None jika tidak ada."""
+        return self._tables.get(f"{colname}_code", self._tables.get(colname))
+
+    def map_column(self, colname, raw_values):
+        """
+        Map satu kolom nilai mentah (list / array) ke array float.
+        Return (mapped, unmapped_mask): unmapped_mask True untuk sel yang tidak
+        ditemukan di mapping (nilainya hasil konversi float langsung).
+        """
+        raw_values = list(raw_values)
+        if not raw_values:
+            return np.zeros(0, dtype=float), np.zeros(0, dtype=bool)
+        # kunci mapping = str(raw); 3 dan 3.0 harus tetap beda kode
+        strs = list(map(str, raw_values))
+        first = dict(zip(reversed(strs), reversed(raw_values)))  # str -> contoh nilai mentah
+        uniq = list(first)
+        pos = {s: i for i, s in enumerate(uniq)}
+        inverse = np.fromiter(map(pos.__getitem__, strs), dtype=np.intp, count=len(strs))
+
+        u_vals = np.empty(len(uniq), dtype=float)
+        u_unmapped = np.ones(len(uniq), dtype=bool)
+        table = self.table_for(colname)
+        if table is not None and table[0].size:
+            keys, vals = table
+            u_str = np.array(uniq, dtype=str)
+            k = np.minimum(np.searchsorted(keys, u_str), keys.size - 1)
+            hit = keys[k] == u_str
+            u_vals[hit] = vals[k[hit]]
+            u_unmapped = ~hit
+        for i in np.flatnonzero(u_unmapped):
+            u_vals[i] = _to_float(first[uniq[i]])
+        return u_vals[inverse], u_unmapped[inverse]
+
+    def map_matrix(self, columns, rows, offset=0, out=None):
+        """
+        Bangun matriks keputusan (n_rows, n_cols) dari baris SQL.
+        rows: list tuple, nilai kolom ke-j ada di posisi offset + j.
+        out: array (>= n_rows, n_cols) yang sudah dialokasikan; hasil ditulis
+        ke out[:n_rows] (dipakai mode streaming agar tidak alokasi per chunk).
+        """
+        if out is not None:
+            M = out[:len(rows)]
+        else:
+            M = np.empty((len(rows), len(columns)), dtype=float)
+        if not rows:
+            return M
+        cols_raw = list(zip(*rows))
+        for j, c in enumerate(columns):
+            M[:, j], _ = self.map_column(c, cols_raw[offset + j])
+        return M
+
+
+def _to_float(raw):
+    try:
+        return float(raw)
+    except Exception:
+        return 0.0
+
+
+# cache mapping terkompilasi: dimuat ulang jika mtime ahp_mapping.json berubah
+_compiled_cache = {"path": None, "mtime": None, "mapping": None}
+
+
+def get_compiled_mapping(path=CONFIG_PATH):
+    """CompiledMapping untuk ahp_mapping.json, dikompilasi ulang hanya jika file berubah."""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+    if _compiled_cache["mapping"] is None or _compiled_cache["path"] != path or _compiled_cache["mtime"] != mtime:
+        _compiled_cache["mapping"] = CompiledMapping(load_ahp_mapping(path))
+        _compiled_cache["path"] = path
+        _compiled_cache["mtime"] = mtime
+    return _compiled_cache["mapping"]
+
+
+def is_age_ineligible(raw):
+    # treat raw==4 (category >50) as ineligible, also if numeric age >50
+    try:
+        rv = int(raw)
+    except Exception:
+        try:
+            rv = int(float(raw))
+        except Exception:
+            return False
+    if rv == 4:
+        return True
+    # if actual age value (e.g., 51) treat >50 ineligible
+    if rv > 50:
+        return True
+    return False
+
+
+def age_ineligible_mask(raw_values):
+    """is_age_ineligible untuk satu kolom sekaligus (dicek per nilai unik)."""
+    strs = list(map(str, raw_values))
+    flags = {s: is_age_ineligible(s) for s in set(strs)}
+    return np.fromiter(map(flags.__getitem__, strs), dtype=bool, count=len(strs))
+
+
+def is_benefit_column(colname):
+    """usia -> cost (lebih kecil lebih baik), kolom lain -> benefit."""
+    return 'usia' not in colname.lower()
+
+
+def map_criteria_to_columns(criteria_list, existing_cols):
+    """
+    Map nama kriteria (string) ke column name di tabel nasabah.
+    existing_cols: daftar kolom tabel nasabah (hasil PRAGMA table_info).
+    Returns list of column names, in same order as criteria_list.
+    Raise ValueError jika ada kriteria yang tidak bisa dimapping.
+    """
+    mapped = []
+    for crit in criteria_list:
+        cn = crit.lower()
+        if "usia" in cn:
+            col = "usia"
+        elif "pendapatan" in cn or "gaji" in cn or "income" in cn:
+            col = "pendapatan"
+        elif "pekerjaan" in cn or "job" in cn:
+            col = "pekerjaan"
+        elif "jaminan" in cn or "agunan" in cn or "collateral" in cn:
+            col = "jaminan"
+        else:
+            # try exact match or safer variant
+            cand = crit.strip().lower()
+            if cand in existing_cols:
+                col = cand
+            elif crit in existing_cols:
+                col = crit
+            else:
+                # not found
+                raise ValueError(f"Kriteria '{crit}' tidak dapat dimapping ke kolom tabel nasabah.")
+        if col not in existing_cols:
+            raise ValueError(f"Kolom '{col}' (mapping dari kriteria '{crit}') tidak ditemukan di tabel nasabah.")
+        mapped.append(col)
+    return mapped
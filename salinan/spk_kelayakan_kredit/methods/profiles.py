@@ -0,0 +1,23 @@
+# methods/profiles.py
+import numpy as np
+
+
+def unique_profiles(matrix):
+    """
+    Kelompokkan baris decision matrix yang identik (profil kriteria yang sama).
+    Semua kriteria nasabah berupa kode kategori kecil, jadi jumlah profil unik
+    paling banyak 4*4*4*3 = 192 berapa pun jumlah nasabahnya.
+
+    Returns:
+      profiles: array shape (n_profile, n_crit), baris unik (urut leksikografis)
+      inverse: array shape (n_alt,), indeks profil untuk tiap baris asli
+      counts: array shape (n_profile,), jumlah baris asli per profil
+    Hasil per profil dikembalikan ke tiap baris dengan values[inverse].
+    """
+    M = np.asarray(matrix, dtype=float)
+    if M.ndim != 2:
+        raise ValueError("matrix harus 2 dimensi (n_alt, n_crit)")
+    if M.shape[0] == 0:
+        return M.copy(), np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    profiles, inverse, counts = np.unique(M, axis=0, return_inverse=True, return_counts=True)
+    return profiles, inverse.reshape(-1), counts
@@ -0,0 +1,51 @@
+# methods/ranking.py
+import numpy as np
+
+
+def rank_desc(scores, tol=0.0):
+    """
+    Ranking tie-aware (skor lebih besar = ranking lebih kecil).
+    Skor yang sama mendapat ranking yang sama, ranking berikutnya dilompati
+    (1, 2, 2, 4). tol > 0: skor yang selisihnya <= tol dianggap sama.
+    Returns array int shape (n,).
+    """
+    s = np.asarray(scores, dtype=float).ravel()
+    ranks = np.empty(s.size, dtype=np.int64)
+    if s.size == 0:
+        return ranks
+    order = np.argsort(-s, kind="stable")
+    neg_sorted = -s[order]
+    # posisi kemunculan pertama tiap skor = jumlah skor yang lebih besar
+    ranks[order] = np.searchsorted(neg_sorted, neg_sorted - tol, side="left") + 1
+    return ranks
+
+
+def top_k(scores, k, ids=None):
+    """
+    Indeks k skor terbesar, urut skor turun lalu id naik (id = indeks jika None).
+    Memakai np.argpartition (O(n)) lalu hanya kandidat yang di-sort.
+    """
+    s = np.asarray(scores, dtype=float).ravel()
+    n = s.size
+    key = np.arange(n) if ids is None else np.asarray(ids).ravel()
+    k = max(0, min(int(k), n))
+    if k == 0:
+        return np.zeros(0, dtype=np.intp)
+    if k < n:
+        cut = s[np.argpartition(-s, k - 1)[k - 1]]
+        above = np.flatnonzero(s > cut)
+        # skor sama dengan batas: ambil id terkecil
+        tied = np.flatnonzero(s == cut)
+        tied = tied[np.argsort(key[tied], kind="stable")[:k - above.size]]
+        cand = np.concatenate([above, tied])
+    else:
+        cand = np.arange(n)
+    return cand[np.lexsort((key[cand], -s[cand]))]
+
+
+def ranks_for(scores, idx, tol=0.0):
+    """Ranking tie-aware hanya untuk indeks idx (1 + jumlah skor > skor[i] + tol)."""
+    s = np.asarray(scores, dtype=float).ravel()
+    return np.array([int(np.count_nonzero(s > s[i] + tol)) + 1 for i in np.asarray(idx).ravel()],
+                    dtype=np.int64)
+
@@ -0,0 +1,186 @@
+# methods/result_store.py
+import sys
+import numpy as np
+from methods import ranking as ranking_method
+
+
+def intern_names(names):
+    """Nama unik (di-intern) + array kode int32 per baris."""
+    table = {}
+    uniq = []
+    codes = np.empty(len(names), dtype=np.int32)
+    for i, nm in enumerate(names):
+        code = table.get(nm)
+        if code is None:
+            code = len(uniq)
+            table[nm] = code
+            uniq.append(sys.intern(nm) if isinstance(nm, str) else nm)
+        codes[i] = code
+    return uniq, codes
+
+
+class RowView:
+    """
+    View satu baris ResultStore, dipakai seperti dict hasil lama
+    (item["nama"], item["raw_values"], ...) tanpa menyimpan salinan data.
+    """
+    __slots__ = ("_store", "_i", "_rank")
+
+    def __init__(self, store, i, rank=None):
+        self._store = store
+        self._i = i
+        self._rank = rank
+
+    def __getitem__(self, key):
+        s = self._store
+        i = self._i
+        if key == "id":
+            return s.ids[i].item()
+        if key == "nama":
+            return s.names[s.name_idx[i]]
+        if key == "score":
+            return float(s.scores[i])
+        if key == "rank":
+            return int(self._rank) if self._rank is not None else int(s.ranks()[i])
+        return s.value(key, i)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return ["id", "nama", "score", "rank"] + list(self._store.columns)
+
+    def to_dict(self):
+        return {k: self[k] for k in self.keys()}
+
+
+class ResultStore:
+    """
+    Hasil perhitungan dalam bentuk kolom (pengganti list dict per nasabah).
+
+    ids / scores / ranks: array 1-D; nama: di-intern + kode int32;
+    kolom tambahan 2-D (raw_values, r_values, local_priorities) bisa disimpan
+    per profil unik + indeks per baris (values[inverse]) sehingga nilai yang
+    sama tidak disalin untuk tiap nasabah. Ranking dan urutan lengkap dihitung
+    on-demand; top-k lewat argpartition. Baris diakses lewat RowView.
+    """
+
+    def __init__(self, ids, names, scores, tol=0.0, name_idx=None):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.scores = np.asarray(scores, dtype=float)
+        if name_idx is None:
+            self.names, self.name_idx = intern_names(names)
+        else:
+            # nama sudah dalam bentuk tabel unik + kode (mis. dari ResultStore lain)
+            self.names, self.name_idx = list(names), np.asarray(name_idx, dtype=np.int32)
+        self.tol = tol
+        self.columns = {}
+        self._order = None
+        self._ranks = None
+
+    def add_column(self, name, values, inverse=None):
+        """
+        Tambah kolom 2-D. inverse (opsional): indeks baris values untuk tiap
+        nasabah (mis. dari profiles.unique_profiles); None = satu baris per nasabah.
+        """
+        values = np.asarray(values, dtype=float)
+        if inverse is not None:
+            inverse = np.asarray(inverse, dtype=np.int32)
+        self.columns[name] = (values, inverse)
+        return self
+
+    def value(self, name, i):
+        try:
+            values, inverse = self.columns[name]
+        except KeyError:
+            raise KeyError(name)
+        return values[i if inverse is None else inverse[i]].tolist()
+
+    def __len__(self):
+        return int(self.scores.size)
+
+    def order(self):
+        """Indeks semua baris urut ranking (skor turun, id naik)."""
+        if self._order is None:
+            self._order = np.lexsort((self.ids, -self.scores))
+        return self._order
+
+    def ranks(self):
+        """Array ranking (urutan baris asli), dihitung sekali on-demand."""
+        if self._ranks is None:
+            self._ranks = ranking_method.rank_desc(self.scores, self.tol).astype(np.int32)
+        return self._ranks
+
+    def set_ranking(self, ranks, order=None):
+        """Pakai ranking yang sudah ada (mis. dari run tersimpan / SQL) tanpa hitung ulang."""
+        self._ranks = np.asarray(ranks, dtype=np.int32)
+        if order is not None:
+            self._order = np.asarray(order, dtype=np.int64)
+        return self
+
+    def top(self, k):
+        """RowView k teratas tanpa sort penuh."""
+        if self._order is not None:
+            idx = self._order[:k]
+        else:
+            idx = ranking_method.top_k(self.scores, k, self.ids)
+        rk = self._ranks[idx] if self._ranks is not None else ranking_method.ranks_for(self.scores, idx, self.tol)
+        return [RowView(self, int(i), int(r)) for i, r in zip(idx, rk)]
+
+    def __getitem__(self, pos):
+        if isinstance(pos, slice):
+            start, stop, step = pos.indices(len(self))
+            if start == 0 and step == 1:
+                return self.top(stop)
+            return [RowView(self, int(i)) for i in self.order()[pos]]
+        return RowView(self, int(self.order()[pos]))
+
+    def __iter__(self):
+        ranks = self.ranks()
+        for i in self.order():
+            yield RowView(self, int(i), int(ranks[i]))
+
+    def nbytes(self):
+        """Perkiraan memori array hasil (tanpa string nama)."""
+        total = self.ids.nbytes + self.scores.nbytes + self.name_idx.nbytes
+        for values, inverse in self.columns.values():
+            total += values.nbytes + (inverse.nbytes if inverse is not None else 0)
+        for arr in (self._order, self._ranks):
+            if arr is not None:
+                total += arr.nbytes
+        return total
+
+
+class ResultPager:
+    """
+    Source ui.virtual_table.VirtualTable untuk hasil perhitungan (ResultStore atau
+    list dict, mis. top-k streaming / hasil SQL): baris dibaca per jendela lewat
+    slicing urut ranking, tanpa membuat item Treeview untuk semua nasabah.
+    Satu-satunya sort adalah ranking; desc=True membalik urutan.
+    """
+
+    def __init__(self, results):
+        self.results = results
+        self.sort = "rank"
+        self.desc = False
+
+    def count(self):
+        return len(self.results)
+
+    def rows(self, start, n):
+        total = len(self.results)
+        start, n = max(0, int(start)), max(0, int(n))
+        if not self.desc:
+            return list(self.results[start:min(total, start + n)])
+        stop = total - start
+        return list(self.results[max(0, stop - n):max(0, stop)])[::-1]
+
+    def set_sort(self, key, desc=False):
+        self.sort = "rank"
+        self.desc = bool(desc)
+
+    def refresh(self):
+        pass
@@ -0,0 +1,166 @@
+# methods/run_cache.py
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from models import database
+from models import result_model
+from methods import snapshot as snapshot_method
+
+DEFAULTS = {"max_entries": 8, "max_mb": 256, "max_age_s": 3600, "db_entries": 20}
+
+# LRU di memori: key -> (waktu simpan, perkiraan byte, data hasil)
+_lru = OrderedDict()
+_stats = {"hits": 0, "db_hits": 0, "misses": 0, "evictions": 0}
+# get / put dipanggil dari worker perhitungan, stats() dari thread UI
+_lock = threading.RLock()
+
+
+def data_stamp(conn):
+    """
+    (seq AUTOINCREMENT nasabah, counter nasabah_changes) - berubah jika data nasabah
+    berubah. Berbeda dengan PRAGMA data_version, nilainya sama antar koneksi / sesi
+    sehingga hasil yang di-spill ke DB bisa dipakai lagi.
+    Counter tidak dijaga trigger: UPDATE / DELETE nasabah hanya terdeteksi jika lewat
+    models/nasabah_model.py (atau memanggil nasabah_model.mark_changed). Tulis langsung
+    dengan SQL lain (tool / manual) membuat hasil cache basi.
+    """
+    cur = conn.cursor()
+    try:
+        row = cur.execute("SELECT seq FROM sqlite_sequence WHERE name = 'nasabah'").fetchone()
+    except Exception:
+        row = None
+    seq = row[0] if row else 0
+    try:
+        row = cur.execute("SELECT counter FROM nasabah_changes WHERE id = 1").fetchone()
+    except Exception:
+        row = None
+    return [seq, row[0] if row else 0]
+
+
+def make_key(method, criteria, weights, pairwise, cfg, extra=None):
+    """Key cache: database + data nasabah + metode + kriteria/bobot + pairwise + hash ahp_mapping.json."""
+    stamp = data_stamp(database.get_connection())
+    payload = json.dumps({
+        "db": os.path.abspath(database.DB_NAME),
+        "data": stamp,
+        "method": method,
+        "criteria": [str(c) for c in criteria],
+        "weights": [round(float(w), 12) for w in weights],
+        "pairwise": result_model.pairwise_hash(pairwise),
+        "mapping": hashlib.sha1(json.dumps(cfg or {}, sort_keys=True).encode('utf-8')).hexdigest(),
+        "extra": extra,
+    }, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _settings(settings):
+    out = dict(DEFAULTS)
+    for k, v in (settings or {}).items():
+        if k in out:
+            try:
+                out[k] = float(v)
+            except (TypeError, ValueError):
+                pass
+    return out
+
+
+def _nbytes(data):
+    results = data.get("results")
+    if hasattr(results, "nbytes"):
+        return int(results.nbytes())
+    # list dict hasil: ~700 byte per baris
+    return 700 * len(results or [])
+
+
+def _evict_memory(s, now):
+    limit_bytes = s["max_mb"] * 2**20
+    for key in [k for k, (t, _, _) in _lru.items() if now - t > s["max_age_s"]]:
+        del _lru[key]
+        _stats["evictions"] += 1
+    while _lru and (len(_lru) > s["max_entries"] or sum(n for _, n, _ in _lru.values()) > limit_bytes):
+        _lru.popitem(last=False)
+        _stats["evictions"] += 1
+
+
+def _from_run(run_id):
+    meta, store = result_model.load_result_store(run_id)
+    if meta is None:
+        return None
+    data = {
+        "method": meta["method"],
+        "criteria": meta["criteria"],
+        "columns": meta["columns"],
+        "weights": meta["weights"],
+        "results": store,
+        "ineligible": [],
+        "n_ineligible": meta["n_ineligible"] or 0,
+        "run_id": meta["id"],
+    }
+    if meta["cr_criteria"] is not None:
+        data["CR_criteria"] = meta["cr_criteria"]
+    if meta["cr_alternatives"] is not None:
+        data["CR_alternatives_avg"] = meta["cr_alternatives"]
+    if meta["extra"]:
+        data["summary"] = meta["extra"]
+    return data
+
+
+def get(key, settings=None):
+    """Hasil tersimpan untuk key (memori dulu, lalu run di DB) atau None."""
+    with _lock:
+        return _get(key, _settings(settings))
+
+
+def _get(key, s):
+    now = time.time()
+    _evict_memory(s, now)
+    entry = _lru.get(key)
+    if entry is not None:
+        _lru.move_to_end(key)
+        _stats["hits"] += 1
+        return entry[2]
+
+    run_id = result_model.find_cached_run(key, max_age_s=s["max_age_s"])
+    data = _from_run(run_id) if run_id is not None else None
+    if data is None:
+        _stats["misses"] += 1
+        return None
+    data["cache_key"] = key
+    _stats["db_hits"] += 1
+    _lru[key] = (now, _nbytes(data), data)
+    _evict_memory(s, now)
+    return data
+
+
+def put(key, data, settings=None):
+    """
+    Simpan hasil ke LRU memori. Spill ke DB lewat run tersimpan: _persist_run
+    menulis cache_key ke tabel runs; di sini hanya key lama yang dilepas.
+    """
+    s = _settings(settings)
+    now = time.time()
+    data["cache_key"] = key
+    with _lock:
+        _lru[key] = (now, _nbytes(data), data)
+        _lru.move_to_end(key)
+        _evict_memory(s, now)
+    token = snapshot_method.write_token()
+    if result_model.evict_cache_keys(max_age_s=s["max_age_s"], keep=int(s["db_entries"])):
+        snapshot_method.absorb_write(token)
+
+
+def clear():
+    with _lock:
+        _lru.clear()
+
+
+def stats():
+    """Counter hit / miss (hits = memori, db_hits = dimuat dari tabel runs)."""
+    with _lock:
+        out = dict(_stats)
+        out["entries"] = len(_lru)
+        out["bytes"] = int(sum(n for _, n, _ in _lru.values()))
+    return out
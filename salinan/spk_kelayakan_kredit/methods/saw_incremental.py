@@ -0,0 +1,359 @@
+# methods/saw_incremental.py
+import bisect
+import numpy as np
+from methods import mapping as mapping_method
+from methods.result_store import ResultStore
+from methods.score_cache import saw_normalize
+
+# hasil Hitung SAW aktif (dipasang oleh PerhitunganFrame._saw_done) + engine inkremental
+# di atasnya; engine baru dibuat saat ada nasabah ditambah / dihapus (get_engine(create=True))
+_base = None
+_engine = None
+
+
+def set_base(store, columns, weights, cfg):
+    """Pasang hasil SAW (ResultStore dengan kolom raw_values) sebagai dasar engine inkremental."""
+    global _base, _engine
+    if _base is not None and _base[0] is store:
+        return
+    if store is None or "raw_values" not in store.columns:
+        _base = None
+    else:
+        _base = (store, list(columns), weights, cfg)
+    _engine = None
+
+
+def get_engine(create=False):
+    """
+    Engine aktif atau None. create=True: dibuat dari hasil SAW terakhir jika belum ada
+    (murah: hanya jumlah per profil, bukan per nasabah); None jika belum ada hasil SAW.
+    """
+    global _engine
+    if _engine is None and create and _base is not None:
+        store, columns, weights, cfg = _base
+        _engine = IncrementalSAW(columns, weights, cfg, base=store)
+    return _engine
+
+
+def clear_engine():
+    set_base(None, None, None, None)
+
+
+def _score_key(score):
+    # skor yang hanya beda pembulatan dianggap sama (tie)
+    return round(float(score), 12)
+
+
+class _Fenwick:
+    """Binary indexed tree untuk prefix-sum jumlah nasabah per slot skor."""
+
+    def __init__(self, size):
+        self.tree = [0] * (size + 1)
+
+    def add(self, i, delta):
+        i += 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i):
+        # jumlah slot [0, i)
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+
+class RankIndex:
+    """
+    Index ranking (skor besar dulu) atas jumlah nasabah per skor.
+    Slot = skor unik (jumlahnya <= jumlah profil kategori), Fenwick tree di atas
+    jumlah per slot: add / rank-of O(log K) dengan K = skor unik.
+    Slot baru (skor yang belum pernah ada) atau slot kosong membangun ulang tree, O(K log K).
+    """
+
+    def __init__(self):
+        self._keys = []        # skor unik, urut naik (disimpan negatif -> skor turun)
+        self._counts = {}      # key -> jumlah nasabah
+        self._tree = _Fenwick(0)
+
+    def __len__(self):
+        return sum(self._counts.values())
+
+    def _rebuild(self):
+        self._tree = _Fenwick(len(self._keys))
+        for i, k in enumerate(self._keys):
+            self._tree.add(i, self._counts[k])
+
+    def add(self, score, count=1):
+        """Tambah (count > 0) atau kurangi (count < 0) jumlah nasabah dengan skor ini."""
+        k = -_score_key(score)
+        pos = bisect.bisect_left(self._keys, k)
+        if pos == len(self._keys) or self._keys[pos] != k:
+            if count <= 0:
+                return
+            self._keys.insert(pos, k)
+            self._counts[k] = count
+            self._rebuild()
+            return
+        left = self._counts[k] + count
+        if left > 0:
+            self._counts[k] = left
+            self._tree.add(pos, count)
+        else:
+            del self._counts[k]
+            self._keys.pop(pos)
+            self._rebuild()
+
+    def rank_of(self, score):
+        """Ranking tie-aware: 1 + jumlah nasabah dengan skor lebih besar."""
+        pos = bisect.bisect_left(self._keys, -_score_key(score))
+        return self._tree.prefix(pos) + 1
+
+
+class IncrementalSAW:
+    """
+    SAW inkremental di atas hasil Hitung SAW (base, ResultStore): nasabah bisa
+    ditambah / dihapus satu per satu tanpa menghitung ulang seluruh tabel.
+
+    - hanya delta yang disimpan per nasabah (id baru, id base yang dihapus);
+      base cukup dibaca sebagai jumlah nasabah per profil nilai mapping
+    - extremes per kolom (max benefit / min cost) dijaga bersama jumlah
+      nasabah per nilai mapping; skor hanya dihitung ulang jika extreme berubah
+    - skor per profil di-cache (profil identik = skor identik)
+    - RankIndex atas jumlah per skor untuk query ranking O(log K)
+    - results(): ResultStore terkini = base + delta (numpy, tanpa dict per baris)
+    """
+
+    def __init__(self, columns, weights, cfg, base=None):
+        self.columns = list(columns)
+        self.weights = np.asarray(weights, dtype=float)
+        if not np.isclose(self.weights.sum(), 1.0) and self.weights.sum() != 0:
+            self.weights = self.weights / self.weights.sum()
+        self.cfg = cfg
+        self.base = base
+        self.benefit_flags = [mapping_method.is_benefit_column(c) for c in self.columns]
+        self.usia_idx = next((i for i, c in enumerate(self.columns) if 'usia' in c.lower()), None)
+
+        self._added = {}           # id -> (nama, profil nilai mapping)
+        self._removed = set()      # id base yang sudah dihapus
+        self._ineligible = {}      # id -> nama (hanya nasabah baru)
+        self._profiles = {}        # profil -> jumlah nasabah eligible
+        self._value_counts = [dict() for _ in self.columns]
+        self._extremes = [None] * len(self.columns)
+        self._profile_scores = {}
+        self._index = RankIndex()
+        self._base_sorter = None
+        self.rescore_count = 0
+
+        if base is not None:
+            values, inverse = base.columns["raw_values"]
+            counts = np.bincount(inverse, minlength=len(values)) if inverse is not None else np.ones(len(values), dtype=np.int64)
+            for profile, c in zip(values.tolist(), counts.tolist()):
+                if c:
+                    self._count_profile(tuple(profile), c)
+        self._refresh_extremes()
+        self._rescore_all()
+
+    def matches(self, weights, cfg):
+        """True jika engine dibangun dengan bobot dan mapping yang sama."""
+        w = np.asarray(weights, dtype=float)
+        if w.size and not np.isclose(w.sum(), 1.0) and w.sum() != 0:
+            w = w / w.sum()
+        return (w.shape == self.weights.shape
+                and np.allclose(w, self.weights, rtol=0, atol=1e-12)
+                and (cfg or {}).get('categorical_mappings', {}) == (self.cfg or {}).get('categorical_mappings', {}))
+
+    # ---------------- extremes ----------------
+    def _best(self, j):
+        vals = self._value_counts[j]
+        if not vals:
+            return None
+        return max(vals) if self.benefit_flags[j] else min(vals)
+
+    def _count_profile(self, profile, delta):
+        left = self._profiles.get(profile, 0) + delta
+        if left > 0:
+            self._profiles[profile] = left
+        else:
+            self._profiles.pop(profile, None)
+        for j, value in enumerate(profile):
+            vals = self._value_counts[j]
+            left = vals.get(value, 0) + delta
+            if left > 0:
+                vals[value] = left
+            else:
+                vals.pop(value, None)
+
+    def _refresh_extremes(self):
+        """Update extremes; return True jika ada yang berubah."""
+        changed = False
+        for j in range(len(self.columns)):
+            best = self._best(j)
+            if best != self._extremes[j]:
+                self._extremes[j] = best
+                changed = True
+        return changed
+
+    # ---------------- scoring ----------------
+    def _profile_score(self, profile):
+        score = self._profile_scores.get(profile)
+        if score is None:
+            score = 0.0
+            for j, v in enumerate(profile):
+                ext = self._extremes[j] if self._extremes[j] is not None else 0.0
+                score += float(self.weights[j]) * float(saw_normalize(v, self.benefit_flags[j], ext))
+            self._profile_scores[profile] = score
+        return score
+
+    def _rescore_all(self):
+        self.rescore_count += 1
+        self._profile_scores = {}
+        self._index = RankIndex()
+        for profile, c in self._profiles.items():
+            self._index.add(self._profile_score(profile), c)
+
+    def _update(self, profiles):
+        """Setelah jumlah per profil berubah (profiles: {profil: delta}): rank index / skor."""
+        if self._refresh_extremes():
+            self._rescore_all()
+            return
+        for profile, delta in profiles.items():
+            self._index.add(self._profile_score(profile), delta)
+
+    # ---------------- base ----------------
+    def _base_positions(self, ids):
+        """Posisi baris base untuk ids (-1 jika bukan nasabah base)."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if self.base is None or not len(self.base) or not ids.size:
+            return np.full(ids.size, -1, dtype=np.int64)
+        if self._base_sorter is None:
+            self._base_sorter = np.argsort(self.base.ids, kind="stable")
+        base_ids = self.base.ids
+        pos = np.searchsorted(base_ids, ids, sorter=self._base_sorter)
+        pos = np.minimum(pos, base_ids.size - 1)
+        rows = self._base_sorter[pos]
+        return np.where(base_ids[rows] == ids, rows, -1)
+
+    def _base_profile(self, row):
+        values, inverse = self.base.columns["raw_values"]
+        return tuple(values[row if inverse is None else inverse[row]].tolist())
+
+    def _contains(self, nasabah_id):
+        if nasabah_id in self._added or nasabah_id in self._ineligible:
+            return True
+        return nasabah_id not in self._removed and self._base_positions([nasabah_id])[0] >= 0
+
+    def _profile_of(self, nasabah_id):
+        if nasabah_id in self._added:
+            return self._added[nasabah_id][1]
+        if nasabah_id in self._removed:
+            return None
+        row = self._base_positions([nasabah_id])[0]
+        return self._base_profile(row) if row >= 0 else None
+
+    # ---------------- updates ----------------
+    def add(self, nasabah_id, nama, raw_values):
+        """
+        Tambah satu nasabah (nilai mentah seperti tersimpan di DB).
+        Return (score, rank) atau None jika tidak memenuhi syarat usia.
+        """
+        if self._contains(nasabah_id):
+            self.remove(nasabah_id)
+        if self.usia_idx is not None and mapping_method.is_age_ineligible(raw_values[self.usia_idx]):
+            self._ineligible[nasabah_id] = nama
+            return None
+        profile = tuple(mapping_method.map_value(self.cfg, c, raw_values[j]) for j, c in enumerate(self.columns))
+        self._added[nasabah_id] = (nama, profile)
+        self._count_profile(profile, 1)
+        self._update({profile: 1})
+        return self.score_of(nasabah_id), self.rank_of(nasabah_id)
+
+    def remove(self, nasabah_id):
+        self.remove_many([nasabah_id])
+
+    def remove_many(self, ids):
+        """Hapus banyak nasabah sekaligus (extremes / rank index diupdate sekali)."""
+        ids = [int(i) for i in ids]
+        changed = {}
+        rest = []
+        for nasabah_id in ids:
+            if self._ineligible.pop(nasabah_id, None) is not None:
+                continue
+            row = self._added.pop(nasabah_id, None)
+            if row is not None:
+                changed[row[1]] = changed.get(row[1], 0) - 1
+            elif nasabah_id not in self._removed:
+                rest.append(nasabah_id)
+        if rest:
+            positions = self._base_positions(rest)
+            for nasabah_id, row in zip(rest, positions.tolist()):
+                if row >= 0:
+                    self._removed.add(nasabah_id)
+                    profile = self._base_profile(row)
+                    changed[profile] = changed.get(profile, 0) - 1
+        for profile, delta in changed.items():
+            self._count_profile(profile, delta)
+        if changed:
+            self._update(changed)
+
+    # ---------------- queries ----------------
+    def __len__(self):
+        return sum(self._profiles.values())
+
+    def score_of(self, nasabah_id):
+        profile = self._profile_of(nasabah_id)
+        return None if profile is None else self._profile_score(profile)
+
+    def rank_of(self, nasabah_id):
+        s = self.score_of(nasabah_id)
+        return None if s is None else self._index.rank_of(s)
+
+    def results(self):
+        """
+        ResultStore terkini: baris base yang belum dihapus + nasabah baru, skor dihitung
+        ulang per profil dengan extremes saat ini (format sama dengan hasil Hitung SAW).
+        """
+        n_crit = len(self.columns)
+        if self.base is not None:
+            values, inverse = self.base.columns["raw_values"]
+            if inverse is None:
+                inverse = np.arange(len(values), dtype=np.int64)
+            keep = np.ones(len(self.base), dtype=bool)
+            if self._removed:
+                keep &= ~np.isin(self.base.ids, np.fromiter(self._removed, dtype=np.int64))
+            ids = [self.base.ids[keep]]
+            names = list(self.base.names)
+            name_idx = [self.base.name_idx[keep]]
+            inv = [inverse[keep]]
+            values = [np.asarray(values, dtype=float).reshape(-1, n_crit)]
+        else:
+            ids, names, name_idx, inv, values = [], [], [], [], []
+        n_profiles = sum(len(v) for v in values)
+        if self._added:
+            added_ids = np.fromiter(self._added, dtype=np.int64, count=len(self._added))
+            rows = [self._added[i] for i in added_ids.tolist()]
+            ids.append(added_ids)
+            name_idx.append(np.arange(len(names), len(names) + len(rows), dtype=np.int32))
+            names.extend(r[0] for r in rows)
+            inv.append(np.arange(n_profiles, n_profiles + len(rows), dtype=np.int64))
+            values.append(np.array([r[1] for r in rows], dtype=float).reshape(-1, n_crit))
+        values = np.vstack(values) if values else np.zeros((0, n_crit))
+        inverse = np.concatenate(inv) if inv else np.zeros(0, dtype=np.int64)
+
+        norm = np.zeros_like(values)
+        for j in range(n_crit):
+            ext = self._extremes[j] if self._extremes[j] is not None else 0.0
+            norm[:, j] = saw_normalize(values[:, j], self.benefit_flags[j], ext)
+        scores = norm.dot(self.weights)[inverse]
+
+        # toleransi tie sama dengan hasil Hitung SAW
+        store = ResultStore(np.concatenate(ids) if ids else [], names, scores, tol=1e-12,
+                            name_idx=np.concatenate(name_idx) if name_idx else [])
+        store.add_column("raw_values", values, inverse)
+        store.add_column("r_values", norm, inverse)
+        return store
+
+    def ineligible(self):
+        return [{"id": i, "nama": n, "reason": "usia > 50"} for i, n in self._ineligible.items()]
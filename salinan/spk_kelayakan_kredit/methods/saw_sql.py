@@ -0,0 +1,126 @@
+# methods/saw_sql.py
+import numpy as np
+from methods import mapping as mapping_method
+
+
+def _qcol(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def mapping_case_sql(colname, compiled):
+    """
+    Ekspresi CASE untuk categorical_mappings satu kolom + parameter-nya.
+    Kunci dicocokkan dengan CAST(kolom AS TEXT) (sama dengan str(raw) di Python,
+    mis. REAL 3.0 -> '3.0'); kode tanpa mapping -> CAST(kolom AS REAL), NULL -> 0.0.
+    """
+    col = _qcol(colname)
+    fallback = f"COALESCE(CAST({col} AS REAL), 0.0)"
+    table = compiled.table_for(colname)
+    if table is None or not table[0].size:
+        return fallback, []
+    keys, vals = table
+    parts = []
+    params = []
+    for k, v in zip(keys.tolist(), vals.tolist()):
+        parts.append("WHEN ? THEN ?")
+        params.extend([k, float(v)])
+    return f"(CASE CAST({col} AS TEXT) {' '.join(parts)} ELSE {fallback} END)", params
+
+
+def eligible_sql(usia_col):
+    """Kebalikan is_age_ineligible: kode 4 atau usia > 50 tidak memenuhi syarat."""
+    if usia_col is None:
+        return "1"
+    age = f"CAST({_qcol(usia_col)} AS INTEGER)"
+    return f"NOT COALESCE({age} = 4 OR {age} > 50, 0)"
+
+
+def build_saw_sql(columns, weights, compiled, benefit_flags=None, table="nasabah", limit=None):
+    """
+    Satu statement SQL untuk SAW (aturan normalisasi sama dengan methods/saw.saw):
+      benefit: v / max  (max == 0 -> dibagi 1)
+      cost:    min / v  (min == 0 -> 1, v == 0 -> 1e-9)
+    MAX/MIN lewat window function, ranking lewat RANK() OVER (ORDER BY score DESC).
+    Kolom hasil: id, nama, v_0..v_k (nilai mapping), n_0..n_k (normalisasi), score, rnk.
+    Return (sql, params).
+    """
+    columns = list(columns)
+    w = np.asarray(weights, dtype=float)
+    if w.size != len(columns):
+        raise ValueError(f"Jumlah bobot ({w.size}) tidak cocok dengan jumlah kriteria ({len(columns)}).")
+    if not np.isclose(w.sum(), 1.0):
+        w = w / w.sum()
+    if benefit_flags is None:
+        benefit_flags = [mapping_method.is_benefit_column(c) for c in columns]
+    usia_col = next((c for c in columns if 'usia' in c.lower()), None)
+
+    params = []
+    mapped_exprs = []
+    for j, c in enumerate(columns):
+        expr, p = mapping_case_sql(c, compiled)
+        mapped_exprs.append(f"{expr} AS v_{j}")
+        params.extend(p)
+
+    ext_exprs = []
+    norm_exprs = []
+    for j in range(len(columns)):
+        if benefit_flags[j]:
+            ext_exprs.append(f"MAX(v_{j}) OVER () AS x_{j}")
+            norm_exprs.append(f"v_{j} / (CASE WHEN x_{j} = 0 THEN 1.0 ELSE x_{j} END) AS n_{j}")
+        else:
+            ext_exprs.append(f"MIN(v_{j}) OVER () AS x_{j}")
+            norm_exprs.append(f"(CASE WHEN x_{j} = 0 THEN 1.0 ELSE x_{j} END) / "
+                              f"(CASE WHEN v_{j} = 0 THEN 1e-9 ELSE v_{j} END) AS n_{j}")
+
+    v_cols = ", ".join(f"v_{j}" for j in range(len(columns)))
+    n_cols = ", ".join(f"n_{j}" for j in range(len(columns)))
+    score_expr = " + ".join(f"? * n_{j}" for j in range(len(columns)))
+
+    sql = (
+        f"WITH m AS (SELECT id, nama, {', '.join(mapped_exprs)} FROM {_qcol(table)} WHERE {eligible_sql(usia_col)}), "
+        f"e AS (SELECT *, {', '.join(ext_exprs)} FROM m), "
+        f"n AS (SELECT id, nama, {v_cols}, {', '.join(norm_exprs)} FROM e), "
+        f"s AS (SELECT *, ({score_expr}) AS score FROM n) "
+        f"SELECT id, nama, {v_cols}, {n_cols}, score, RANK() OVER (ORDER BY score DESC) AS rnk "
+        f"FROM s ORDER BY rnk, id"
+    )
+    params.extend(float(x) for x in w)
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    return sql, params
+
+
+def saw_sql(conn, columns, weights, compiled, benefit_flags=None, table="nasabah", limit=None):
+    """
+    Jalankan SAW di dalam SQLite. Return list dict hasil (format sama dengan
+    _saw_result['results']), urut ranking lalu id.
+    """
+    sql, params = build_saw_sql(columns, weights, compiled, benefit_flags, table, limit)
+    k = len(columns)
+    cur = conn.cursor()
+    cur.execute(sql, params)
+    results = []
+    for r in cur.fetchall():
+        results.append({
+            "id": r[0],
+            "nama": r[1],
+            "score": float(r[2 + 2 * k]),
+            "raw_values": [float(x) for x in r[2:2 + k]],
+            "r_values": [float(x) for x in r[2 + k:2 + 2 * k]],
+            "rank": int(r[3 + 2 * k]),
+        })
+    return results
+
+
+def saw_sql_from_db(conn, compiled, limit=None, table="nasabah"):
+    """SAW SQL memakai kriteria + bobot yang berlaku saat ini di database."""
+    from methods.score_cache import current_criteria_weights
+    names, weights = current_criteria_weights(conn)
+    if not names:
+        raise ValueError("Belum ada kriteria di database.")
+    cur = conn.cursor()
+    cur.execute(f"PRAGMA table_info({_qcol(table)})")
+    existing_cols = [c[1] for c in cur.fetchall()]
+    columns = mapping_method.map_criteria_to_columns(names, existing_cols)
+    return columns, weights, saw_sql(conn, columns, weights, compiled, table=table, limit=limit)
@@ -0,0 +1,209 @@
+# methods/saw_stream.py
+import os
+import heapq
+import tempfile
+import numpy as np
+from methods import mapping as mapping_method
+from methods.score_cache import saw_normalize
+
+# record spill file: satu baris per nasabah eligible
+SPILL_DTYPE = np.dtype([("id", "<i8"), ("score", "<f8")])
+
+
+def column_extremes(conn, columns, compiled, table="nasabah"):
+    """
+    Pass 1: max (benefit) / min (cost) nilai hasil mapping per kolom, hanya
+    nasabah yang lolos aturan usia. Mapping tidak monoton (mis. pendapatan
+    2 -> 4.0, 4 -> 2.0) jadi MAX/MIN SQL langsung atas kode tidak bisa dipakai;
+    yang diambil dari SQL adalah nilai distinct (GROUP BY), lalu dimapping di Python.
+    Return (extremes, n_eligible, n_ineligible).
+    """
+    cur = conn.cursor()
+    usia_col = next((c for c in columns if 'usia' in c.lower()), None)
+    extremes = []
+    n_eligible = n_ineligible = 0
+    for j, col in enumerate(columns):
+        # typeof ikut di GROUP BY: 3 (INTEGER) dan 3.0 (REAL) dimapping berbeda
+        if usia_col is not None:
+            cur.execute(f'SELECT "{usia_col}", "{col}", typeof("{col}"), COUNT(*) FROM {table} '
+                        f'GROUP BY "{usia_col}", typeof("{usia_col}"), "{col}", typeof("{col}")')
+        else:
+            cur.execute(f'SELECT NULL, "{col}", typeof("{col}"), COUNT(*) FROM {table} '
+                        f'GROUP BY "{col}", typeof("{col}")')
+        values = []
+        ok = bad = 0
+        for age, raw, _, cnt in cur.fetchall():
+            if usia_col is not None and mapping_method.is_age_ineligible(age):
+                bad += cnt
+                continue
+            ok += cnt
+            values.append(raw)
+        if j == 0:
+            n_eligible, n_ineligible = ok, bad
+        if not values:
+            extremes.append(0.0)
+            continue
+        mapped, _ = compiled.map_column(col, values)
+        extremes.append(float(mapped.max() if mapping_method.is_benefit_column(col) else mapped.min()))
+    return extremes, n_eligible, n_ineligible
+
+
+class StreamSAWResult:
+    """
+    Hasil SAW streaming: top-k (sudah dengan nama dan ranking) + spill file
+    berisi (id, score) semua nasabah eligible untuk ranking lengkap on-demand.
+    """
+
+    def __init__(self, columns, weights, extremes, top, n_eligible, n_ineligible, spill_path):
+        self.columns = columns
+        self.weights = weights
+        self.extremes = extremes
+        self.top = top
+        self.n_eligible = n_eligible
+        self.n_ineligible = n_ineligible
+        self.spill_path = spill_path
+
+    def spill(self):
+        """memmap read-only atas spill file (tidak memuat semua baris ke memori)."""
+        if self.spill_path is None or self.n_eligible == 0:
+            return np.zeros(0, dtype=SPILL_DTYPE)
+        return np.memmap(self.spill_path, dtype=SPILL_DTYPE, mode="r", shape=(self.n_eligible,))
+
+    def rank_of(self, score, block_size=1_000_000):
+        """Ranking tie-aware sebuah skor: 1 + jumlah skor yang lebih besar (scan per blok)."""
+        data = self.spill()
+        better = 0
+        for start in range(0, data.shape[0], block_size):
+            better += int(np.count_nonzero(data["score"][start:start + block_size] > score + 1e-12))
+        return better + 1
+
+    def ranked(self):
+        """
+        Ranking lengkap (ids, scores, ranks) urut skor turun lalu id naik.
+        Butuh memori ~24 byte per nasabah (untuk export / tampilan penuh).
+        """
+        data = self.spill()
+        ids = np.asarray(data["id"])
+        scores = np.asarray(data["score"])
+        order = np.lexsort((ids, -scores))
+        ids, scores = ids[order], scores[order]
+        ranks = np.searchsorted(-scores, -scores - 1e-12, side="left") + 1 if scores.size else np.zeros(0, dtype=np.int64)
+        return ids, scores, ranks
+
+    def close(self):
+        if self.spill_path and os.path.exists(self.spill_path):
+            try:
+                os.remove(self.spill_path)
+            except OSError:
+                pass
+        self.spill_path = None
+
+
+def stream_saw(conn, columns, weights, compiled, top_k=10, chunk_size=50000, spill=True, table="nasabah",
+               progress=None):
+    """
+    SAW dua pass langsung di atas cursor SQLite.
+      pass 1: extremes kolom lewat GROUP BY (lihat column_extremes)
+      pass 2: fetchmany per chunk -> blok NumPy yang dialokasikan sekali ->
+              skor chunk -> heap top-k + tulis (id, score) ke spill file
+    Memori puncak sebanding chunk_size + top_k, tidak tumbuh dengan jumlah baris.
+    progress: fn(baris_dibaca, total_baris) opsional, dipanggil per chunk pass 2.
+    """
+    columns = list(columns)
+    weights = np.asarray(weights, dtype=float)
+    if weights.sum() != 0 and not np.isclose(weights.sum(), 1.0):
+        weights = weights / weights.sum()
+    benefit_flags = [mapping_method.is_benefit_column(c) for c in columns]
+    usia_idx = next((i for i, c in enumerate(columns) if 'usia' in c.lower()), None)
+
+    extremes, n_eligible, n_ineligible = column_extremes(conn, columns, compiled, table)
+    n_total = n_eligible + n_ineligible
+
+    spill_path = None
+    spill_file = None
+    if spill:
+        fd, spill_path = tempfile.mkstemp(prefix="saw_", suffix=".spill")
+        spill_file = os.fdopen(fd, "wb")
+
+    block = np.empty((chunk_size, len(columns)), dtype=float)
+    rec = np.empty(chunk_size, dtype=SPILL_DTYPE)
+    heap = []   # min-heap (score, -id): skor kecil / id besar dibuang duluan
+    written = 0
+    seen = 0
+    cur = conn.cursor()
+    select_cols = ", ".join([f'"{c}"' for c in columns])
+    cur.execute(f"SELECT id, {select_cols} FROM {table} ORDER BY id")
+    try:
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                break
+            m = len(rows)
+            seen += m
+            if progress is not None:
+                progress(seen, n_total)
+            M = compiled.map_matrix(columns, rows, offset=1, out=block)
+            ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=m)
+            if usia_idx is not None:
+                keep = ~mapping_method.age_ineligible_mask(r[1 + usia_idx] for r in rows)
+                M = M[keep]
+                ids = ids[keep]
+            if ids.size == 0:
+                continue
+            scores = np.zeros(ids.size, dtype=float)
+            for j in range(len(columns)):
+                scores += weights[j] * saw_normalize(M[:, j], benefit_flags[j], extremes[j])
+
+            if spill_file is not None:
+                out = rec[:ids.size]
+                out["id"] = ids
+                out["score"] = scores
+                out.tofile(spill_file)
+            written += ids.size
+
+            # kandidat top-k chunk ini dulu (argpartition), baru masuk heap
+            if top_k > 0:
+                if ids.size > top_k:
+                    cut = scores[np.argpartition(-scores, top_k - 1)[top_k - 1]]
+                    above = np.flatnonzero(scores > cut)
+                    # tie di batas: ambil id terkecil (data kategori -> banyak skor sama)
+                    tied = np.flatnonzero(scores == cut)
+                    tied = tied[np.argsort(ids[tied], kind="stable")[:top_k - above.size]]
+                    cand = np.concatenate([above, tied])
+                else:
+                    cand = np.arange(ids.size)
+                for i in cand:
+                    item = (float(scores[i]), -int(ids[i]))
+                    if len(heap) < top_k:
+                        heapq.heappush(heap, item)
+                    elif item > heap[0]:
+                        heapq.heapreplace(heap, item)
+    except BaseException:
+        # dibatalkan / error: spill file tidak dipakai lagi
+        if spill_file is not None:
+            spill_file.close()
+            spill_file = None
+            os.remove(spill_path)
+        raise
+    finally:
+        if spill_file is not None:
+            spill_file.close()
+
+    # nama + nilai mapping hanya untuk top-k (query kedua, kecil)
+    top_items = sorted(heap, reverse=True)
+    details = {}
+    if top_items:
+        top_ids = [-i for _, i in top_items]
+        q_marks = ','.join(['?'] * len(top_ids))
+        cur.execute(f"SELECT id, nama, {select_cols} FROM {table} WHERE id IN ({q_marks})", top_ids)
+        detail_rows = cur.fetchall()
+        mapped = compiled.map_matrix(columns, detail_rows, offset=2)
+        details = {r[0]: (r[1], mapped[i].tolist()) for i, r in enumerate(detail_rows)}
+    top = []
+    for pos, (score, neg_id) in enumerate(top_items):
+        # semua skor yang lebih besar pasti ada di top-k
+        better = sum(1 for s, _ in top_items[:pos] if s > score + 1e-12)
+        nama, raw_values = details.get(-neg_id, (None, []))
+        top.append({"id": -neg_id, "nama": nama, "score": score, "raw_values": raw_values, "rank": better + 1})
+
+    return StreamSAWResult(columns, weights.tolist(), extremes, top, written, n_ineligible, spill_path)
@@ -0,0 +1,222 @@
+# methods/score_cache.py
+import json
+import hashlib
+import numpy as np
+from methods import mapping as mapping_method
+from methods import ahp as ahp_method
+
+# tabel skor terakhir, dipakai bersama oleh semua IntakeScorer
+_table_cache = {"key": None, "table": None}
+
+
+def saw_normalize(values, benefit, extreme):
+    """
+    Normalisasi SAW satu kolom, aturan sama dengan PerhitunganFrame.hitung_saw:
+    benefit -> v / max (0 jika max == 0), cost -> min / v (v == 0 diganti 1e-9).
+    """
+    v = np.asarray(values, dtype=float)
+    if benefit:
+        if extreme == 0:
+            return np.zeros_like(v)
+        return v / extreme
+    return extreme / np.where(v == 0, 1e-9, v)
+
+
+class ScoreTable:
+    """
+    Skor SAW untuk SEMUA kombinasi kode kategori, dihitung sekali.
+    Skor satu nasabah cukup lookup tabel (O(1)).
+
+    domains: list per kolom berisi kode kategori yang mungkin (mis. [1, 2, 3, 4])
+    values: list per kolom berisi nilai hasil mapping untuk tiap kode di domains
+    extremes: list per kolom, max (benefit) atau min (cost) nilai mapping populasi
+    """
+
+    def __init__(self, domains, values, weights, benefit_flags, extremes):
+        self.domains = [list(d) for d in domains]
+        self.values = [np.asarray(v, dtype=float) for v in values]
+        self.weights = np.asarray(weights, dtype=float)
+        self.benefit_flags = list(benefit_flags)
+        self.extremes = list(extremes)
+        self._index = [{code: i for i, code in enumerate(d)} for d in self.domains]
+
+        # skor = sum_j w_j * norm_j(v_j) -> jumlah outer (broadcast) per kolom
+        n_crit = len(self.domains)
+        scores = np.zeros([len(d) for d in self.domains], dtype=float)
+        for j in range(n_crit):
+            part = self.weights[j] * saw_normalize(self.values[j], self.benefit_flags[j], self.extremes[j])
+            shape = [1] * n_crit
+            shape[j] = len(self.domains[j])
+            scores = scores + part.reshape(shape)
+        self.scores = scores
+
+    def score(self, codes):
+        """Skor untuk satu kombinasi kode (tuple sesuai urutan kolom)."""
+        return float(self.scores[tuple(self._index[j][c] for j, c in enumerate(codes))])
+
+
+def table_key(columns, weights, benefit_flags, cfg, extremes):
+    """Hash dari bobot, mapping ahp_mapping.json dan extremes kolom."""
+    payload = json.dumps({
+        "columns": list(columns),
+        "weights": [round(float(w), 12) for w in weights],
+        "benefit": [bool(b) for b in benefit_flags],
+        "mappings": cfg.get('categorical_mappings', {}),
+        "extremes": [float(e) for e in extremes],
+    }, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def current_criteria_weights(conn):
+    """
+    Nama kriteria dan bobot yang dipakai perhitungan: dari matriks pairwise
+    'default' jika tersimpan dan ukurannya cocok, selain itu dari tabel kriteria
+    (dinormalisasi, bobot sama rata jika semua nol).
+    """
+    from models import kriteria_model
+    cur = conn.cursor()
+    cur.execute("SELECT id, nama, bobot FROM kriteria ORDER BY id")
+    rows = cur.fetchall()
+    names = [str(r[1]) for r in rows]
+    weights = []
+    for r in rows:
+        try:
+            weights.append(float(r[2]))
+        except Exception:
+            weights.append(0.0)
+    weights = np.array(weights, dtype=float)
+    try:
+        pair = kriteria_model.load_pairwise_matrix('default')
+    except Exception:
+        pair = None
+    if pair is not None and len(pair) == len(names):
+        weights, _, _ = ahp_method.ahp_from_pairwise(pair)
+    elif weights.size and not np.isclose(weights.sum(), 1.0):
+        weights = np.ones_like(weights) / len(weights) if weights.sum() == 0 else weights / weights.sum()
+    return names, np.asarray(weights, dtype=float)
+
+
+class IntakeScorer:
+    """
+    Skor SAW sementara + ranking sementara untuk nasabah baru saat input.
+
+    Menyimpan jumlah nasabah per profil kode (maks. 192 profil) sehingga
+    extremes kolom dan ranking bisa dihitung tanpa membaca ulang seluruh tabel.
+    Tabel skor dibangun ulang otomatis jika extremes berubah; bobot / mapping
+    dibekukan saat dibuat, cek dengan matches() sebelum dipakai ulang.
+    """
+
+    def __init__(self, columns, weights, cfg, criteria=None):
+        self.columns = list(columns)
+        self.weights = np.asarray(weights, dtype=float)
+        self.cfg = cfg
+        self.criteria = list(criteria) if criteria is not None else None
+        self.benefit_flags = [mapping_method.is_benefit_column(c) for c in self.columns]
+        self.usia_idx = next((i for i, c in enumerate(self.columns) if 'usia' in c.lower()), None)
+        self.counts = {}
+
+    @classmethod
+    def from_db(cls, conn, cfg, criteria_weights=None):
+        """Scorer untuk kriteria / bobot saat ini (criteria_weights: hasil current_criteria_weights)."""
+        names, weights = criteria_weights or current_criteria_weights(conn)
+        if not names:
+            raise ValueError("Belum ada kriteria di database.")
+        cur = conn.cursor()
+        cur.execute("PRAGMA table_info(nasabah)")
+        existing_cols = [c[1] for c in cur.fetchall()]
+        columns = mapping_method.map_criteria_to_columns(names, existing_cols)
+        scorer = cls(columns, weights, cfg, criteria=names)
+        scorer.load_counts(conn)
+        return scorer
+
+    def matches(self, criteria, weights, cfg):
+        """True jika scorer dibuat dengan kriteria, bobot dan mapping yang sama."""
+        w = np.asarray(weights, dtype=float)
+        return (self.criteria == list(criteria) and w.shape == self.weights.shape
+                and np.allclose(w, self.weights, rtol=0, atol=1e-12)
+                and (cfg or {}).get('categorical_mappings', {}) == (self.cfg or {}).get('categorical_mappings', {}))
+
+    def load_counts(self, conn):
+        cur = conn.cursor()
+        select_cols = ", ".join([f'"{c}"' for c in self.columns])
+        cur.execute(f"SELECT {select_cols}, COUNT(*) FROM nasabah GROUP BY {select_cols}")
+        self.counts = {}
+        for row in cur.fetchall():
+            self.add(row[:-1], row[-1])
+
+    def _profile(self, raw_values):
+        # nilai mentah apa adanya dari DB (mis. 3.0 untuk kolom REAL, '2' untuk TEXT)
+        # agar mapping-nya sama persis dengan perhitungan SAW
+        return tuple(raw_values)
+
+    def is_eligible(self, raw_values):
+        return self.usia_idx is None or not mapping_method.is_age_ineligible(raw_values[self.usia_idx])
+
+    def add(self, raw_values, count=1):
+        p = self._profile(raw_values)
+        self.counts[p] = self.counts.get(p, 0) + count
+
+    def remove(self, raw_values, count=1):
+        p = self._profile(raw_values)
+        left = self.counts.get(p, 0) - count
+        if left > 0:
+            self.counts[p] = left
+        else:
+            self.counts.pop(p, None)
+
+    def _eligible_profiles(self):
+        return [p for p in self.counts if self.is_eligible(p)]
+
+    def _mapped(self, j, code):
+        return mapping_method.map_value(self.cfg, self.columns[j], code)
+
+    def table(self):
+        """ScoreTable untuk kondisi saat ini (dari cache jika key tidak berubah)."""
+        profiles = self._eligible_profiles()
+        n_crit = len(self.columns)
+        extremes = []
+        for j in range(n_crit):
+            vals = [self._mapped(j, p[j]) for p in profiles]
+            if not vals:
+                extremes.append(0.0)
+            else:
+                extremes.append(max(vals) if self.benefit_flags[j] else min(vals))
+
+        key = table_key(self.columns, self.weights, self.benefit_flags, self.cfg, extremes)
+        if _table_cache["key"] == key:
+            return _table_cache["table"]
+
+        # domain kode: kunci categorical_mappings + kode yang ada di data
+        cat_maps = self.cfg.get('categorical_mappings', {})
+        domains = []
+        for j, col in enumerate(self.columns):
+            codes = set(p[j] for p in self.counts)
+            mp = cat_maps.get(f"{col}_code", cat_maps.get(col, {}))
+            codes.update(mp.keys())
+            domains.append(sorted(codes, key=str))
+        values = [[self._mapped(j, c) for c in domains[j]] for j in range(n_crit)]
+        table = ScoreTable(domains, values, self.weights, self.benefit_flags, extremes)
+        _table_cache["key"] = key
+        _table_cache["table"] = table
+        return table
+
+    def score_and_rank(self, raw_values):
+        """
+        Skor dan ranking sementara (ranking tie-aware di antara nasabah eligible).
+        Nasabah harus sudah di-add, dengan nilai mentah seperti yang tersimpan
+        di DB (baca ulang baris setelah INSERT). Return (score, rank, total) atau None jika
+        nasabah tidak memenuhi syarat usia.
+        """
+        if not self.is_eligible(raw_values):
+            return None
+        table = self.table()
+        score = table.score(self._profile(raw_values))
+        better = 0
+        total = 0
+        for p in self._eligible_profiles():
+            c = self.counts[p]
+            total += c
+            # toleransi kecil: skor yang hanya beda pembulatan dianggap sama (tie)
+            if table.score(p) > score + 1e-12:
+                better += c
+        return score, better + 1, total
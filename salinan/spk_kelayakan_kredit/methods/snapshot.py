@@ -0,0 +1,187 @@
+# methods/snapshot.py
+import json
+import hashlib
+import threading
+import numpy as np
+from models import database
+from methods import mapping as mapping_method
+
+# koneksi probe yang tetap terbuka: PRAGMA data_version hanya berubah
+# jika koneksi LAIN melakukan commit, jadi koneksi ini tidak boleh dipakai menulis
+_probe = {"db": None, "conn": None}
+
+# snapshot terakhir (dipakai bersama oleh SAW, AHP Full dan tabel AHP)
+_cache = {"key": None, "snapshot": None}
+
+# probe + cache dipakai dari thread UI dan worker perhitungan (methods/worker.py)
+_lock = threading.RLock()
+
+# baris per fetchmany saat membangun snapshot
+FETCH_SIZE = 50000
+
+
+def _probe_conn():
+    # dipanggil dengan _lock
+    if _probe["conn"] is None or _probe["db"] != database.DB_NAME:
+        if _probe["conn"] is not None:
+            try:
+                _probe["conn"].close()
+            except Exception:
+                pass
+        # sengaja di luar pool: commit dari koneksi pool harus terlihat di sini
+        _probe["conn"] = database.connect(database.DB_NAME, check_same_thread=False)
+        _probe["db"] = database.DB_NAME
+    return _probe["conn"]
+
+
+def data_version():
+    """PRAGMA data_version database aktif (dibaca lewat koneksi probe)."""
+    with _lock:
+        return _probe_conn().execute("PRAGMA data_version").fetchone()[0]
+
+
+def _data_stamp():
+    # run_cache mengimport modul ini
+    from methods import run_cache
+    with _lock:
+        return run_cache.data_stamp(_probe_conn())
+
+
+def config_hash(criteria, cfg):
+    """Hash nama kriteria + categorical_mappings."""
+    payload = json.dumps({
+        "criteria": [str(c) for c in criteria],
+        "mappings": (cfg or {}).get('categorical_mappings', {}),
+    }, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class DecisionSnapshot:
+    """
+    Matriks keputusan nasabah yang sudah dimapping, dibangun sekali per versi data.
+    Baris mentah dari SELECT tidak disimpan (cache hidup selama aplikasi).
+
+    ids: id nasabah (int64), names: nama per baris
+    M: matriks float hasil mapping untuk SEMUA baris (read-only)
+    eligible: mask bool lolos aturan usia
+    """
+
+    def __init__(self, key, columns, ids, names, M, eligible):
+        self.key = key
+        self.columns = list(columns)
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.names = names
+        self.M = M
+        self.M.setflags(write=False)
+        self.eligible = eligible
+        self.benefit_flags = [mapping_method.is_benefit_column(c) for c in self.columns]
+
+        self._eligible_idx = np.flatnonzero(eligible)
+        self.eligible_ids = self.ids[self._eligible_idx]
+        self.eligible_matrix = M[self._eligible_idx]
+        self.eligible_matrix.setflags(write=False)
+        self.n_eligible = len(self._eligible_idx)
+        self.n_ineligible = len(self.ids) - self.n_eligible
+
+    @property
+    def eligible_names(self):
+        return [self.names[i] for i in self._eligible_idx]
+
+    @property
+    def ineligible(self):
+        """Nasabah yang disaring aturan usia sebagai dict id / nama / reason (dibuat saat diminta)."""
+        return [{"id": int(self.ids[i]), "nama": self.names[i], "reason": "usia > 50"}
+                for i in np.flatnonzero(~self.eligible)]
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def build_snapshot(criteria, compiled, key=None, progress=None):
+    """
+    Baca nasabah dari DB lalu mapping + filter usia per kolom (tanpa cache).
+    progress(stage, done, total) opsional: stage "load" per blok fetch, lalu "map".
+    """
+    cur = database.get_connection().cursor()
+    cur.execute("PRAGMA table_info(nasabah)")
+    existing_cols = [c[1] for c in cur.fetchall()]
+    cols = mapping_method.map_criteria_to_columns(criteria, existing_cols)
+    select_cols = ", ".join([f'"{c}"' for c in cols])
+    if progress is None:
+        cur.execute(f"SELECT id, nama, {select_cols} FROM nasabah")
+        rows = cur.fetchall()
+    else:
+        total = cur.execute("SELECT COUNT(*) FROM nasabah").fetchone()[0]
+        progress("load", 0, total)
+        cur.execute(f"SELECT id, nama, {select_cols} FROM nasabah")
+        rows = []
+        while True:
+            block = cur.fetchmany(FETCH_SIZE)
+            if not block:
+                break
+            rows.extend(block)
+            progress("load", len(rows), total)
+        progress("map", 0, 1)
+
+    M = compiled.map_matrix(cols, rows, offset=2)
+    usia_idx = next((i for i, c in enumerate(cols) if 'usia' in c.lower()), None)
+    if usia_idx is not None and rows:
+        eligible = ~mapping_method.age_ineligible_mask(r[2 + usia_idx] for r in rows)
+    else:
+        eligible = np.ones(len(rows), dtype=bool)
+    ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    names = [r[1] for r in rows]
+    return DecisionSnapshot(key, cols, ids, names, M, eligible)
+
+
+def get_snapshot(criteria, compiled=None, progress=None):
+    """
+    Snapshot untuk kriteria + mapping saat ini. Dibangun ulang hanya jika
+    data_version, file database, kriteria atau mapping berubah.
+    """
+    if compiled is None:
+        compiled = mapping_method.get_compiled_mapping()
+    key = (database.DB_NAME, data_version(), config_hash(criteria, compiled.cfg))
+    with _lock:
+        if _cache["key"] == key:
+            return _cache["snapshot"]
+    # dibangun di luar lock: thread lain tetap bisa membaca snapshot lama
+    snap = build_snapshot(criteria, compiled, key, progress)
+    with _lock:
+        _cache["key"] = key
+        _cache["snapshot"] = snap
+    return snap
+
+
+def invalidate():
+    with _lock:
+        _cache["key"] = None
+        _cache["snapshot"] = None
+
+
+def write_token():
+    """Dibaca sebelum menulis tabel yang tidak memengaruhi snapshot; lihat absorb_write."""
+    with _lock:
+        # stamp dulu: commit nasabah di antara keduanya membuat data_version tidak cocok key
+        return _data_stamp(), data_version()
+
+
+def absorb_write(token):
+    """
+    Dipanggil setelah menulis tabel yang tidak memengaruhi snapshot (mis. runs /
+    run_results) dengan token dari write_token(). Snapshot yang di-cache tetap dipakai
+    dengan data_version baru hanya jika data nasabah (run_cache.data_stamp) tidak berubah
+    sejak token; commit nasabah dari thread lain di antaranya -> snapshot dibuang.
+    """
+    stamp_before, version_before = token
+    with _lock:
+        key = _cache["key"]
+        if key is None or key[0] != database.DB_NAME or key[1] != version_before:
+            return
+        # data_version dulu: commit nasabah sesudah stamp dibaca tetap membuat key basi
+        version = data_version()
+        if _data_stamp() != stamp_before:
+            _cache["key"] = None
+            _cache["snapshot"] = None
+            return
+        _cache["key"] = (key[0], version, key[2])
@@ -0,0 +1,28 @@
+import sys
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size proses ini (MB), atau None jika tidak bisa dibaca.
+    Ini high-water mark sepanjang umur proses (ru_maxrss / peak_wset), bukan puncak
+    satu perhitungan: run yang lebih kecil setelah run besar tetap melaporkan angka
+    run besar. Tampilkan sebagai "peak RSS proses"; untuk puncak per run pakai
+    tracemalloc (lihat benchmarks/harness.py, kolom peak_kb).
+    Linux/macOS memakai modul resource; Windows memakai psutil (opsional).
+    """
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux: kilobyte, macOS: byte
+        if sys.platform == "darwin":
+            return peak / (1024 * 1024)
+        return peak / 1024
+    except Exception:
+        pass
+    try:
+        import psutil
+        mem = psutil.Process().memory_info()
+        peak = getattr(mem, "peak_wset", None) or mem.rss
+        return peak / (1024 * 1024)
+    except Exception:
+        return None
@@ -0,0 +1,137 @@
+# methods/worker.py
+import queue
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+# tahapan perhitungan + label untuk progress bar
+STAGE_LABELS = {
+    "load": "Memuat data",
+    "map": "Mapping kriteria",
+    "pairwise": "Matriks pairwise",
+    "eigen": "Bobot lokal (eigen)",
+    "rank": "Skor & ranking",
+    "persist": "Menyimpan hasil",
+}
+
+
+class Cancelled(Exception):
+    """Job dibatalkan user (dilempar oleh Job.check di titik cek)."""
+
+
+class Notice(Exception):
+    """Job berhenti dengan pesan info untuk user (mis. data kosong), bukan error."""
+
+
+class Job:
+    """
+    Handle satu perhitungan latar. Fungsi job memanggil stage() saat masuk
+    tahap baru dan progress() di dalam loop; keduanya juga titik cek pembatalan
+    (cooperative: job berhenti di titik cek berikutnya setelah cancel()).
+    Event (progress / hasil) dikirim lewat queue dan dibaca thread UI.
+    """
+
+    def __init__(self, name, stages):
+        self.name = name
+        self.stages = list(stages)
+        self.current = None
+        self._cancel = threading.Event()
+        self._events = queue.Queue()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise Cancelled()
+
+    def _overall(self, fraction):
+        if self.current not in self.stages:
+            return 0.0
+        i = self.stages.index(self.current)
+        return (i + min(max(fraction, 0.0), 1.0)) / len(self.stages)
+
+    def stage(self, name, text=None):
+        self.check()
+        self.current = name
+        self._events.put(("progress", name, self._overall(0.0), text or STAGE_LABELS.get(name, name)))
+
+    def progress(self, done, total=None, text=None):
+        """Progress di dalam tahap saat ini: done/total (atau fraksi jika total None)."""
+        self.check()
+        fraction = done / total if total else float(done)
+        label = text or STAGE_LABELS.get(self.current, self.current or "")
+        self._events.put(("progress", self.current, self._overall(fraction), label))
+
+    def report(self, stage, done, total=None):
+        """progress(stage, done, total) untuk snapshot: pindah tahap jika perlu, lalu progress."""
+        if stage != self.current:
+            self.stage(stage)
+        self.progress(done, total)
+
+    def callback(self, total=None):
+        """fn(done[, total]) untuk fungsi methods/ yang menerima parameter progress."""
+        return lambda done, n=None: self.progress(done, n if n is not None else total)
+
+
+class Worker:
+    """
+    Satu thread latar (koneksi SQLite sendiri lewat pool per thread) yang
+    menjalankan paling banyak satu job sekaligus. Thread UI memanggil poll()
+    lewat after() untuk membaca progress dan hasil; Tk tidak disentuh dari worker.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spk-worker")
+        self.job = None
+        self._future = None
+
+    @property
+    def busy(self):
+        return self._future is not None and not self._future.done()
+
+    def submit(self, name, fn, stages, *args):
+        """Jalankan fn(job, *args) di thread latar. RuntimeError jika masih ada job berjalan."""
+        if self.busy:
+            raise RuntimeError(f"Perhitungan '{self.job.name}' masih berjalan.")
+        job = Job(name, stages)
+        self.job = job
+        self._future = self._executor.submit(self._run, job, fn, args)
+        return job
+
+    @staticmethod
+    def _run(job, fn, args):
+        try:
+            result = fn(job, *args)
+        except Cancelled:
+            job._events.put(("cancelled",))
+        except Notice as e:
+            job._events.put(("notice", str(e)))
+        except Exception as e:
+            job._events.put(("error", e, traceback.format_exc()))
+        else:
+            job._events.put(("done", result))
+
+    def poll(self):
+        """Semua event baru dari job aktif (list tuple); kosong jika tidak ada."""
+        job = self.job
+        events = []
+        if job is None:
+            return events
+        while True:
+            try:
+                events.append(job._events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def cancel(self):
+        if self.job is not None:
+            self.job.cancel()
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False)
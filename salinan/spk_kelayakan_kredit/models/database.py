@@ -1,16 +1,148 @@
 import sqlite3
+import atexit
+import threading
+from contextlib import contextmanager
 
 DB_NAME = "spk_kredit.db"
 
+# PRAGMA untuk setiap koneksi (journal_mode=WAL tersimpan di file database)
+PRAGMAS = [
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("cache_size", -65536),      # negatif = KiB -> 64 MB page cache
+    ("mmap_size", 268435456),    # 256 MB
+    ("busy_timeout", 5000),      # ms, tunggu lock dari koneksi lain
+]
+
+# pool: satu koneksi long-lived per thread per file database
+_local = threading.local()
+_all = []
+_lock = threading.Lock()
+
+# fungsi schema tambahan (models lain) + database yang schema-nya sudah disiapkan init_db
+_schema_hooks = []
+_schema_done = set()
+_schema_lock = threading.Lock()
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    Koneksi dari pool. close() tidak menutup koneksi, hanya membuang transaksi
+    yang belum di-commit (sama seperti close() koneksi biasa), kecuali sedang
+    di dalam transaction().
+    """
+    depth = 0
+
+    def close(self):
+        if self.depth == 0 and self.in_transaction:
+            self.rollback()
+
+    def close_pooled(self):
+        super().close()
+
+
+def connect(path=None, factory=sqlite3.Connection, check_same_thread=True):
+    """Koneksi baru (di luar pool) dengan PRAGMAS di atas."""
+    conn = sqlite3.connect(path or DB_NAME, factory=factory, check_same_thread=check_same_thread)
+    for name, value in PRAGMAS:
+        try:
+            conn.execute(f"PRAGMA {name} = {value}")
+        except sqlite3.DatabaseError:
+            # mis. journal_mode WAL tidak didukung (database read-only / network share)
+            pass
+    return conn
+
+
 def get_connection():
-    return sqlite3.connect(DB_NAME)
+    """Koneksi long-lived untuk thread ini dan DB_NAME saat ini (schema disiapkan init_db)."""
+    pool = getattr(_local, "pool", None)
+    if pool is None:
+        pool = _local.pool = {}
+    conn = pool.get(DB_NAME)
+    if conn is None:
+        # check_same_thread=False hanya agar close_all() bisa menutup dari thread utama;
+        # tiap thread tetap memakai koneksinya sendiri
+        conn = connect(DB_NAME, factory=PooledConnection, check_same_thread=False)
+        pool[DB_NAME] = conn
+        with _lock:
+            _all.append(conn)
+    return conn
 
-def init_db():
+
+@contextmanager
+def transaction():
+    """
+    with transaction() as conn: ... -> commit jika sukses, rollback jika error.
+    Bisa bersarang; hanya blok terluar yang commit / rollback.
+    """
     conn = get_connection()
-    cursor = conn.cursor()
+    if conn.depth == 0:
+        if conn.in_transaction:
+            # sisa tulis yang tidak di-commit (kode lama) tidak ikut ter-commit
+            conn.rollback()
+        # lock tulis diambil di awal (menunggu busy_timeout): transaksi deferred yang
+        # membaca lalu menulis gagal langsung jika koneksi lain commit di antaranya
+        conn.execute("BEGIN IMMEDIATE")
+    conn.depth += 1
+    try:
+        yield conn
+    except BaseException:
+        conn.depth -= 1
+        if conn.depth == 0:
+            conn.rollback()
+        raise
+    conn.depth -= 1
+    if conn.depth == 0:
+        conn.commit()
+
+
+def close_all():
+    """Tutup semua koneksi pool (dipanggil saat aplikasi keluar)."""
+    with _lock:
+        conns = list(_all)
+        _all.clear()
+    for conn in conns:
+        try:
+            conn.close_pooled()
+        except Exception:
+            pass
+    _local.pool = {}
+    with _schema_lock:
+        _schema_done.clear()
+
+
+atexit.register(close_all)
 
-def create_tables():
+
+def register_schema(fn):
+    """Daftarkan fn(conn) yang membuat tabel tambahan; dijalankan init_db sekali per database."""
+    if fn not in _schema_hooks:
+        _schema_hooks.append(fn)
+    return fn
+
+
+def init_db():
+    """
+    Siapkan koneksi + schema (create_tables + fungsi register_schema) sekali per database.
+    Dipanggil saat aplikasi / tool start, sebelum thread lain memakai get_connection().
+    """
+    # modul models yang mendaftarkan schema
+    from . import nasabah_query, result_model
     conn = get_connection()
+    with _schema_lock:
+        if DB_NAME in _schema_done:
+            return conn
+        for fn in [create_tables] + _schema_hooks:
+            try:
+                fn(conn)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        _schema_done.add(DB_NAME)
+    return conn
+
+def create_tables(conn):
     cur = conn.cursor()
 
     # Tabel Users
@@ -52,10 +184,32 @@ def create_tables():
         )
     ''')
 
+    # Nasabah yang sudah dihitung AHP Full dan dipindahkan dari tabel nasabah
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS processed_nasabah (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            original_id INTEGER,
+            nama TEXT,
+            usia INTEGER,
+            pendapatan REAL,
+            pekerjaan TEXT,
+            jaminan TEXT,
+            processed_at TEXT
+        )
+    ''')
+
+    # Penghitung UPDATE / DELETE nasabah (INSERT terlihat dari sqlite_sequence),
+    # dipakai methods/run_cache.py untuk mendeteksi perubahan data antar sesi.
+    # Dinaikkan sekali per statement oleh nasabah_model.mark_changed (bukan trigger per baris)
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS nasabah_changes (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            counter INTEGER NOT NULL
+        )
+    ''')
+    cur.execute("INSERT OR IGNORE INTO nasabah_changes (id, counter) VALUES (1, 0)")
+
     # User default
     cur.execute("SELECT * FROM users")
     if cur.fetchone() is None:
         cur.execute("INSERT INTO users (username, password) VALUES (?, ?)", ("admin", "123"))
-
-    conn.commit()
-    conn.close()
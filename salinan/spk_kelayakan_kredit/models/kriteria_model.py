@@ -1,55 +1,29 @@
-from .database import get_connection
+from .database import get_connection, transaction
 import json
 
 def tambah_kriteria(nama, bobot):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("INSERT INTO kriteria (nama, bobot) VALUES (?, ?)", (nama, bobot))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("INSERT INTO kriteria (nama, bobot) VALUES (?, ?)", (nama, bobot))
 
 def get_all_kriteria():
-    conn = get_connection()
-    cur = conn.cursor()
+    cur = get_connection().cursor()
     cur.execute("SELECT * FROM kriteria")
-    data = cur.fetchall()
-    conn.close()
-    return data
+    return cur.fetchall()
 
 
 def save_pairwise_matrix(name, matrix):
     """Simpan matrix pairwise (2D list/array) sebagai JSON teks, keyed by name."""
-    conn = get_connection()
-    cur = conn.cursor()
-    # ensure table exists (in case create_tables() wasn't run)
-    cur.execute('''
-        CREATE TABLE IF NOT EXISTS kriteria_pairwise (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE,
-            matrix TEXT
-        )
-    ''')
+    # tabel kriteria_pairwise dibuat sekali oleh database.create_tables
     mat_json = json.dumps(matrix)
     # upsert
-    cur.execute("INSERT OR REPLACE INTO kriteria_pairwise (name, matrix) VALUES (?, ?)", (name, mat_json))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("INSERT OR REPLACE INTO kriteria_pairwise (name, matrix) VALUES (?, ?)", (name, mat_json))
 
 
 def load_pairwise_matrix(name):
-    conn = get_connection()
-    cur = conn.cursor()
-    # ensure table exists
-    cur.execute('''
-        CREATE TABLE IF NOT EXISTS kriteria_pairwise (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE,
-            matrix TEXT
-        )
-    ''')
+    cur = get_connection().cursor()
     cur.execute("SELECT matrix FROM kriteria_pairwise WHERE name = ?", (name,))
     row = cur.fetchone()
-    conn.close()
     if not row:
         return None
     try:
@@ -60,16 +34,5 @@ def load_pairwise_matrix(name):
 
 def delete_pairwise_matrix(name):
     """Hapus entry pairwise dengan nama tertentu dari tabel (dipakai untuk reset awal jika perlu)."""
-    conn = get_connection()
-    cur = conn.cursor()
-    # ensure table exists
-    cur.execute('''
-        CREATE TABLE IF NOT EXISTS kriteria_pairwise (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE,
-            matrix TEXT
-        )
-    ''')
-    cur.execute("DELETE FROM kriteria_pairwise WHERE name = ?", (name,))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("DELETE FROM kriteria_pairwise WHERE name = ?", (name,))
@@ -0,0 +1,299 @@
+# models/nasabah_import.py
+import os
+import re
+import csv
+import time
+from collections import Counter
+from .nasabah_model import tambah_nasabah_bulk
+
+# kolom wajib (kolom lain, mis. id, diabaikan)
+COLUMNS = ("nama", "usia", "pekerjaan", "pendapatan", "jaminan")
+
+# aturan encoding sama dengan scripts/seed_nasabah.py
+PEKERJAAN_CODES = {"PNS": 4, "Karyawan": 3, "Wiraswasta": 2, "Petani": 2, "Mahasiswa": 1}
+JAMINAN_CODES = {"Sertifikat": 4, "BPKB Mobil": 3, "BPKB Motor": 2, "-": 1}
+
+
+def encode_pekerjaan(pekerjaan):
+    return PEKERJAAN_CODES.get(pekerjaan, 1)
+
+
+def encode_jaminan(jaminan):
+    return JAMINAN_CODES.get(jaminan, 1)
+
+
+def normalize_usia(usia):
+    if 20 <= usia <= 40:
+        return 4
+    elif 41 <= usia <= 55:
+        return 3
+    elif 56 <= usia <= 65:
+        return 2
+    else:
+        return 1
+
+
+def normalize_pendapatan(pendapatan):
+    if pendapatan >= 6000000:
+        return 4
+    elif pendapatan >= 4000000:
+        return 3
+    elif pendapatan >= 2000000:
+        return 2
+    else:
+        return 1
+
+
+class RowError(ValueError):
+    pass
+
+
+_THOUSANDS = re.compile(r"^\d{1,3}(\.\d{3})+$")
+
+
+def _number(raw, colname):
+    """Angka dari sel CSV/XLSX; terima 'Rp 3.000.000', '3,000,000', '2.0'."""
+    if isinstance(raw, (int, float)) and not isinstance(raw, bool):
+        return float(raw)
+    s = str(raw).strip()
+    if s.lower().startswith("rp"):
+        s = s[2:].strip()
+    s = s.replace(" ", "")
+    if _THOUSANDS.match(s):
+        s = s.replace(".", "")
+    s = s.replace(",", "")
+    try:
+        return float(s)
+    except ValueError:
+        raise RowError(f"{colname} bukan angka: {raw!r}")
+
+
+def _is_code(v, max_code=4):
+    return v == int(v) and 1 <= v <= max_code
+
+
+def encode_usia(raw):
+    """Kode 1..4 dipakai apa adanya; selain itu dianggap umur (tahun) -> normalize_usia."""
+    v = _number(raw, "usia")
+    if _is_code(v):
+        return int(v), None
+    if v < 0 or v > 130:
+        raise RowError(f"usia di luar rentang: {raw!r}")
+    return normalize_usia(int(v)), None
+
+
+def encode_pendapatan(raw):
+    """Kode 1..4 dipakai apa adanya; selain itu dianggap rupiah -> normalize_pendapatan."""
+    v = _number(raw, "pendapatan")
+    if _is_code(v):
+        return int(v), None
+    if v < 0:
+        raise RowError(f"pendapatan negatif: {raw!r}")
+    return normalize_pendapatan(v), None
+
+
+def _encode_category(raw, codes, colname):
+    s = str(raw).strip()
+    if s.isdigit() and _is_code(int(s)):
+        return int(s), None
+    if isinstance(raw, float) and _is_code(raw):
+        return int(raw), None
+    for key, code in codes.items():
+        if key.lower() == s.lower():
+            return code, None
+    # sama dengan seed_nasabah.py: kategori tidak dikenal -> 1 (dicatat sebagai peringatan)
+    return 1, f"{colname} tidak dikenal {raw!r}, dipakai kode 1"
+
+
+def _pekerjaan(raw):
+    return _encode_category(raw, PEKERJAAN_CODES, "pekerjaan")
+
+
+def _jaminan(raw):
+    return _encode_category(raw, JAMINAN_CODES, "jaminan")
+
+
+ENCODERS = {"usia": encode_usia, "pekerjaan": _pekerjaan, "pendapatan": encode_pendapatan, "jaminan": _jaminan}
+
+# batas cache hasil encode per kolom (nilai mentah biasanya sedikit jenisnya)
+_CACHE_LIMIT = 100000
+
+
+class ImportReport:
+    """Ringkasan validasi / import: jumlah baris, error (dibatasi), peringatan, distribusi kode."""
+
+    def __init__(self, path, dry_run, max_messages=100):
+        self.path = path
+        self.dry_run = dry_run
+        self.max_messages = max_messages
+        self.total = 0
+        self.valid = 0
+        self.inserted = 0
+        self.aborted = False
+        self.errors = []
+        self.n_errors = 0
+        self.warnings = []
+        self.n_warnings = 0
+        self.codes = {c: Counter() for c in COLUMNS if c != "nama"}
+        self.seconds = 0.0
+
+    def error(self, line, msg):
+        self.n_errors += 1
+        if len(self.errors) < self.max_messages:
+            self.errors.append((line, msg))
+
+    def warning(self, line, msg):
+        self.n_warnings += 1
+        if len(self.warnings) < self.max_messages:
+            self.warnings.append((line, msg))
+
+    def summary(self):
+        if self.dry_run:
+            mode = "DRY-RUN (tidak ada data disimpan)"
+        elif self.aborted:
+            mode = "STRICT - dibatalkan karena ada error (tidak ada data disimpan)"
+        else:
+            mode = f"{self.inserted} baris disimpan"
+        lines = [f"File: {os.path.basename(str(self.path))}",
+                 f"Baris dibaca: {self.total}; valid: {self.valid}; error: {self.n_errors}; "
+                 f"peringatan: {self.n_warnings}",
+                 f"Mode: {mode}; waktu {self.seconds:.2f} s"]
+        for col, cnt in self.codes.items():
+            dist = ", ".join(f"{k}={v}" for k, v in sorted(cnt.items()))
+            lines.append(f"  {col}: {dist}")
+        for title, items, n in (("Error", self.errors, self.n_errors), ("Peringatan", self.warnings, self.n_warnings)):
+            if items:
+                lines.append(f"{title} (menampilkan {len(items)} dari {n}):")
+                lines.extend(f"  baris {ln}: {msg}" for ln, msg in items)
+        return "\n".join(lines)
+
+
+def _header_index(header):
+    names = [str(h).strip().lower() if h is not None else "" for h in header]
+    missing = [c for c in COLUMNS if c not in names]
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ada: {', '.join(missing)} (header: {header})")
+    return [names.index(c) for c in COLUMNS]
+
+
+def iter_csv(path, encoding="utf-8-sig"):
+    """(nomor baris, sel...) dari CSV; delimiter ',' / ';' / tab dideteksi dari awal file."""
+    with open(path, "r", newline="", encoding=encoding) as f:
+        sample = f.read(8192)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(f, dialect)
+        header = next(reader, None)
+        if header is None:
+            return
+        yield 1, header
+        for line, row in enumerate(reader, start=2):
+            yield line, row
+
+
+def iter_xlsx(path, sheet=None):
+    """(nomor baris, sel...) dari XLSX lewat openpyxl mode read-only (streaming)."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("Import XLSX membutuhkan paket openpyxl (pip install openpyxl).")
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if sheet else wb.active
+        for line, row in enumerate(ws.iter_rows(values_only=True), start=1):
+            yield line, row
+    finally:
+        wb.close()
+
+
+def iter_file(path):
+    ext = os.path.splitext(str(path))[1].lower()
+    if ext in (".xlsx", ".xlsm"):
+        return iter_xlsx(path)
+    return iter_csv(path)
+
+
+def encode_rows(rows, report):
+    """
+    Validasi + encode baris mentah. Yield tuple (nama, usia, pekerjaan, pendapatan, jaminan)
+    untuk baris valid; baris tidak valid dicatat di report dan dilewati.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return
+    idx = _header_index(first[1])
+    caches = {c: {} for c in ENCODERS}
+    order = COLUMNS[1:]
+    for line, row in rows:
+        if not row or all(v is None or str(v).strip() == "" for v in row):
+            continue
+        report.total += 1
+        try:
+            cells = [row[i] if i < len(row) else None for i in idx]
+        except TypeError:
+            report.error(line, "baris tidak bisa dibaca")
+            continue
+        nama = cells[0]
+        nama = str(nama).strip() if nama is not None else ""
+        if not nama:
+            report.error(line, "nama kosong")
+            continue
+        out = [nama]
+        ok = True
+        for col, raw in zip(order, cells[1:]):
+            if raw is None or (isinstance(raw, str) and not raw.strip()):
+                report.error(line, f"{col} kosong")
+                ok = False
+                break
+            cache = caches[col]
+            hit = cache.get(raw)
+            if hit is None:
+                try:
+                    hit = ENCODERS[col](raw)
+                except RowError as e:
+                    hit = e
+                if len(cache) < _CACHE_LIMIT:
+                    cache[raw] = hit
+            if isinstance(hit, RowError):
+                report.error(line, str(hit))
+                ok = False
+                break
+            code, warn = hit
+            if warn:
+                report.warning(line, warn)
+            out.append(code)
+        if not ok:
+            continue
+        report.valid += 1
+        for col, code in zip(order, out[1:]):
+            report.codes[col][code] += 1
+        yield tuple(out)
+
+
+def import_nasabah(path, dry_run=False, batch_size=50000, strict=False, max_messages=100):
+    """
+    Import nasabah dari CSV / XLSX.
+      dry_run: hanya validasi + laporan, database tidak ditulis
+      strict: validasi seluruh file dulu; jika ada baris error tidak ada yang disimpan
+    Baris valid disimpan lewat nasabah_model.tambah_nasabah_bulk (satu transaksi).
+    Return ImportReport.
+    """
+    t0 = time.perf_counter()
+    report = ImportReport(path, dry_run, max_messages)
+    if dry_run or strict:
+        for _ in encode_rows(iter_file(path), report):
+            pass
+        report.seconds = time.perf_counter() - t0
+        if report.n_errors and not dry_run:
+            report.aborted = True
+        if dry_run or report.n_errors:
+            return report
+        # file bersih: baca ulang dan simpan (laporan dihitung ulang)
+        report = ImportReport(path, False, max_messages)
+    report.inserted = tambah_nasabah_bulk(encode_rows(iter_file(path), report), batch_size)
+    report.seconds = time.perf_counter() - t0
+    return report
@@ -1,19 +1,108 @@
-from .database import get_connection
+import datetime
+from itertools import islice
+from .database import get_connection, transaction
+from .nasabah_query import create_indexes, drop_indexes, update_stats, begin_bulk_insert, end_bulk_insert
+
+# jumlah id per statement IN (...)
+_ID_BLOCK = 900
+
+def mark_changed(conn, n=1):
+    """
+    Naikkan penghitung nasabah_changes (run_cache.data_stamp) sekali per UPDATE / DELETE
+    nasabah yang mengubah n baris. Semua UPDATE / DELETE nasabah harus memanggil ini
+    dalam transaksi yang sama; return n.
+    """
+    if n:
+        conn.execute("UPDATE nasabah_changes SET counter = counter + 1 WHERE id = 1")
+    return n
 
 def tambah_nasabah(nama, usia, pekerjaan, pendapatan, jaminan):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute('''
-        INSERT INTO nasabah (nama, usia, pekerjaan, pendapatan, jaminan)
-        VALUES (?, ?, ?, ?, ?)
-    ''', (nama, usia, pekerjaan, pendapatan, jaminan))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute('''
+            INSERT INTO nasabah (nama, usia, pekerjaan, pendapatan, jaminan)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (nama, usia, pekerjaan, pendapatan, jaminan))
+
+def tambah_nasabah_bulk(rows, batch_size=50000):
+    """
+    Insert banyak nasabah sekaligus. rows: iterable tuple
+    (nama, usia, pekerjaan, pendapatan, jaminan) yang sudah di-encode (boleh generator).
+    executemany per batch di dalam satu transaksi; error -> rollback semua. Return jumlah baris.
+    Insert besar ke tabel kecil: index sort dilepas lalu dibangun ulang di akhir (transaksi sama).
+    Index pencarian (nasabah_fts) diisi sekali di akhir untuk semua baris baru.
+    """
+    rows = iter(rows)
+    total = 0
+    rebuild = False
+    with transaction() as conn:
+        cur = conn.cursor()
+        if not conn.in_transaction:
+            # DROP TRIGGER di bawah ikut transaksi (rollback -> trigger kembali)
+            cur.execute("BEGIN")
+        last_id = begin_bulk_insert(conn)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            cur.executemany('''
+                INSERT INTO nasabah (nama, usia, pekerjaan, pendapatan, jaminan)
+                VALUES (?, ?, ?, ?, ?)
+            ''', batch)
+            if total == 0 and len(batch) == batch_size:
+                # setelah INSERT pertama: DROP INDEX ikut transaksi (rollback -> index kembali)
+                existing = cur.execute("SELECT COUNT(*) FROM nasabah").fetchone()[0]
+                if existing < 3 * batch_size:
+                    drop_indexes(conn)
+                    rebuild = True
+            total += len(batch)
+        end_bulk_insert(conn, last_id, optimize=rebuild)
+        if rebuild:
+            create_indexes(conn)
+            update_stats(conn)
+    return total
 
 def get_all_nasabah():
-    conn = get_connection()
-    cur = conn.cursor()
+    cur = get_connection().cursor()
     cur.execute("SELECT * FROM nasabah")
-    data = cur.fetchall()
-    conn.close()
-    return data
+    return cur.fetchall()
+
+def pindahkan_ke_processed(ids):
+    """
+    Salin nasabah (ids) ke processed_nasabah lalu hapus dari nasabah, dalam satu
+    transaksi. ids diproses per blok agar tidak melewati batas parameter SQLite
+    (999 pada build lama). Return jumlah baris yang dipindahkan.
+    """
+    ids = list(ids)
+    now = datetime.datetime.now().isoformat()
+    moved = 0
+    with transaction() as conn:
+        cur = conn.cursor()
+        for start in range(0, len(ids), _ID_BLOCK):
+            block = ids[start:start + _ID_BLOCK]
+            q_marks = ','.join(['?'] * len(block))
+            cur.execute(f"SELECT id, nama, usia, pendapatan, pekerjaan, jaminan FROM nasabah WHERE id IN ({q_marks})", block)
+            rows = cur.fetchall()
+            cur.executemany('''INSERT INTO processed_nasabah (original_id, nama, usia, pendapatan, pekerjaan, jaminan, processed_at)
+                               VALUES (?, ?, ?, ?, ?, ?, ?)''', [tuple(row) + (now,) for row in rows])
+            cur.execute(f'DELETE FROM nasabah WHERE id IN ({q_marks})', block)
+            moved += mark_changed(conn, cur.rowcount)
+    return moved
+
+def hapus_terpilih(selection):
+    """Hapus nasabah terpilih (nasabah_query.Selection) dengan satu DELETE. Return jumlah baris."""
+    with transaction() as conn:
+        clause, params = selection.clause(conn)
+        return mark_changed(conn, conn.execute(f"DELETE FROM nasabah WHERE {clause}", params).rowcount)
+
+def pindahkan_terpilih_ke_processed(selection):
+    """
+    Seperti pindahkan_ke_processed, tetapi untuk Selection: INSERT ... SELECT lalu
+    DELETE dengan predicate yang sama, dalam satu transaksi. Return jumlah baris.
+    """
+    now = datetime.datetime.now().isoformat()
+    with transaction() as conn:
+        clause, params = selection.clause(conn)
+        conn.execute(f'''INSERT INTO processed_nasabah (original_id, nama, usia, pendapatan, pekerjaan, jaminan, processed_at)
+                         SELECT id, nama, usia, pendapatan, pekerjaan, jaminan, ? FROM nasabah WHERE {clause}''',
+                     (now,) + tuple(params))
+        return mark_changed(conn, conn.execute(f"DELETE FROM nasabah WHERE {clause}", params).rowcount)
@@ -0,0 +1,567 @@
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from .database import get_connection, register_schema, transaction
+
+# kolom yang bisa dipakai untuk sort tabel nasabah (semua punya index, lihat create_indexes)
+COLUMNS = ("id", "nama", "usia", "pendapatan", "pekerjaan", "jaminan")
+# kolom kategori yang bisa difilter (kode 1..4)
+FILTER_COLUMNS = ("usia", "pendapatan", "pekerjaan", "jaminan")
+PAGE_SIZE = 200
+
+# index komposit untuk filter kategori: tiap kombinasi kolom adalah awalan salah satu
+# index, atau (dengan statistik ANALYZE) dicapai lewat skip-scan kolom depan yang nilainya sedikit
+FILTER_INDEXES = {
+    "idx_nasabah_filter": ("usia", "pendapatan", "pekerjaan", "jaminan"),
+    "idx_nasabah_filter2": ("jaminan", "pendapatan", "usia", "pekerjaan"),
+}
+
+
+def _kategori_sql(row=""):
+    # token kategori untuk nasabah_fts, mis. "usia2 pendapatan3 pekerjaan1 jaminan4"
+    return " || ' ' || ".join(f"'{col}' || CAST({row}{col} AS INTEGER)" for col in FILTER_COLUMNS)
+
+
+# nasabah_fts: external content dari view ini (nama + token kategori, rowid = id)
+_FTS_SOURCE = f"SELECT id, nama, {_kategori_sql()} AS kategori FROM nasabah"
+
+# trigger yang menjaga nasabah_fts sama dengan tabel nasabah: nama -> (event, baris, isi)
+_FTS_TRIGGERS = {
+    "nasabah_fts_insert": ("AFTER INSERT ON nasabah", "new", f"""
+        INSERT INTO nasabah_fts (rowid, nama, kategori) VALUES (new.id, new.nama, {_kategori_sql('new.')});"""),
+    "nasabah_fts_delete": ("AFTER DELETE ON nasabah", "old", f"""
+        INSERT INTO nasabah_fts (nasabah_fts, rowid, nama, kategori)
+        VALUES ('delete', old.id, old.nama, {_kategori_sql('old.')});"""),
+    "nasabah_fts_update": ("AFTER UPDATE ON nasabah", "old", f"""
+        INSERT INTO nasabah_fts (nasabah_fts, rowid, nama, kategori)
+        VALUES ('delete', old.id, old.nama, {_kategori_sql('old.')});
+        INSERT INTO nasabah_fts (rowid, nama, kategori) VALUES (new.id, new.nama, {_kategori_sql('new.')});"""),
+}
+
+# pengisian nasabah_fts bertahap (build_search_index): baris per transaksi (+- 0.2 s),
+# halaman per langkah 'merge', jeda antar transaksi (> 100 ms, jeda terpanjang busy
+# handler SQLite) agar tulis dari UI yang menunggu lock pasti kebagian
+FTS_BUILD_BATCH = 20000
+FTS_MERGE_PAGES = 2000
+FTS_MERGE_STEPS = 20
+FTS_BUILD_PAUSE = 0.2
+FTS_BUILD_RETRIES = 5
+
+@register_schema
+def create_indexes(conn):
+    """
+    Index untuk sort tabel nasabah. Index SQLite selalu berakhiran rowid (= id),
+    jadi ORDER BY kolom, id dan seek keyset (kolom = ? AND id > ?) langsung dari index.
+    """
+    cur = conn.cursor()
+    for col in COLUMNS[1:]:
+        cur.execute(f"CREATE INDEX IF NOT EXISTS idx_nasabah_{col} ON nasabah ({col})")
+    for name, cols in FILTER_INDEXES.items():
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON nasabah ({', '.join(cols)})")
+
+
+def drop_indexes(conn):
+    """Lepas index sort (insert massal lalu create_indexes lebih cepat dari update index per baris)."""
+    cur = conn.cursor()
+    for col in COLUMNS[1:]:
+        cur.execute(f"DROP INDEX IF EXISTS idx_nasabah_{col}")
+    for name in FILTER_INDEXES:
+        cur.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def update_stats(conn):
+    """
+    Statistik index nasabah (sqlite_stat1) untuk query planner. Dipanggil saat belum ada
+    dan sesudah insert massal ke tabel kecil; +- 0.7 s untuk 1 juta baris.
+    """
+    conn.execute("ANALYZE nasabah")
+
+
+@register_schema
+def ensure_stats(conn):
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone() is not None:
+        if conn.execute("SELECT 1 FROM sqlite_stat1 WHERE tbl = 'nasabah' LIMIT 1").fetchone() is not None:
+            return
+    update_stats(conn)
+
+
+@register_schema
+def create_search_index(conn):
+    """
+    Index pencarian: tabel FTS5 nasabah_fts (nama + token kategori) yang isinya dibaca
+    dari tabel nasabah, dijaga trigger. Saat start hanya dibuat jika tabel nasabah masih
+    kosong; database yang sudah berisi diisi build_search_index (thread latar, lihat
+    start_search_index_build). Selama belum ada / SQLite tanpa modul fts5: cari nama memakai LIKE.
+    """
+    if has_search_index(conn):
+        _create_search_triggers(conn)
+    elif not _has_search_table(conn) and conn.execute("SELECT 1 FROM nasabah LIMIT 1").fetchone() is None:
+        if _create_search_table(conn):
+            _create_search_triggers(conn)
+
+
+def _create_search_table(conn):
+    try:
+        conn.execute(f"CREATE VIEW IF NOT EXISTS nasabah_fts_source AS {_FTS_SOURCE}")
+        # prefix='1': index awalan 1 huruf (cari "a" tanpa menggabung doclist semua kata a...)
+        conn.execute("CREATE VIRTUAL TABLE nasabah_fts USING fts5(nama, kategori, "
+                     "content='nasabah_fts_source', content_rowid='id', prefix='1')")
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def _create_search_trigger(conn, name, building=False):
+    event, row, body = _FTS_TRIGGERS[name]
+    # selama build hanya baris yang sudah masuk index (id <= upto) yang diikuti trigger
+    when = f" WHEN {row}.id <= (SELECT upto FROM nasabah_fts_build WHERE id = 1)" if building else ""
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event}{when} BEGIN{body}\n    END")
+
+
+def _create_search_triggers(conn, building=False):
+    for name in _FTS_TRIGGERS:
+        _create_search_trigger(conn, name, building)
+
+
+def build_search_index(batch_size=FTS_BUILD_BATCH, merge_pages=FTS_MERGE_PAGES, pause=FTS_BUILD_PAUSE):
+    """
+    Buat nasabah_fts dan isi bertahap: tiap transaksi hanya batch_size nasabah atau satu
+    langkah 'merge', sehingga tulis lain cukup menunggu satu langkah. Progres
+    disimpan di nasabah_fts_build (dilanjutkan saat start berikutnya jika terputus); selama
+    itu has_search_index False dan cari nama memakai LIKE. Langkah terakhir mengindex sisa
+    baris, memasang trigger penuh dan menghapus nasabah_fts_build dalam satu transaksi.
+    Return True jika index selesai dibuat, False jika sudah ada / fts5 tidak tersedia.
+    """
+    with transaction() as conn:
+        if has_search_index(conn):
+            return False
+        if not _has_search_table(conn):
+            if not _create_search_table(conn):
+                return False
+            conn.execute("CREATE TABLE nasabah_fts_build (id INTEGER PRIMARY KEY CHECK (id = 1), upto INTEGER NOT NULL)")
+            conn.execute("INSERT INTO nasabah_fts_build (id, upto) VALUES (1, 0)")
+            _create_search_triggers(conn, building=True)
+    indexed = merged = False
+    merges = 0
+    while True:
+        with transaction() as conn:
+            upto = conn.execute("SELECT upto FROM nasabah_fts_build WHERE id = 1").fetchone()[0]
+            if not indexed:
+                last, n = conn.execute("SELECT MAX(id), COUNT(*) FROM (SELECT id FROM nasabah WHERE id > ? "
+                                       "ORDER BY id LIMIT ?)", (upto, batch_size)).fetchone()
+                # batch tidak penuh: sudah menyusul; nasabah baru sesudahnya diindex di langkah terakhir
+                indexed = n < batch_size
+                if n:
+                    _index_range(conn, upto, last)
+                    conn.execute("UPDATE nasabah_fts_build SET upto = ? WHERE id = 1", (last,))
+            elif not merged:
+                # gabung segment per langkah (seperti 'optimize'): query AND antar token
+                # kategori jauh lebih cepat; selesai jika langkah tidak menulis apa-apa atau
+                # sesudah FTS_MERGE_STEPS langkah (hapus selama build terus menambah segment kecil)
+                before = conn.total_changes
+                conn.execute("INSERT INTO nasabah_fts (nasabah_fts, rank) VALUES ('merge', ?)", (-merge_pages,))
+                merges += 1
+                merged = conn.total_changes - before < 2 or merges >= FTS_MERGE_STEPS
+            else:
+                # nasabah yang ditambah selama merge, lalu trigger penuh
+                _index_range(conn, upto)
+                for name in _FTS_TRIGGERS:
+                    conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+                _create_search_triggers(conn)
+                conn.execute("DROP TABLE nasabah_fts_build")
+                return True
+        time.sleep(pause)
+
+
+def _index_range(conn, after, last=None):
+    sql = "INSERT INTO nasabah_fts (rowid, nama, kategori) SELECT id, nama, kategori FROM nasabah_fts_source WHERE id > ?"
+    if last is None:
+        conn.execute(sql, (after,))
+    else:
+        conn.execute(sql + " AND id <= ?", (after, last))
+
+
+def start_search_index_build():
+    """Jalankan build_search_index di thread latar jika index belum ada (dipanggil setelah init_db)."""
+    if has_search_index(get_connection()):
+        return None
+
+    def run():
+        for _ in range(FTS_BUILD_RETRIES):
+            try:
+                build_search_index()
+                return
+            except sqlite3.OperationalError:
+                # mis. database terkunci lama: lanjut dari progres nasabah_fts_build
+                time.sleep(1)
+        # tetap memakai LIKE, dilanjutkan saat start berikutnya
+
+    thread = threading.Thread(target=run, name="nasabah-fts", daemon=True)
+    thread.start()
+    return thread
+
+
+def begin_bulk_insert(conn):
+    """
+    Sebelum insert massal (di dalam transaksi): lepas trigger insert nasabah_fts
+    (per baris +- 8x lebih lambat dari satu INSERT ... SELECT). Return id terakhir saat ini.
+    """
+    conn.execute("DROP TRIGGER IF EXISTS nasabah_fts_insert")
+    return conn.execute("SELECT COALESCE(MAX(id), 0) FROM nasabah").fetchone()[0]
+
+
+def end_bulk_insert(conn, last_id, optimize=False):
+    """Masukkan nasabah id > last_id ke nasabah_fts sekaligus lalu pasang lagi trigger insert."""
+    if not has_search_index(conn):
+        return
+    _index_range(conn, last_id)
+    if optimize:
+        conn.execute("INSERT INTO nasabah_fts (nasabah_fts) VALUES ('optimize')")
+    _create_search_trigger(conn, "nasabah_fts_insert")
+
+
+def _has_search_table(conn):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'nasabah_fts'").fetchone() is not None
+
+
+def has_search_index(conn):
+    """nasabah_fts ada dan sudah terisi penuh (tidak sedang dibangun build_search_index)."""
+    names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' "
+                                        "AND name IN ('nasabah_fts', 'nasabah_fts_build')")}
+    return names == {"nasabah_fts"}
+
+
+def _codes(codes):
+    for col in codes:
+        if col not in FILTER_COLUMNS:
+            raise ValueError(f"Kolom filter tidak dikenal: {col}")
+    return {col: code for col, code in codes.items() if code is not None}
+
+
+def search_match(conn, text="", **codes):
+    """
+    Query FTS5 nasabah_fts untuk cari nama + kategori sekaligus (tanpa membaca baris
+    tabel untuk tiap nama yang cocok). None jika text kosong atau FTS5 tidak tersedia.
+    """
+    codes = _codes(codes)
+    words = re.findall(r"\w+", text or "")
+    if not words or not has_search_index(conn):
+        return None
+    # kata hasil \w+ tidak mengandung tanda kutip
+    terms = [f'nama : "{w}"*' for w in words]
+    terms += [f"kategori : {col}{int(code)}" for col, code in codes.items()]
+    return " AND ".join(terms)
+
+
+def filter_clause(conn, text="", **codes):
+    """
+    (kondisi WHERE, params) untuk cari nama + filter kategori; ("", ()) jika tanpa filter.
+    text: awalan kata nama (semua harus cocok, mis. "and pra" -> Andi Pratama).
+    codes: kolom FILTER_COLUMNS -> kode kategori (None = semua).
+    Dengan text: nasabah_fts (search_match); tanpa text: index komposit.
+    """
+    match = search_match(conn, text, **codes)
+    if match is not None:
+        return "id IN (SELECT rowid FROM nasabah_fts WHERE nasabah_fts MATCH ?)", (match,)
+    codes = _codes(codes)
+    words = re.findall(r"\w+", text or "")
+    conds, params = [], []
+    for w in words:
+        # awalan kata seperti nasabah_fts: awal nama atau sesudah spasi
+        w = w.replace("_", "\\_")
+        conds.append("(nama LIKE ? ESCAPE '\\' OR nama LIKE ? ESCAPE '\\')")
+        params += [w + "%", "% " + w + "%"]
+    for col, code in codes.items():
+        conds.append(f"{col} = ?")
+        params.append(code)
+    return " AND ".join(conds), tuple(params)
+
+
+class NasabahPager:
+    """
+    Baris nasabah per posisi (rows(start, n)) dalam urutan sort, tanpa memuat
+    seluruh tabel. Tiap page dibaca dengan keyset pagination (lanjut dari key
+    (nilai sort, id) baris terakhir page sebelumnya); lompat jauh (scrollbar)
+    mencari key awal page lewat OFFSET di index saja. Page terakhir di-cache (LRU).
+    set_filter: hanya baris yang cocok (where / params, dipakai juga untuk Selection).
+    Cari nama + sort selain id: urutan id semua hit dibaca sekali (array), page = potongan.
+    """
+
+    def __init__(self, sort="id", desc=False, page_size=PAGE_SIZE, max_pages=64):
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.text = ""
+        self.codes = {}
+        self.where = ""
+        self.params = ()
+        self.match = None
+        self.sort = "id"
+        self.desc = False
+        self.set_sort(sort, desc)
+
+    def set_filter(self, text="", **codes):
+        """Cari nama + filter kategori (lihat filter_clause); tanpa argumen = semua nasabah."""
+        conn = get_connection()
+        self.text = text or ""
+        self.codes = _codes(codes)
+        self.where, self.params = filter_clause(conn, self.text, **self.codes)
+        self.match = search_match(conn, self.text, **self.codes)
+        self.refresh()
+
+    def set_sort(self, sort, desc=False):
+        if sort not in COLUMNS:
+            raise ValueError(f"Kolom sort tidak dikenal: {sort}")
+        self.sort = sort
+        self.desc = bool(desc)
+        self.refresh()
+
+    def refresh(self):
+        """Buang cache (dipanggil setelah data nasabah berubah)."""
+        self._pages = OrderedDict()
+        # page -> key (nilai sort, id) baris terakhir sebelum page tsb
+        self._anchors = {0: None}
+        self._hits = None
+        self._total = None
+
+    def count(self):
+        if self._total is None and self._by_hits():
+            self._total = len(self._sorted_hits())
+        if self._total is None:
+            if self.match is not None:
+                # nasabah_fts dijaga trigger: jumlah hit = jumlah baris, tanpa join ke tabel
+                sql, params = "SELECT COUNT(*) FROM nasabah_fts WHERE nasabah_fts MATCH ?", (self.match,)
+            else:
+                sql = "SELECT COUNT(*) FROM nasabah" + (f" WHERE {self.where}" if self.where else "")
+                params = self.params
+            self._total = get_connection().execute(sql, params).fetchone()[0]
+        return self._total
+
+    def rows(self, start, n):
+        """Baris ke-start .. start+n-1 (tuple id, nama, usia, pendapatan, pekerjaan, jaminan)."""
+        start = max(0, start)
+        end = start + n
+        if self._total is not None:
+            end = min(end, self._total)
+        out = []
+        p = start // self.page_size
+        while start < end:
+            page = self._page(p)
+            offset = start - p * self.page_size
+            take = page[offset:offset + (end - start)]
+            out.extend(take)
+            start += len(take)
+            if len(page) < self.page_size:
+                break
+            p += 1
+        return out
+
+    def iter_all(self):
+        """Semua baris dalam urutan sort (untuk export), page demi page lewat keyset."""
+        if self._by_hits():
+            hits = self._sorted_hits()
+            for i in range(0, len(hits), self.page_size):
+                yield from self._fetch(hits[i:i + self.page_size])
+            return
+        key = None
+        while True:
+            page = self._after(key, self.page_size * 10)
+            if not page:
+                return
+            yield from page
+            key = self._key(page[-1])
+
+    def _key(self, row):
+        return (row[COLUMNS.index(self.sort)], row[0])
+
+    def _page(self, p):
+        page = self._pages.get(p)
+        if page is not None:
+            self._pages.move_to_end(p)
+            return page
+        if self._by_hits():
+            page = self._fetch(self._sorted_hits()[p * self.page_size:(p + 1) * self.page_size])
+        else:
+            key = self._anchor(p)
+            if p > 0 and key is None:
+                # page di luar data
+                page = []
+            else:
+                page = self._after(key, self.page_size)
+                if len(page) < self.page_size and self._total is None:
+                    # page terakhir: jumlah baris diketahui tanpa COUNT (hasil cari yang sedikit)
+                    self._total = p * self.page_size + len(page)
+        self._pages[p] = page
+        if page:
+            self._anchors[p + 1] = self._key(page[-1])
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return page
+
+    def _by_hits(self):
+        return self.match is not None and self.sort != "id"
+
+    def _sorted_hits(self):
+        # id hasil cari dalam urutan sort (8 byte per hit); lookup tabel untuk tiap hit hanya sekali
+        if self._hits is None:
+            sql = f"SELECT id FROM nasabah WHERE {self.where} ORDER BY {self._order()}"
+            self._hits = array("q", (r[0] for r in get_connection().execute(sql, self.params)))
+        return self._hits
+
+    def _fetch(self, ids):
+        # baris untuk ids (<= page_size, di bawah batas parameter SQLite), urutan ids dipertahankan
+        if not ids:
+            return []
+        marks = ",".join("?" * len(ids))
+        sql = f"SELECT {', '.join(COLUMNS)} FROM nasabah WHERE id IN ({marks})"
+        by_id = {row[0]: row for row in get_connection().execute(sql, tuple(ids))}
+        return [by_id[i] for i in ids if i in by_id]
+
+    def _anchor(self, p):
+        if p in self._anchors:
+            return self._anchors[p]
+        # lompat: key baris sebelum page p dibaca dari index (covering, tanpa baca tabel)
+        if self.match is not None and self.sort == "id":
+            rows = self._select_fts("id, id", limit=1, offset=p * self.page_size - 1)
+        else:
+            rows = self._select(f"{self.sort}, id", limit=1, offset=p * self.page_size - 1)
+        key = tuple(rows[0]) if rows else None
+        self._anchors[p] = key
+        return key
+
+    def _select(self, cols, cond="", params=(), limit=-1, offset=0):
+        # filter pager (where) + kondisi keyset (cond), dalam urutan sort
+        conds = [c for c in ((f"({self.where})" if self.where else ""), cond) if c]
+        where = f" WHERE {' AND '.join(conds)}" if conds else ""
+        sql = f"SELECT {cols} FROM nasabah{where} ORDER BY {self._order()} LIMIT ? OFFSET ?"
+        return get_connection().execute(sql, self.params + tuple(params) + (limit, offset)).fetchall()
+
+    def _select_fts(self, cols, last_id=None, limit=-1, offset=0):
+        # cari nama, urut id: keyset + LIMIT langsung di nasabah_fts (rowid = id),
+        # tabel hanya dibaca untuk baris hasil (tidak semua nama yang cocok)
+        d = " DESC" if self.desc else ""
+        cond, params = "", ()
+        if last_id is not None:
+            cond, params = f" AND rowid {'<' if self.desc else '>'} ?", (last_id,)
+        sql = (f"SELECT {cols} FROM nasabah WHERE id IN (SELECT rowid FROM nasabah_fts "
+               f"WHERE nasabah_fts MATCH ?{cond} ORDER BY rowid{d} LIMIT ? OFFSET ?) ORDER BY id{d}")
+        return get_connection().execute(sql, (self.match,) + params + (limit, offset)).fetchall()
+
+    def _order(self):
+        d = " DESC" if self.desc else ""
+        if self.sort == "id":
+            return f"id{d}"
+        return f"{self.sort}{d}, id{d}"
+
+    def _after(self, key, limit):
+        """Maksimal limit baris setelah key (None = dari awal) dalam urutan sort."""
+        cols = ", ".join(COLUMNS)
+        op = "<" if self.desc else ">"
+        if self.match is not None and self.sort == "id":
+            return self._select_fts(cols, key[1] if key else None, limit)
+        if key is None:
+            return self._select(cols, limit=limit)
+        value, last_id = key
+        if self.sort == "id":
+            return self._select(cols, f"id {op} ?", (last_id,), limit)
+        # dua seek index, bukan (kolom, id) > (?, ?) yang hanya memakai kolom pertama
+        # (kolom dengan sedikit nilai unik -> scan ratusan ribu entri)
+        rows = self._select(cols, f"{self.sort} = ? AND id {op} ?", (value, last_id), limit)
+        if len(rows) < limit:
+            rows += self._select(cols, f"{self.sort} {op} ?", (value,), limit - len(rows))
+        return rows
+
+
+class Selection:
+    """
+    Pilihan nasabah tanpa menyimpan apa pun di Treeview: set id yang dipilih, atau
+    (select all) semua baris yang cocok predicate WHERE dikurangi set id yang dilepas,
+    ditambah id di luar predicate yang dicentang sesudahnya (extra).
+    Hapus / pindah memakai clause() sehingga jalan sebagai satu statement di SQLite.
+
+    Pilihan terikat pada filter tabel (scope): is_selected / toggle menganggap id
+    berasal dari tabel dengan filter yang sama, jadi pemanggil memakai rescope()
+    setiap kali filter berubah.
+    """
+
+    def __init__(self):
+        self.scope = (None, ())
+        self.clear()
+
+    def clear(self):
+        self.all = False
+        self.where = None
+        self.params = ()
+        self.max_id = None
+        self.ids = set()
+        self.extra = set()
+
+    def rescope(self, where=None, params=()):
+        """Filter tabel menjadi where/params; pilihan dikosongkan jika filter berbeda. Return True jika dikosongkan."""
+        scope = (where or None, tuple(params))
+        if scope == self.scope:
+            return False
+        self.scope = scope
+        self.clear()
+        return True
+
+    def select_all(self, where=None, params=()):
+        """
+        Pilih semua baris yang cocok where (None = seluruh tabel nasabah).
+        Dibatasi id <= id terbesar saat ini: nasabah yang ditambah sesudahnya tidak ikut terpilih.
+        """
+        self.scope = (where or None, tuple(params))
+        self.clear()
+        self.all = True
+        self.max_id = get_connection().execute("SELECT MAX(id) FROM nasabah").fetchone()[0] or 0
+        pred = f"({where}) AND " if where else ""
+        self.where = pred + "id <= ?"
+        self.params = tuple(params) + (self.max_id,)
+
+    def is_selected(self, nasabah_id):
+        if not self.all:
+            return nasabah_id in self.ids
+        if nasabah_id in self.extra:
+            return True
+        # dalam scope yang sama, id <= max_id di tabel = baris yang cocok predicate
+        return nasabah_id <= self.max_id and nasabah_id not in self.ids
+
+    def _matches(self, nasabah_id):
+        sql = f"SELECT 1 FROM nasabah WHERE id = ? AND ({self.where})"
+        return get_connection().execute(sql, (nasabah_id,) + self.params).fetchone() is not None
+
+    def toggle(self, nasabah_id):
+        ids = self.ids
+        if self.all and nasabah_id not in self.ids and (nasabah_id in self.extra or not self._matches(nasabah_id)):
+            # di luar predicate (mis. ditambah sesudah select all): dicentang sendiri
+            ids = self.extra
+        if nasabah_id in ids:
+            ids.remove(nasabah_id)
+        else:
+            ids.add(nasabah_id)
+        return self.is_selected(nasabah_id)
+
+    def count(self):
+        if not self.all:
+            return len(self.ids)
+        sql = f"SELECT COUNT(*) FROM nasabah WHERE {self.where}"
+        # ids hanya berisi baris yang cocok predicate, extra hanya yang di luar
+        n = get_connection().execute(sql, self.params).fetchone()[0] - len(self.ids) + len(self.extra)
+        return max(0, n)
+
+    def clause(self, conn):
+        """
+        (kondisi WHERE, params) untuk baris terpilih. Set id dimuat ke tabel
+        temp.nasabah_sel milik koneksi conn (panggil di dalam transaksi yang memakainya).
+        """
+        cur = conn.cursor()
+        cur.execute("CREATE TEMP TABLE IF NOT EXISTS nasabah_sel (id INTEGER PRIMARY KEY, extra INTEGER NOT NULL)")
+        cur.execute("DELETE FROM temp.nasabah_sel")
+        cur.executemany("INSERT INTO temp.nasabah_sel (id, extra) VALUES (?, 0)", ((i,) for i in self.ids))
+        if not self.all:
+            return "id IN (SELECT id FROM temp.nasabah_sel)", ()
+        cur.executemany("INSERT INTO temp.nasabah_sel (id, extra) VALUES (?, 1)", ((i,) for i in self.extra))
+        return (f"(({self.where}) AND id NOT IN (SELECT id FROM temp.nasabah_sel WHERE extra = 0))"
+                " OR id IN (SELECT id FROM temp.nasabah_sel WHERE extra = 1)"), self.params
@@ -0,0 +1,277 @@
+from .database import get_connection, transaction, register_schema
+import json
+import hashlib
+import datetime
+import numpy as np
+
+
+@register_schema
+def create_tables(conn):
+    """Tabel runs (satu baris per perhitungan) dan run_results (hasil per nasabah)."""
+    cur = conn.cursor()
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            method TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            criteria TEXT,
+            columns TEXT,
+            weights TEXT,
+            pairwise_hash TEXT,
+            cr_criteria REAL,
+            cr_alternatives REAL,
+            n_results INTEGER,
+            n_ineligible INTEGER,
+            duration_ms REAL,
+            detail_name TEXT,
+            extra TEXT,
+            cache_key TEXT
+        )
+    ''')
+    # tabel runs lama (sebelum ada cache_key)
+    cur.execute("PRAGMA table_info(runs)")
+    if 'cache_key' not in [c[1] for c in cur.fetchall()]:
+        cur.execute("ALTER TABLE runs ADD COLUMN cache_key TEXT")
+    # raw_values / detail: array float64 (BLOB), lihat _blob
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS run_results (
+            run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+            nasabah_id INTEGER NOT NULL,
+            nama TEXT,
+            score REAL NOT NULL,
+            rank INTEGER NOT NULL,
+            status TEXT,
+            raw_values BLOB,
+            detail BLOB,
+            PRIMARY KEY (run_id, nasabah_id)
+        )
+    ''')
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_run_results_score ON run_results (run_id, score DESC)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_run_results_rank ON run_results (run_id, rank)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_runs_cache_key ON runs (cache_key)")
+
+
+def pairwise_hash(matrix):
+    """Hash matriks pairwise kriteria (None jika tidak ada)."""
+    if matrix is None:
+        return None
+    arr = np.round(np.asarray(matrix, dtype=float), 12)
+    return hashlib.sha1(json.dumps(arr.tolist()).encode('utf-8')).hexdigest()
+
+
+def _blob(values):
+    return None if values is None else np.asarray(values, dtype='<f8').tobytes()
+
+
+def _unblob(blob):
+    return [] if blob is None else np.frombuffer(blob, dtype='<f8').tolist()
+
+
+def _store_rows(store, detail_name):
+    """Generator baris run_results dari ResultStore (blob per profil dibuat sekali)."""
+    def blobs(name):
+        if name not in store.columns:
+            return None, None
+        values, inverse = store.columns[name]
+        return [v.astype('<f8').tobytes() for v in values], inverse
+
+    raw_blobs, raw_inv = blobs("raw_values")
+    det_blobs, det_inv = blobs(detail_name) if detail_name else (None, None)
+    ranks = store.ranks()
+    names = store.names
+    for i in range(len(store)):
+        raw = None
+        if raw_blobs is not None:
+            raw = raw_blobs[i if raw_inv is None else raw_inv[i]]
+        det = None
+        if det_blobs is not None:
+            det = det_blobs[i if det_inv is None else det_inv[i]]
+        yield (int(store.ids[i]), names[store.name_idx[i]], float(store.scores[i]), int(ranks[i]), raw, det)
+
+
+def _dict_rows(results, detail_name):
+    for item in results:
+        yield (int(item["id"]), item.get("nama"), float(item["score"]), int(item["rank"]),
+               _blob(item.get("raw_values")), _blob(item.get(detail_name)) if detail_name else None)
+
+
+def simpan_run(method, criteria, columns, weights, results, pairwise=None, cr_criteria=None,
+               cr_alternatives=None, duration_ms=None, n_ineligible=None, detail_name=None, extra=None,
+               cache_key=None):
+    """
+    Simpan satu perhitungan + semua hasilnya dalam satu transaksi (executemany).
+    results: ResultStore atau iterable dict / RowView (id, nama, score, rank, raw_values, ...).
+    Return run_id.
+    """
+    from methods.result_store import ResultStore
+    if isinstance(results, ResultStore):
+        rows = _store_rows(results, detail_name)
+        n_results = len(results)
+    else:
+        results = list(results)
+        rows = _dict_rows(results, detail_name)
+        n_results = len(results)
+
+    with transaction() as conn:
+        cur = conn.cursor()
+        cur.execute('''INSERT INTO runs (method, created_at, criteria, columns, weights, pairwise_hash,
+                                         cr_criteria, cr_alternatives, n_results, n_ineligible, duration_ms,
+                                         detail_name, extra, cache_key)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                    (method, datetime.datetime.now().isoformat(timespec='seconds'),
+                     json.dumps(list(criteria)), json.dumps(list(columns)),
+                     json.dumps([float(w) for w in weights]), pairwise_hash(pairwise),
+                     cr_criteria, cr_alternatives, n_results, n_ineligible, duration_ms,
+                     detail_name, json.dumps(extra) if extra is not None else None, cache_key))
+        run_id = cur.lastrowid
+        cur.executemany('''INSERT INTO run_results (run_id, nasabah_id, nama, score, rank, raw_values, detail)
+                           VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                        ((run_id,) + r for r in rows))
+        # mode streaming hanya punya id + skor: nama diisi dari tabel nasabah
+        cur.execute('''UPDATE run_results SET nama = (SELECT n.nama FROM nasabah n WHERE n.id = run_results.nasabah_id)
+                       WHERE run_id = ? AND nama IS NULL''', (run_id,))
+    return run_id
+
+
+def ambil_runs(limit=100):
+    """Daftar run terbaru: (id, method, created_at, n_results, n_ineligible, cr_criteria, cr_alternatives, duration_ms)."""
+    cur = get_connection().cursor()
+    cur.execute('''SELECT id, method, created_at, n_results, n_ineligible, cr_criteria, cr_alternatives, duration_ms
+                   FROM runs ORDER BY id DESC LIMIT ?''', (int(limit),))
+    return cur.fetchall()
+
+
+def ambil_run(run_id):
+    """Metadata satu run sebagai dict, atau None."""
+    cur = get_connection().cursor()
+    cur.execute('''SELECT id, method, created_at, criteria, columns, weights, pairwise_hash, cr_criteria,
+                          cr_alternatives, n_results, n_ineligible, duration_ms, detail_name, extra
+                   FROM runs WHERE id = ?''', (run_id,))
+    r = cur.fetchone()
+    if r is None:
+        return None
+    return {
+        "id": r[0], "method": r[1], "created_at": r[2],
+        "criteria": json.loads(r[3] or "[]"), "columns": json.loads(r[4] or "[]"),
+        "weights": json.loads(r[5] or "[]"), "pairwise_hash": r[6],
+        "cr_criteria": r[7], "cr_alternatives": r[8], "n_results": r[9], "n_ineligible": r[10],
+        "duration_ms": r[11], "detail_name": r[12], "extra": json.loads(r[13]) if r[13] else None,
+    }
+
+
+def ambil_hasil_run(run_id, limit=None, offset=0):
+    """Hasil satu run urut ranking: list (nasabah_id, nama, score, rank, raw_values, detail)."""
+    cur = get_connection().cursor()
+    sql = '''SELECT nasabah_id, nama, score, rank, raw_values, detail FROM run_results
+             WHERE run_id = ? ORDER BY rank, nasabah_id'''
+    params = [run_id]
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params += [int(limit), int(offset)]
+    cur.execute(sql, params)
+    return [(r[0], r[1], r[2], r[3], _unblob(r[4]), _unblob(r[5])) for r in cur.fetchall()]
+
+
+def load_result_store(run_id):
+    """Bangun ulang ResultStore dari run tersimpan (tanpa menghitung ulang)."""
+    from methods.result_store import ResultStore
+    meta = ambil_run(run_id)
+    if meta is None:
+        return None, None
+    cur = get_connection().cursor()
+    cur.execute('''SELECT nasabah_id, nama, score, rank, raw_values, detail FROM run_results
+                   WHERE run_id = ? ORDER BY rank, nasabah_id''', (run_id,))
+    rows = cur.fetchall()
+    ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    scores = np.fromiter((r[2] for r in rows), dtype=float, count=len(rows))
+    ranks = np.fromiter((r[3] for r in rows), dtype=np.int32, count=len(rows))
+    store = ResultStore(ids, [r[1] for r in rows], scores).set_ranking(ranks, np.arange(len(rows)))
+    n_crit = len(meta["columns"])
+    for pos, name in ((4, "raw_values"), (5, meta["detail_name"])):
+        # kolom hanya dipulihkan jika tersimpan untuk semua baris
+        if not name or not rows or any(r[pos] is None for r in rows):
+            continue
+        # blob identik (profil sama) cukup disimpan sekali
+        uniq = {}
+        inverse = np.fromiter((uniq.setdefault(r[pos], len(uniq)) for r in rows), dtype=np.int32, count=len(rows))
+        values = np.frombuffer(b"".join(uniq), dtype='<f8').reshape(len(uniq), n_crit)
+        store.add_column(name, values, inverse)
+    return meta, store
+
+
+def _cutoff(max_age_s):
+    return (datetime.datetime.now() - datetime.timedelta(seconds=max_age_s)).isoformat(timespec='seconds')
+
+
+def find_cached_run(cache_key, max_age_s=None):
+    """Run terbaru dengan cache_key tersebut (dan belum lebih tua dari max_age_s), atau None."""
+    cur = get_connection().cursor()
+    sql = "SELECT MAX(id) FROM runs WHERE cache_key = ?"
+    params = [cache_key]
+    if max_age_s is not None:
+        sql += " AND created_at >= ?"
+        params.append(_cutoff(max_age_s))
+    cur.execute(sql, params)
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def evict_cache_keys(max_age_s=None, keep=None):
+    """
+    Lepas cache_key run lama (lebih tua dari max_age_s / di luar keep run terbaru).
+    Run dan hasilnya tetap ada di riwayat. Return jumlah run yang dilepas.
+    """
+    with transaction() as conn:
+        cur = conn.cursor()
+        changed = 0
+        if max_age_s is not None:
+            cur.execute("UPDATE runs SET cache_key = NULL WHERE cache_key IS NOT NULL AND created_at < ?",
+                        (_cutoff(max_age_s),))
+            changed += cur.rowcount
+        if keep is not None:
+            cur.execute('''UPDATE runs SET cache_key = NULL WHERE cache_key IS NOT NULL AND id NOT IN
+                           (SELECT id FROM runs WHERE cache_key IS NOT NULL ORDER BY id DESC LIMIT ?)''',
+                        (int(keep),))
+            changed += cur.rowcount
+    return changed
+
+
+def hapus_run(run_id):
+    with transaction() as conn:
+        conn.execute("DELETE FROM run_results WHERE run_id = ?", (run_id,))
+        conn.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+
+
+# ---- kompatibilitas ui/hasil_ui.py ----
+def _latest_run_id(cur, method=None):
+    if method is None:
+        cur.execute("SELECT MAX(id) FROM runs")
+    else:
+        cur.execute("SELECT MAX(id) FROM runs WHERE method = ?", (method,))
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def simpan_hasil(nasabah_id, nama, skor, status):
+    """Simpan satu hasil ke run 'manual' terakhir (dibuat jika belum ada)."""
+    with transaction() as conn:
+        cur = conn.cursor()
+        run_id = _latest_run_id(cur, 'manual')
+        if run_id is None:
+            cur.execute("INSERT INTO runs (method, created_at) VALUES (?, ?)",
+                        ('manual', datetime.datetime.now().isoformat(timespec='seconds')))
+            run_id = cur.lastrowid
+        cur.execute('''INSERT OR REPLACE INTO run_results (run_id, nasabah_id, nama, score, rank, status)
+                       VALUES (?, ?, ?, ?, 0, ?)''', (run_id, nasabah_id, nama, skor, status))
+
+
+def ambil_semua_hasil():
+    """Hasil run terakhir: list (nasabah_id, run_id, nama, skor, status, waktu)."""
+    cur = get_connection().cursor()
+    run_id = _latest_run_id(cur)
+    if run_id is None:
+        return []
+    cur.execute('''SELECT r.nasabah_id, r.run_id, r.nama, r.score, COALESCE(r.status, '-'), u.created_at
+                   FROM run_results r JOIN runs u ON u.id = r.run_id
+                   WHERE r.run_id = ? ORDER BY r.rank, r.score DESC''', (run_id,))
+    return cur.fetchall()
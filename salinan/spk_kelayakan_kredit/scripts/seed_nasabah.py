@@ -112,16 +112,12 @@ def seed_data():
     conn = get_connection()
     cursor = conn.cursor()
 
-    for nama, usia, pekerjaan, pendapatan, jaminan in dataset:
-        usia_enc = normalize_usia(usia)
-        pekerjaan_enc = encode_pekerjaan(pekerjaan)
-        pendapatan_enc = normalize_pendapatan(pendapatan)
-        jaminan_enc = encode_jaminan(jaminan)
-
-        cursor.execute("""
-            INSERT INTO nasabah (nama, usia, pekerjaan, pendapatan, jaminan)
-            VALUES (?, ?, ?, ?, ?)
-        """, (nama, usia_enc, pekerjaan_enc, pendapatan_enc, jaminan_enc))
+    rows = [(nama, normalize_usia(usia), encode_pekerjaan(pekerjaan), normalize_pendapatan(pendapatan),
+             encode_jaminan(jaminan)) for nama, usia, pekerjaan, pendapatan, jaminan in dataset]
+    cursor.executemany("""
+        INSERT INTO nasabah (nama, usia, pekerjaan, pendapatan, jaminan)
+        VALUES (?, ?, ?, ?, ?)
+    """, rows)
 
     conn.commit()
     conn.close()
@@ -1,131 +1,87 @@
 """Add random nasabah entries to existing spk_kredit.db without deleting existing data.
-Usage: python tools\add_random_nasabah.py [count]
-Default count = 30
+Usage: python tools\add_random_nasabah.py [count] [--seed N] [--dist realistic|uniform|skewed|identical]
+           [--p kolom=p1,p2,p3,p4 ...] [--chunk N] [--db path] [--csv file] [--parquet file] [--raw] [--no-db]
+Default count = 30, seed = 0, dist = realistic.
+--p usia=0.7,0.2,0.05,0.05 : probabilitas kode 1..4 satu kolom; --p jaminan=2 : semua baris kode 2.
+--csv / --parquet : tulis fixture (kode, atau nilai asli dengan --raw) ; --no-db : tanpa insert ke database.
+Data dibuat per chunk dengan NumPy (seed sama -> data sama) dan di-insert lewat executemany.
 """
-import sqlite3
-import random
 import sys
 import os
-from models import database as dbmod
-
-DB = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'spk_kredit.db')
-
-# Simple random name generator
-first = ["Andi","Budi","Citra","Dewi","Eko","Fajar","Gita","Hendra","Intan","Joko",
-         "Kiki","Lina","Made","Nisa","Oka","Putra","Qori","Rian","Sinta","Tono",
-         "Uli","Vina","Wahyu","Xena","Yoga","Zaki","Amanda","Bayu","Clara","Dani"]
-last = ["Pratama","Santoso","Wijaya","Rahma","Saputra","Kusuma","Suryanto","Irawan","Putri","Halim"]
-
-pekerjaan_choices = ["PNS","Karyawan","Wiraswasta","Petani","Mahasiswa"]
-jaminan_choices = ["Sertifikat","BPKB Mobil","BPKB Motor","-"]
-
-# encoding functions (same logic as existing seed_nasabah.py)
-def encode_pekerjaan(pekerjaan):
-    mapping = {"PNS": 4, "Karyawan": 3, "Wiraswasta": 2, "Petani": 2, "Mahasiswa": 1}
-    return mapping.get(pekerjaan, 1)
+import time
+import argparse
+from itertools import chain
 
-def encode_jaminan(jaminan):
-    mapping = {"Sertifikat": 4, "BPKB Mobil": 3, "BPKB Motor": 2, "-": 1}
-    return mapping.get(jaminan, 1)
-
-def normalize_usia(usia):
-    if 20 <= usia <= 40:
-        return 4
-    elif 41 <= usia <= 55:
-        return 3
-    elif 56 <= usia <= 65:
-        return 2
-    else:
-        return 1
-
-def normalize_pendapatan(pendapatan):
-    # pendapatan in full amount (IDR), normalize to 1..4
-    if pendapatan >= 6000000:
-        return 4
-    elif pendapatan >= 4000000:
-        return 3
-    elif pendapatan >= 2000000:
-        return 2
-    else:
-        return 1
-
-
-def get_conn():
-    # use models.database.get_connection if available to maintain same DB location
-    try:
-        conn = dbmod.get_connection()
-    except Exception:
-        conn = sqlite3.connect(DB)
-    return conn
+# pastikan bisa akses models / methods
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from models import database as dbmod
+from models import nasabah_model
+from methods import datagen
 
-def count_nasabah(conn):
-    cur = conn.cursor()
-    try:
-        cur.execute("SELECT COUNT(*) FROM nasabah")
-        return cur.fetchone()[0]
-    except Exception:
-        return 0
-
-
-def ensure_tables(conn):
-    # create minimal tables if missing (non-destructive)
-    cur = conn.cursor()
-    cur.execute('''CREATE TABLE IF NOT EXISTS nasabah (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        nama TEXT NOT NULL,
-        usia INTEGER NOT NULL,
-        pekerjaan INTEGER NOT NULL,
-        pendapatan INTEGER NOT NULL,
-        jaminan INTEGER NOT NULL
-    )''')
-    cur.execute('''CREATE TABLE IF NOT EXISTS kriteria (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        nama TEXT,
-        bobot REAL
-    )''')
-    conn.commit()
-
-
-def gen_random_record():
-    nama = random.choice(first) + ' ' + random.choice(last)
-    usia_raw = random.randint(20, 60)
-    pendapatan_raw = random.choice([1500000, 2200000, 3200000, 4500000, 5500000, 7000000, 9000000])
-    pekerjaan = random.choice(pekerjaan_choices)
-    jaminan = random.choice(jaminan_choices)
-
-    usia_enc = normalize_usia(usia_raw)
-    pekerjaan_enc = encode_pekerjaan(pekerjaan)
-    pendapatan_enc = normalize_pendapatan(pendapatan_raw)
-    jaminan_enc = encode_jaminan(jaminan)
+DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'spk_kredit.db')
 
-    return (nama, usia_enc, pekerjaan_enc, pendapatan_enc, jaminan_enc, usia_raw, pendapatan_raw, pekerjaan, jaminan)
 
+def count_nasabah():
+    cur = dbmod.get_connection().cursor()
+    cur.execute("SELECT COUNT(*) FROM nasabah")
+    return cur.fetchone()[0]
 
-def seed_random(count=30):
-    conn = get_conn()
-    ensure_tables(conn)
-    cur = conn.cursor()
 
-    before = count_nasabah(conn)
+def seed_random(count=30, seed=0, dist=None, chunk_size=100000):
+    """Insert count nasabah acak (per chunk, satu transaksi). Return jumlah baris."""
+    before = count_nasabah()
     print(f"Before: {before} nasabah in DB")
-
-    for _ in range(count):
-        nama, usia_enc, pekerjaan_enc, pendapatan_enc, jaminan_enc, usia_raw, pendapatan_raw, pekerjaan_raw, jaminan_raw = gen_random_record()
-        cur.execute("INSERT INTO nasabah (nama, usia, pekerjaan, pendapatan, jaminan) VALUES (?, ?, ?, ?, ?)",
-                    (nama, usia_enc, pekerjaan_enc, pendapatan_enc, jaminan_enc))
-    conn.commit()
-    after = count_nasabah(conn)
-    print(f"Inserted {count} new nasabah. After: {after} nasabah in DB")
-    conn.close()
+    chunks = datagen.generate_chunks(count, seed, dist, chunk_size)
+    t0 = time.perf_counter()
+    n = nasabah_model.tambah_nasabah_bulk(chain.from_iterable(datagen.db_rows(c) for c in chunks), chunk_size)
+    after = count_nasabah()
+    print(f"Inserted {n} new nasabah in {time.perf_counter() - t0:.2f} s. After: {after} nasabah in DB")
+    return n
+
+
+def _override(text):
+    # --p kolom=spec
+    col, sep, spec = text.partition('=')
+    if not sep or not col.strip() or not spec.strip():
+        raise argparse.ArgumentTypeError(f"format --p: kolom=p1,p2,p3,p4 atau kolom=kode, bukan {text!r}")
+    return col.strip(), spec
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tambah nasabah acak ke database / tulis fixture CSV / Parquet.")
+    parser.add_argument('count', nargs='?', type=int, default=30, help="jumlah nasabah (default 30)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--dist', default='realistic', choices=sorted(datagen.PRESETS))
+    parser.add_argument('--p', action='append', type=_override, default=[], metavar='kolom=p1,p2,p3,p4',
+                        help="probabilitas kode 1..4 satu kolom, atau satu kode untuk semua baris (bisa diulang)")
+    parser.add_argument('--chunk', type=int, default=100000, help="baris per chunk")
+    parser.add_argument('--db', default=DB, help="file database")
+    parser.add_argument('--csv', metavar='file')
+    parser.add_argument('--parquet', metavar='file')
+    parser.add_argument('--raw', action='store_true', help="fixture berisi nilai asli, bukan kode")
+    parser.add_argument('--no-db', action='store_true', help="tanpa insert ke database")
+    args = parser.parse_args(argv)
+    try:
+        args.dist = datagen.make_distribution(args.dist, dict(args.p))
+    except ValueError as e:
+        parser.error(str(e))
+    return args
 
 
 if __name__ == '__main__':
-    cnt = 30
-    if len(sys.argv) > 1:
-        try:
-            cnt = int(sys.argv[1])
-        except:
-            pass
-    seed_random(cnt)
+    args = parse_args()
+    for path, writer in ((args.csv, datagen.write_csv), (args.parquet, datagen.write_parquet)):
+        if path:
+            try:
+                n = writer(path, datagen.generate_chunks(args.count, args.seed, args.dist, args.chunk),
+                           raw=args.raw, seed=args.seed)
+            except ValueError as e:
+                print(f"Gagal menulis {path}: {e}")
+                sys.exit(1)
+            print(f"Wrote {n} rows to {path}")
+    if not args.no_db:
+        dbmod.DB_NAME = args.db
+        dbmod.init_db()
+        seed_random(args.count, args.seed, args.dist, args.chunk)
     print('Done')
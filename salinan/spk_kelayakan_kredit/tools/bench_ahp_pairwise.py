@@ -0,0 +1,69 @@
+"""Benchmark: pembangunan matriks pairwise alternatif (loop lama vs NumPy broadcasting).
+Usage: python tools\bench_ahp_pairwise.py [n_alt ...]
+Default n_alt = 100 300 1000
+"""
+import sys
+import os
+import time
+import numpy as np
+
+# pastikan bisa akses methods
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from methods import ahp as ahp_method
+
+
+def build_loop(M, benefit_flags):
+    # salinan loop lama di PerhitunganFrame (sebagai pembanding)
+    n_alt, n_crit = M.shape
+    out = []
+    for j in range(n_crit):
+        col = M[:, j]
+        pair_alt = np.ones((n_alt, n_alt), dtype=float)
+        for i in range(n_alt):
+            for k in range(n_alt):
+                vi = col[i]
+                vk = col[k]
+                if vi == 0 and vk == 0:
+                    pair_alt[i, k] = 1.0
+                elif vk == 0:
+                    pair_alt[i, k] = 1e9
+                else:
+                    ratio = vi / vk
+                    pair_alt[i, k] = ratio if benefit_flags[j] else (vk / vi if vi != 0 else 1e9)
+        out.append(pair_alt)
+    return np.array(out)
+
+
+def random_matrix(n_alt, seed=0):
+    # nilai kategori hasil mapping ahp_mapping.json (+ sedikit nol untuk uji mask)
+    rng = np.random.default_rng(seed)
+    M = rng.choice([0.0, 1.0, 2.0, 3.0, 3.5, 4.0], size=(n_alt, 4), p=[0.02, 0.2, 0.2, 0.2, 0.18, 0.2])
+    return M
+
+
+def bench(n_alt, benefit_flags=(False, True, True, True)):
+    M = random_matrix(n_alt)
+
+    t0 = time.perf_counter()
+    fast = ahp_method.build_ratio_matrices(M, list(benefit_flags))
+    t_fast = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    slow = build_loop(M, list(benefit_flags))
+    t_slow = time.perf_counter() - t0
+
+    same = np.array_equal(fast, slow)
+    speedup = t_slow / t_fast if t_fast > 0 else float('inf')
+    print(f"n_alt={n_alt:6d}  loop={t_slow:9.4f}s  vectorized={t_fast:8.4f}s  speedup={speedup:8.1f}x  identical={same}")
+
+
+if __name__ == '__main__':
+    sizes = [100, 300, 1000]
+    if len(sys.argv) > 1:
+        try:
+            sizes = [int(a) for a in sys.argv[1:]]
+        except ValueError:
+            print(f"Ukuran harus bilangan bulat, memakai default {sizes}")
+    for n in sizes:
+        bench(n)
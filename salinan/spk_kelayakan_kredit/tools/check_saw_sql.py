@@ -0,0 +1,90 @@
+"""Cek paritas: SAW di dalam SQLite (methods/saw_sql.py) vs methods/saw.saw.
+Usage: python tools\check_saw_sql.py [n_rows] [--db path]
+Default: database sementara di memori dengan n_rows = 5000 baris acak.
+Dengan --db, data nasabah + kriteria dari database tersebut yang dicek.
+Exit code 1 jika ada skor yang beda lebih dari 1e-12.
+"""
+import sys
+import os
+import random
+import sqlite3
+import numpy as np
+
+# pastikan bisa akses methods
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from methods import saw as saw_method
+from methods import saw_sql
+from methods import mapping as mapping_method
+
+TOL = 1e-12
+
+
+def random_db(n_rows, seed=0):
+    # tipe kolom sama dengan models/database.py (pendapatan REAL, pekerjaan/jaminan TEXT)
+    rng = random.Random(seed)
+    conn = sqlite3.connect(":memory:")
+    conn.execute('''
+        CREATE TABLE nasabah (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nama TEXT NOT NULL,
+            usia INTEGER NOT NULL,
+            pekerjaan TEXT NOT NULL,
+            pendapatan REAL NOT NULL,
+            jaminan TEXT NOT NULL
+        )
+    ''')
+    conn.executemany(
+        "INSERT INTO nasabah (nama, usia, pekerjaan, pendapatan, jaminan) VALUES (?, ?, ?, ?, ?)",
+        [(f"Nasabah {i}", rng.randint(1, 4), rng.randint(1, 4), rng.randint(1, 4), rng.randint(1, 4))
+         for i in range(n_rows)])
+    conn.commit()
+    return conn
+
+
+def python_saw(conn, columns, weights, cfg):
+    select_cols = ", ".join([f'"{c}"' for c in columns])
+    rows = conn.execute(f"SELECT id, nama, {select_cols} FROM nasabah ORDER BY id").fetchall()
+    usia_idx = next((i for i, c in enumerate(columns) if 'usia' in c.lower()), None)
+    if usia_idx is not None:
+        rows = [r for r in rows if not mapping_method.is_age_ineligible(r[2 + usia_idx])]
+    M = np.array([[mapping_method.map_value(cfg, c, r[2 + j]) for j, c in enumerate(columns)] for r in rows],
+                 dtype=float).reshape(len(rows), len(columns))
+    flags = [mapping_method.is_benefit_column(c) for c in columns]
+    scores, _ = saw_method.saw(M, weights, flags)
+    return {r[0]: float(s) for r, s in zip(rows, scores)}
+
+
+def check(conn, columns, weights, compiled):
+    expected = python_saw(conn, columns, weights, compiled.cfg)
+    results = saw_sql.saw_sql(conn, columns, weights, compiled)
+    got = {r["id"]: r["score"] for r in results}
+    if set(got) != set(expected):
+        print(f"GAGAL: id berbeda (sql={len(got)}, python={len(expected)})")
+        return False
+    diff = max((abs(got[i] - expected[i]) for i in got), default=0.0)
+    ordered = all(results[i]["score"] >= results[i + 1]["score"] for i in range(len(results) - 1))
+    print(f"n={len(got)}  max |selisih skor| = {diff:.3e}  urutan ranking benar={ordered}")
+    return diff <= TOL and ordered
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    compiled = mapping_method.get_compiled_mapping()
+    if '--db' in args:
+        path = args[args.index('--db') + 1]
+        conn = sqlite3.connect(path)
+        columns, weights, _ = saw_sql.saw_sql_from_db(conn, compiled, limit=1)
+    else:
+        n = 5000
+        if args:
+            try:
+                n = int(args[0])
+            except ValueError:
+                pass
+        conn = random_db(n)
+        columns = ['usia', 'pendapatan', 'pekerjaan', 'jaminan']
+        weights = [0.35, 0.25, 0.2, 0.2]
+    ok = check(conn, columns, weights, compiled)
+    conn.close()
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,35 @@
+"""Import nasabah dari file CSV / XLSX ke spk_kredit.db (aturan encoding = scripts/seed_nasabah.py).
+Usage: python tools\import_nasabah.py file.csv|file.xlsx [--dry-run] [--strict] [--batch N] [--db path]
+Kolom wajib: nama, usia, pekerjaan, pendapatan, jaminan (kolom id diabaikan).
+usia/pendapatan boleh berupa kode 1..4 atau nilai asli (tahun / rupiah);
+pekerjaan/jaminan boleh berupa kode atau teks (PNS, Karyawan, Sertifikat, BPKB Mobil, ...).
+--dry-run: hanya validasi dan laporan. --strict: batal jika ada baris error.
+Exit code 1 jika ada baris error.
+"""
+import sys
+import os
+
+# pastikan bisa akses models
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import database
+from models import nasabah_import
+
+
+def _opt(args, name, default=None):
+    if name in args:
+        return args[args.index(name) + 1]
+    return default
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if not args or args[0].startswith('--'):
+        print(__doc__)
+        sys.exit(2)
+    database.DB_NAME = _opt(args, '--db', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'spk_kredit.db'))
+    database.init_db()
+    report = nasabah_import.import_nasabah(args[0], dry_run='--dry-run' in args, strict='--strict' in args,
+                                           batch_size=int(_opt(args, '--batch', 50000)))
+    print(report.summary())
+    sys.exit(1 if report.n_errors else 0)
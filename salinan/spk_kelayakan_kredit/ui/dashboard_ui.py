@@ -33,13 +33,11 @@ class DashboardFrame(tk.Frame):
         ttk.Button(quick, text="Perhitungan", command=self.go_perhitungan).pack(side="left", padx=6)
 
     def load_stats(self):
-        conn = database.get_connection()
-        cur = conn.cursor()
+        cur = database.get_connection().cursor()
         cur.execute("SELECT COUNT(*) FROM nasabah")
         total_nasabah = cur.fetchone()[0]
         cur.execute("SELECT COUNT(*) FROM kriteria")
         total_kriteria = cur.fetchone()[0]
-        conn.close()
 
         self.lbl_total.config(text=f"Total Nasabah: {total_nasabah}")
         self.lbl_kriteria.config(text=f"Total Kriteria: {total_kriteria}")
@@ -52,11 +52,8 @@ class KriteriaFrame(tk.Frame):
             messagebox.showerror("Error", "Bobot harus angka (mis. 0.25).")
             return
 
-        conn = database.get_connection()
-        cur = conn.cursor()
-        cur.execute("INSERT INTO kriteria (nama, bobot) VALUES (?, ?)", (nama, b))
-        conn.commit()
-        conn.close()
+        with database.transaction() as conn:
+            conn.execute("INSERT INTO kriteria (nama, bobot) VALUES (?, ?)", (nama, b))
         messagebox.showinfo("Sukses", "Kriteria ditambahkan.")
         self.entry_nama.delete(0, tk.END)
         self.entry_bobot.delete(0, tk.END)
@@ -65,11 +62,9 @@ class KriteriaFrame(tk.Frame):
     def load_kriteria(self):
         for r in self.tree.get_children():
             self.tree.delete(r)
-        conn = database.get_connection()
-        cur = conn.cursor()
+        cur = database.get_connection().cursor()
         cur.execute("SELECT id, nama, bobot FROM kriteria ORDER BY id")
         rows = cur.fetchall()
-        conn.close()
         for r in rows:
             self.tree.insert("", "end", values=r)
 
@@ -96,11 +91,8 @@ class KriteriaFrame(tk.Frame):
         except:
             messagebox.showerror("Error", "Bobot harus angka.")
             return
-        conn = database.get_connection()
-        cur = conn.cursor()
-        cur.execute("UPDATE kriteria SET nama=?, bobot=? WHERE id=?", (nama, b, id_))
-        conn.commit()
-        conn.close()
+        with database.transaction() as conn:
+            conn.execute("UPDATE kriteria SET nama=?, bobot=? WHERE id=?", (nama, b, id_))
         messagebox.showinfo("Sukses", "Kriteria diperbarui.")
         self.load_kriteria()
 
@@ -112,10 +104,7 @@ class KriteriaFrame(tk.Frame):
         id_ = self.tree.item(sel[0])["values"][0]
         if not messagebox.askyesno("Konfirmasi", "Hapus kriteria terpilih?"):
             return
-        conn = database.get_connection()
-        cur = conn.cursor()
-        cur.execute("DELETE FROM kriteria WHERE id=?", (id_,))
-        conn.commit()
-        conn.close()
+        with database.transaction() as conn:
+            conn.execute("DELETE FROM kriteria WHERE id=?", (id_,))
         messagebox.showinfo("Sukses", "Kriteria dihapus.")
         self.load_kriteria()
@@ -36,11 +36,9 @@ class LoginFrame(tk.Frame):
             messagebox.showerror("Error", "Isi username dan password.")
             return
 
-        conn = database.get_connection()
-        cur = conn.cursor()
+        cur = database.get_connection().cursor()
         cur.execute("SELECT id FROM users WHERE username=? AND password=?", (username, password))
         row = cur.fetchone()
-        conn.close()
 
         if row:
             messagebox.showinfo("Sukses", f"Login berhasil. Selamat, {username}!")
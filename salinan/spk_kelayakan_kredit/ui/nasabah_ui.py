@@ -1,11 +1,41 @@
 # ui/nasabah_ui.py
+import time
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from models import database
+from models import nasabah_import
+from models import nasabah_model
+from models import nasabah_query
+from methods import mapping as mapping_method
+from methods import score_cache
+from methods import run_cache
+from methods import saw_incremental
+from methods import worker as worker_method
+from ui.virtual_table import VirtualTable
+
+USIA_LABELS = {1: "<25 tahun", 2: "25-35 tahun", 3: "36-50 tahun", 4: ">50 tahun"}
+PENDAPATAN_LABELS = {1: "<2 juta", 2: "2-5 juta", 3: "5-10 juta", 4: ">10 juta"}
+PEKERJAAN_LABELS = {1: "PNS/Karyawan Tetap", 2: "Wiraswasta", 3: "Buruh/Karyawan Kontrak", 4: "Lainnya"}
+JAMINAN_LABELS = {1: "Sertifikat Rumah/Tanah", 2: "BPKB Kendaraan", 3: "Tanpa Jaminan"}
+
+# cari / filter: query dijalankan setelah ketikan berhenti selama SEARCH_DELAY_MS
+SEARCH_DELAY_MS = 250
+SEARCH_POLL_MS = 30
+FILTER_ALL = "Semua"
 
 class NasabahFrame(tk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
+        # skor sementara saat input (dibangun saat pertama dipakai) + data stamp saat itu
+        self._intake_scorer = None
+        self._intake_stamp = None
+        # cari / filter di thread latar (satu query sekaligus, yang lama di-interrupt)
+        self._search_worker = worker_method.Worker()
+        self._search_conn = None
+        self._search_after = None
+        self._search_pending = None
+        self._search_polling = False
+        self._sort = ("id", False)
         self.build_ui()
         self.load_data()
 
@@ -47,26 +77,49 @@ class NasabahFrame(tk.Frame):
         tk.Button(btn_frame, text="Simpan", command=self.simpan_nasabah, bg="#2ecc71", fg="white").pack(side="left", padx=6)
         tk.Button(btn_frame, text="Reset", command=self.reset_form, bg="#e67e22", fg="white").pack(side="left", padx=6)
 
+        # cari nama (FTS) + filter kategori (index komposit), lihat models/nasabah_query.py
+        filter_frame = tk.Frame(self)
+        filter_frame.pack(fill="x", padx=12, pady=(8, 0))
+        tk.Label(filter_frame, text="Cari Nama").pack(side="left", padx=(0, 4))
+        self.search_var = tk.StringVar()
+        tk.Entry(filter_frame, textvariable=self.search_var, width=24).pack(side="left", padx=4)
+        self.search_var.trace_add("write", lambda *args: self._schedule_search())
+        self.filter_combos = {}
+        for col, text, labels in (("usia", "Usia", USIA_LABELS), ("pendapatan", "Pendapatan", PENDAPATAN_LABELS),
+                                  ("pekerjaan", "Pekerjaan", PEKERJAAN_LABELS), ("jaminan", "Jaminan", JAMINAN_LABELS)):
+            tk.Label(filter_frame, text=text).pack(side="left", padx=(8, 2))
+            combo = ttk.Combobox(filter_frame, values=[FILTER_ALL] + [f"{k} - {v}" for k, v in labels.items()],
+                                 width=16, state="readonly")
+            combo.set(FILTER_ALL)
+            combo.bind("<<ComboboxSelected>>", lambda e: self._schedule_search())
+            combo.pack(side="left", padx=2)
+            self.filter_combos[col] = combo
+        ttk.Button(filter_frame, text="Reset Filter", command=self._reset_filter).pack(side="left", padx=8)
+        self.lbl_filter = ttk.Label(filter_frame, text="")
+        self.lbl_filter.pack(side="right", padx=4)
+
         # tabel dengan fitur seleksi (ceklist style) dan tombol aksi
         table_frame = tk.Frame(self)
         table_frame.pack(fill="both", expand=True, padx=12, pady=8)
 
         # Add a 'Sel' column to act like a checkbox (☐ / ☑) for UI selection
         cols = ("Sel", "ID", "Nama", "Usia", "Pendapatan", "Pekerjaan", "Jaminan")
-        self.tree = ttk.Treeview(table_frame, columns=cols, show="headings")
-        for c in cols:
-            self.tree.heading(c, text=c)
-            # narrow column for selection
-            if c == "Sel":
-                self.tree.column(c, width=40, anchor='center')
-            elif c == "Nama":
-                self.tree.column(c, width=220)
-            else:
-                self.tree.column(c, width=120)
-        self.tree.pack(fill="both", expand=True)
-
-        # maintain selected set of nasabah ids shown in the table
-        self._selected_ids = set()
+        # narrow column for selection
+        widths = {c: {"width": 120} for c in cols}
+        widths["Sel"] = {"width": 40, "anchor": "center"}
+        widths["Nama"] = {"width": 220}
+        # tabel virtual: hanya baris yang terlihat ada di Treeview, data dibaca per page
+        # dari DB (keyset); klik heading -> sort lewat index
+        self.pager = nasabah_query.NasabahPager()
+        sort_keys = {"ID": "id", "Nama": "nama", "Usia": "usia", "Pendapatan": "pendapatan",
+                     "Pekerjaan": "pekerjaan", "Jaminan": "jaminan"}
+        self.table = VirtualTable(table_frame, cols, self.pager, self._format_row,
+                                  widths=widths, sort_keys=sort_keys, on_sort=self._sort_table)
+        self.table.pack(fill="both", expand=True)
+        self.tree = self.table.tree
+
+        # pilihan nasabah (set id / predicate select all), iid Treeview = id nasabah
+        self.selection = nasabah_query.Selection()
 
         # bind click to toggle selection checkbox
         self.tree.bind('<Button-1>', self._on_tree_click)
@@ -79,6 +132,9 @@ class NasabahFrame(tk.Frame):
         ttk.Button(action_frame, text='Hapus Terpilih', command=self._delete_selected).pack(side='left', padx=4)
         ttk.Button(action_frame, text='Pindah ke Processed', command=self._move_selected_to_processed).pack(side='left', padx=4)
         ttk.Button(action_frame, text='Tampilkan Processed', command=self._show_processed).pack(side='left', padx=4)
+        ttk.Button(action_frame, text='Import CSV/XLSX', command=self._import_file).pack(side='left', padx=4)
+        self.lbl_selected = ttk.Label(action_frame, text='Terpilih: 0')
+        self.lbl_selected.pack(side='right', padx=4)
 
     def simpan_nasabah(self):
         nama = self.entry_nama.get().strip()
@@ -91,20 +147,76 @@ class NasabahFrame(tk.Frame):
             messagebox.showerror("Error", "Semua field harus diisi!")
             return
 
-        conn = database.get_connection()
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO nasabah (nama, usia, pendapatan, pekerjaan, jaminan) VALUES (?, ?, ?, ?, ?)",
-            (nama, int(usia), int(pendapatan), int(pekerjaan), int(jaminan))
-        )
-        conn.commit()
-        conn.close()
+        with database.transaction() as conn:
+            cur = conn.execute(
+                "INSERT INTO nasabah (nama, usia, pendapatan, pekerjaan, jaminan) VALUES (?, ?, ?, ?, ?)",
+                (nama, int(usia), int(pendapatan), int(pekerjaan), int(jaminan))
+            )
+            new_id = cur.lastrowid
+        info = self._intake_score(database.get_connection(), new_id)
 
-        messagebox.showinfo("Sukses", "Data nasabah berhasil ditambahkan.")
+        messagebox.showinfo("Sukses", "Data nasabah berhasil ditambahkan." + info)
         # clear form
         self.reset_form()
         self.load_data()
 
+    def _intake_score(self, conn, nasabah_id):
+        """Skor SAW + ranking sementara nasabah baru (lookup tabel skor). Non-fatal."""
+        try:
+            # bobot kriteria / pairwise / ahp_mapping.json dibaca ulang tiap input
+            criteria_weights = score_cache.current_criteria_weights(conn)
+            cfg = mapping_method.get_compiled_mapping().cfg
+            engine = saw_incremental.get_engine(create=True)
+            if engine is not None:
+                # sudah Hitung SAW: masukkan ke engine inkremental (dibuat saat input pertama)
+                cur = conn.cursor()
+                select_cols = ", ".join([f'"{c}"' for c in engine.columns])
+                cur.execute(f"SELECT nama, {select_cols} FROM nasabah WHERE id = ?", (nasabah_id,))
+                row = cur.fetchone()
+                if row is None:
+                    return ""
+                res = engine.add(nasabah_id, row[0], row[1:])
+                if engine.matches(criteria_weights[1], cfg):
+                    self._intake_scorer = None
+                    if res is None:
+                        return "\nNasabah tidak memenuhi syarat (usia > 50)."
+                    score, rank = res
+                    return f"\nSkor SAW: {score:.6f} (peringkat {rank} dari {len(engine)})"
+                # bobot / mapping berubah sejak Hitung SAW: skor sementara dengan bobot saat ini
+            # scorer lama hanya dipakai ulang jika bobot dan mapping sama dan satu-satunya
+            # perubahan data sejak itu adalah INSERT nasabah ini (bukan hapus / pindah ke processed)
+            stamp = run_cache.data_stamp(conn)
+            scorer = self._intake_scorer
+            reuse = (scorer is not None and scorer.matches(*criteria_weights, cfg)
+                     and stamp == [nasabah_id, self._intake_stamp[1]]
+                     and self._intake_stamp[0] == nasabah_id - 1)
+            if not reuse:
+                # counts dibaca dari DB, sudah termasuk nasabah baru
+                scorer = self._intake_scorer = score_cache.IntakeScorer.from_db(conn, cfg, criteria_weights)
+            self._intake_stamp = stamp
+            cur = conn.cursor()
+            select_cols = ", ".join([f'"{c}"' for c in scorer.columns])
+            cur.execute(f"SELECT {select_cols} FROM nasabah WHERE id = ?", (nasabah_id,))
+            raw = cur.fetchone()
+            if raw is None:
+                return ""
+            if reuse:
+                scorer.add(raw)
+            res = scorer.score_and_rank(raw)
+            if res is None:
+                return "\nNasabah tidak memenuhi syarat (usia > 50)."
+            score, rank, total = res
+            return f"\nSkor SAW sementara: {score:.6f} (peringkat {rank} dari {total})"
+        except Exception:
+            self._intake_scorer = None
+            return ""
+
+    def _engine_remove(self, ids):
+        # hapus dari engine SAW inkremental (jika ada hasil SAW) agar ranking tetap terkini
+        engine = saw_incremental.get_engine(create=True)
+        if engine is not None:
+            engine.remove_many(ids)
+
     def reset_form(self):
         self.entry_nama.delete(0, tk.END)
         self.combo_usia.set("")
@@ -113,32 +225,21 @@ class NasabahFrame(tk.Frame):
         self.combo_jaminan.set("")
 
     def load_data(self):
-        # clear existing rows
-        for r in self.tree.get_children():
-            self.tree.delete(r)
-
-        conn = database.get_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT id, nama, usia, pendapatan, pekerjaan, jaminan FROM nasabah")
-        rows = cur.fetchall()
-        conn.close()
-
-        usia_map = {1: "<25 tahun", 2: "25-35 tahun", 3: "36-50 tahun", 4: ">50 tahun"}
-        pend_map = {1: "<2 juta", 2: "2-5 juta", 3: "5-10 juta", 4: ">10 juta"}
-        kerja_map = {1: "PNS/Karyawan Tetap", 2: "Wiraswasta", 3: "Buruh/Karyawan Kontrak", 4: "Lainnya"}
-        jam_map = {1: "Sertifikat Rumah/Tanah", 2: "BPKB Kendaraan", 3: "Tanpa Jaminan"}
-
-        for row in rows:
-            id_, nama, usia, pend, kerja, jam = row
-            sel_symbol = '☑' if id_ in self._selected_ids else '☐'
-            self.tree.insert("", "end", values=(
-                sel_symbol,
-                id_, nama,
-                usia_map.get(usia, usia),
-                pend_map.get(pend, pend),
-                kerja_map.get(kerja, kerja),
-                jam_map.get(jam, jam)
-            ))
+        # jumlah + page dibaca ulang dari DB; posisi scroll dipertahankan
+        self.table.refresh()
+        self._update_selected_label()
+
+    def _format_row(self, row):
+        id_, nama, usia, pend, kerja, jam = row
+        sel_symbol = '☑' if self.selection.is_selected(id_) else '☐'
+        return str(id_), (
+            sel_symbol,
+            id_, nama,
+            USIA_LABELS.get(usia, usia),
+            PENDAPATAN_LABELS.get(pend, pend),
+            PEKERJAAN_LABELS.get(kerja, kerja),
+            JAMINAN_LABELS.get(jam, jam)
+        )
 
     # ---------------- Selection helpers ----------------
     def _on_tree_click(self, event):
@@ -152,112 +253,204 @@ class NasabahFrame(tk.Frame):
             return
         # only toggle when Sel column (first column #1) is clicked
         if col == '#1':
-            vals = self.tree.item(item, 'values')
             try:
-                id_val = int(vals[1])
-            except Exception:
+                id_val = int(item)
+            except ValueError:
                 return
-            if id_val in self._selected_ids:
-                self._selected_ids.remove(id_val)
-            else:
-                self._selected_ids.add(id_val)
-            # update symbol
-            # rebuild values tuple
-            new_sel = '☑' if id_val in self._selected_ids else '☐'
-            new_vals = list(vals)
-            new_vals[0] = new_sel
-            self.tree.item(item, values=new_vals)
+            # hanya sel ceklist baris ini yang diubah
+            selected = self.selection.toggle(id_val)
+            self.tree.set(item, 'Sel', '☑' if selected else '☐')
+            self._update_selected_label()
 
-    def _select_all(self):
-        # add all displayed ids to selected set
+    def _refresh_checks(self):
+        # simbol ceklist hanya untuk baris yang sedang ada di Treeview
         for item in self.tree.get_children():
-            vals = self.tree.item(item, 'values')
-            try:
-                id_val = int(vals[1])
-            except Exception:
-                continue
-            self._selected_ids.add(id_val)
-            new_vals = list(vals)
-            new_vals[0] = '☑'
-            self.tree.item(item, values=new_vals)
+            self.tree.set(item, 'Sel', '☑' if self.selection.is_selected(int(item)) else '☐')
+        self._update_selected_label()
+
+    def _update_selected_label(self):
+        self.lbl_selected.configure(text=f'Terpilih: {self.selection.count()}')
+
+    def _select_all(self):
+        # satu predicate (baris yang cocok filter saat ini), bukan update per baris
+        self.selection.select_all(self.pager.where, self.pager.params)
+        self._refresh_checks()
 
     def _clear_selection(self):
-        self._selected_ids.clear()
-        for item in self.tree.get_children():
-            vals = list(self.tree.item(item, 'values'))
-            vals[0] = '☐'
-            self.tree.item(item, values=vals)
+        self.selection.clear()
+        self._refresh_checks()
+
+    def _after_bulk_change(self):
+        # pilihan / skor sementara / engine SAW mengikuti data yang berubah
+        if self.selection.all:
+            # id yang terhapus tidak diketahui satu per satu: engine dibangun ulang saat Hitung SAW
+            saw_incremental.clear_engine()
+        else:
+            self._engine_remove(self.selection.ids)
+        self.selection.clear()
+        self._intake_scorer = None
+        self.load_data()
 
     def _delete_selected(self):
-        if not self._selected_ids:
+        n = self.selection.count()
+        if n == 0:
             messagebox.showinfo('Info', 'Belum ada nasabah yang dipilih.')
             return
-        ok = messagebox.askyesno('Hapus Nasabah', f'Yakin ingin menghapus {len(self._selected_ids)} nasabah terpilih?')
+        ok = messagebox.askyesno('Hapus Nasabah', f'Yakin ingin menghapus {n} nasabah terpilih?')
         if not ok:
             return
         try:
-            ids = list(self._selected_ids)
-            q_marks = ','.join(['?'] * len(ids))
-            conn = database.get_connection()
-            cur = conn.cursor()
-            cur.execute(f'DELETE FROM nasabah WHERE id IN ({q_marks})', ids)
-            conn.commit()
-            conn.close()
+            # satu DELETE di SQLite (lihat Selection.clause)
+            nasabah_model.hapus_terpilih(self.selection)
             messagebox.showinfo('Sukses', 'Nasabah terpilih berhasil dihapus.')
-            self._selected_ids.clear()
-            self.load_data()
+            self._after_bulk_change()
         except Exception as e:
             messagebox.showerror('Error', f'Gagal menghapus nasabah: {e}')
 
     def _move_selected_to_processed(self):
-        if not self._selected_ids:
+        n = self.selection.count()
+        if n == 0:
             messagebox.showinfo('Info', 'Belum ada nasabah yang dipilih.')
             return
-        ok = messagebox.askyesno('Pindah ke Processed', f'Pindahkan {len(self._selected_ids)} nasabah terpilih ke grup processed?')
+        ok = messagebox.askyesno('Pindah ke Processed', f'Pindahkan {n} nasabah terpilih ke grup processed?')
         if not ok:
             return
         try:
-            ids = list(self._selected_ids)
-            q_marks = ','.join(['?'] * len(ids))
-            conn = database.get_connection()
-            cur = conn.cursor()
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS processed_nasabah (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    original_id INTEGER,
-                    nama TEXT,
-                    usia INTEGER,
-                    pendapatan REAL,
-                    pekerjaan TEXT,
-                    jaminan TEXT,
-                    processed_at TEXT
-                )
-            ''')
-            cur.execute(f"SELECT id, nama, usia, pendapatan, pekerjaan, jaminan FROM nasabah WHERE id IN ({q_marks})", ids)
-            rows = cur.fetchall()
-            import datetime
-            now = datetime.datetime.now().isoformat()
-            for row in rows:
-                orig_id, nama, usia, pendapatan, pekerjaan, jaminan = row
-                cur.execute('''INSERT INTO processed_nasabah (original_id, nama, usia, pendapatan, pekerjaan, jaminan, processed_at)
-                               VALUES (?, ?, ?, ?, ?, ?, ?)''', (orig_id, nama, usia, pendapatan, pekerjaan, jaminan, now))
-            cur.execute(f'DELETE FROM nasabah WHERE id IN ({q_marks})', ids)
-            conn.commit()
-            conn.close()
+            # tabel processed_nasabah dibuat sekali oleh database.create_tables
+            nasabah_model.pindahkan_terpilih_ke_processed(self.selection)
             messagebox.showinfo('Sukses', 'Nasabah terpilih telah dipindahkan ke processed.')
-            self._selected_ids.clear()
-            self.load_data()
+            self._after_bulk_change()
         except Exception as e:
             messagebox.showerror('Error', f'Gagal memindahkan nasabah: {e}')
 
+    # ---------------- Cari / filter ----------------
+    def _filter_values(self):
+        codes = {}
+        for col, combo in self.filter_combos.items():
+            value = combo.get()
+            codes[col] = int(value.split(" - ")[0]) if value and value != FILTER_ALL else None
+        return self.search_var.get().strip(), codes
+
+    def _reset_filter(self):
+        for combo in self.filter_combos.values():
+            combo.set(FILTER_ALL)
+        self.search_var.set("")
+        self._schedule_search()
+
+    def _schedule_search(self):
+        # debounce: tiap ketikan menunda query; hanya nilai terakhir yang dicari
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+        self._search_after = self.after(SEARCH_DELAY_MS, self._run_search)
+
+    def _sort_table(self, sort, desc):
+        # sort baru (dengan filter saat ini) dibaca di thread latar seperti cari
+        self._sort = (sort, desc)
+        self._run_search()
+
+    def _run_search(self):
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+            self._search_after = None
+        self._search_pending = self._filter_values()
+        if self._search_worker.busy:
+            # query lama dihentikan di tengah jalan; query baru dimulai oleh _poll_search
+            self._search_worker.cancel()
+            if self._search_conn is not None:
+                self._search_conn.interrupt()
+        else:
+            self._start_search()
+
+    def _start_search(self):
+        text, codes = self._search_pending
+        self._search_pending = None
+        self._search_worker.submit("Cari", self._search_job, (), text, codes, *self._sort)
+        self.lbl_filter.configure(text="Mencari...")
+        if not self._search_polling:
+            self._search_polling = True
+            self.after(SEARCH_POLL_MS, self._poll_search)
+
+    def _search_job(self, job, text, codes, sort, desc):
+        # thread latar: pager baru dengan filter, page pertama (+ jumlah) sudah dibaca
+        # di sini sehingga thread UI hanya menggambar
+        t0 = time.perf_counter()
+        self._search_conn = database.get_connection()
+        job.check()
+        pager = nasabah_query.NasabahPager(sort, desc)
+        pager.set_filter(text, **codes)
+        job.check()
+        pager.rows(0, pager.page_size)
+        job.check()
+        pager.count()
+        return pager, time.perf_counter() - t0
+
+    def _poll_search(self):
+        busy = self._search_worker.busy
+        job = self._search_worker.job
+        for ev in self._search_worker.poll():
+            if job.cancelled:
+                # dibatalkan / di-interrupt karena ada query yang lebih baru
+                continue
+            if ev[0] == "done":
+                self._show_search(*ev[1])
+            elif ev[0] == "error":
+                self.lbl_filter.configure(text=f"Gagal mencari: {ev[1]}")
+        if busy:
+            self.after(SEARCH_POLL_MS, self._poll_search)
+        elif self._search_pending is not None:
+            self._search_polling = False
+            self._start_search()
+        else:
+            self._search_polling = False
+
+    def _show_search(self, pager, seconds):
+        self.pager = pager
+        # filter berubah: pilihan lama (select all = predicate filter lama) dikosongkan
+        if self.selection.rescope(pager.where, pager.params):
+            self._update_selected_label()
+        self.table.set_source(pager)
+        if pager.where:
+            self.lbl_filter.configure(text=f"Ditemukan {pager.count():,} nasabah ({seconds * 1000:.0f} ms)")
+        else:
+            self.lbl_filter.configure(text="")
+
+    def destroy(self):
+        self._search_worker.shutdown()
+        super().destroy()
+
+    def _import_file(self):
+        path = filedialog.askopenfilename(title='Import Nasabah',
+                                          filetypes=[('CSV / Excel', '*.csv *.xlsx'), ('Semua file', '*.*')])
+        if not path:
+            return
+        try:
+            # validasi dulu (dry-run), baru simpan setelah dikonfirmasi
+            report = nasabah_import.import_nasabah(path, dry_run=True, max_messages=10)
+        except Exception as e:
+            messagebox.showerror('Error', f'Gagal membaca file: {e}')
+            return
+        if report.valid == 0:
+            messagebox.showwarning('Import Nasabah', 'Tidak ada baris valid.\n\n' + report.summary())
+            return
+        if not messagebox.askyesno('Import Nasabah', report.summary() + f'\n\nSimpan {report.valid} nasabah valid?'):
+            return
+        try:
+            report = nasabah_import.import_nasabah(path, max_messages=10)
+        except Exception as e:
+            messagebox.showerror('Error', f'Gagal import nasabah: {e}')
+            return
+        # skor sementara / engine SAW dibangun ulang pada perhitungan berikutnya
+        self._intake_scorer = None
+        saw_incremental.clear_engine()
+        messagebox.showinfo('Sukses', f'{report.inserted} nasabah berhasil diimport ({report.seconds:.1f} s).')
+        self.load_data()
+
     def _show_processed(self):
         # show processed_nasabah in a new window
         try:
-            conn = database.get_connection()
-            cur = conn.cursor()
+            cur = database.get_connection().cursor()
             cur.execute('SELECT id, original_id, nama, usia, pendapatan, pekerjaan, jaminan, processed_at FROM processed_nasabah')
             rows = cur.fetchall()
-            conn.close()
         except Exception as e:
             messagebox.showerror('Error', f'Gagal membaca processed_nasabah: {e}')
             return
@@ -6,12 +6,32 @@ import numpy as np
 import csv
 import os
 import json
+import time
 from models import database
 from models import kriteria_model
+from models import result_model
+from models import nasabah_model
 from methods import ahp as ahp_method
+from methods import sysinfo
+from methods import profiles as profile_method
+from methods import ranking as ranking_method
+from methods import result_store
+from methods import mapping as mapping_method
+from methods import saw_incremental
+from methods import snapshot as snapshot_method
+from methods import saw_stream
+from methods import saw_sql
+from methods import run_cache
+from methods import worker as worker_method
+from ui.virtual_table import VirtualTable
 
 RI_TABLE = {1:0.0,2:0.0,3:0.58,4:0.90,5:1.12,6:1.24,7:1.32,8:1.41,9:1.45,10:1.49}
 
+# tahapan progress per perhitungan (lihat methods/worker.py) + interval polling UI (ms)
+SAW_STAGES = ("load", "map", "rank", "persist")
+AHP_FULL_STAGES = ("load", "map", "pairwise", "eigen", "rank", "persist")
+POLL_MS = 50
+
 class PerhitunganFrame(tk.Frame):
     """
     PerhitunganFrame:
@@ -23,55 +43,11 @@ class PerhitunganFrame(tk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
         self._saw_result = None
+        # perhitungan berat jalan di thread latar; UI tetap responsif
+        self._worker = worker_method.Worker()
+        self._job_active = False
         # load ahp mapping config (optional)
-        self._ahp_map = {}
-        try:
-            root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            cfg_path = os.path.join(root, 'ahp_mapping.json')
-            if os.path.exists(cfg_path):
-                with open(cfg_path, 'r', encoding='utf-8') as f:
-                    self._ahp_map = json.load(f)
-        except Exception:
-            self._ahp_map = {}
-
-        # helper closures using mapping
-        def _map_value(colname, raw):
-            # prefer categorical_mappings keyed by field name patterns
-            try:
-                cat_maps = self._ahp_map.get('categorical_mappings', {})
-                # try specific keys
-                key = f"{colname}_code"
-                if key in cat_maps:
-                    return float(cat_maps[key].get(str(raw), raw))
-                # fallback: try generic mapping by column name
-                if colname in cat_maps:
-                    return float(cat_maps[colname].get(str(raw), raw))
-            except Exception:
-                pass
-            # default: try convert to float
-            try:
-                return float(raw)
-            except Exception:
-                return 0.0
-
-        def _is_age_ineligible(raw):
-            # treat raw==4 (category >50) as ineligible, also if numeric age >50
-            try:
-                rv = int(raw)
-            except Exception:
-                try:
-                    rv = int(float(raw))
-                except Exception:
-                    return False
-            if rv == 4:
-                return True
-            # if actual age value (e.g., 51) treat >50 ineligible
-            if rv > 50:
-                return True
-            return False
-
-        self._map_value = _map_value
-        self._is_age_ineligible = _is_age_ineligible
+        self._ahp_map = mapping_method.get_compiled_mapping().cfg
         # Reset any persisted criteria pairwise on startup so UI starts clean
         try:
             kriteria_model.delete_pairwise_matrix('default')
@@ -121,9 +97,23 @@ class PerhitunganFrame(tk.Frame):
 
         btns = tk.Frame(frm_saw)
         btns.pack(anchor="w", padx=8, pady=8)
-        ttk.Button(btns, text="Hitung SAW", command=self.hitung_saw).pack(side="left", padx=6)
-        ttk.Button(btns, text="Hitung AHP (Full)", command=self.hitung_ahp_full).pack(side="left", padx=6)
+        btn_saw = ttk.Button(btns, text="Hitung SAW", command=self.hitung_saw)
+        btn_saw.pack(side="left", padx=6)
+        btn_ahp_full = ttk.Button(btns, text="Hitung AHP (Full)", command=self.hitung_ahp_full)
+        btn_ahp_full.pack(side="left", padx=6)
+        self._compute_buttons = [btn_saw, btn_ahp_full]
         ttk.Button(btns, text="Tampilkan Hasil (jika tersedia)", command=self.show_results_window).pack(side="left", padx=6)
+        ttk.Button(btns, text="Riwayat Perhitungan", command=self.show_runs_window).pack(side="left", padx=6)
+
+        # progress perhitungan latar + tombol batal
+        prog = tk.Frame(frm_saw)
+        prog.pack(fill="x", padx=8)
+        self.progress_var = tk.DoubleVar(value=0)
+        ttk.Progressbar(prog, variable=self.progress_var, maximum=100, length=300).pack(side="left")
+        self.btn_cancel = ttk.Button(prog, text="Batal", command=self._cancel_job, state="disabled")
+        self.btn_cancel.pack(side="left", padx=6)
+        self.lbl_progress = ttk.Label(prog, text="")
+        self.lbl_progress.pack(side="left", padx=6)
 
         self.txt_saw = tk.Text(frm_saw, height=6)
         self.txt_saw.pack(fill="both", padx=8, pady=6, expand=False)
@@ -136,11 +126,9 @@ class PerhitunganFrame(tk.Frame):
         Simpan internally untuk perhitungan SAW.
         """
         try:
-            conn = database.get_connection()
-            cur = conn.cursor()
+            cur = database.get_connection().cursor()
             cur.execute("SELECT id, nama, bobot FROM kriteria ORDER BY id")
             rows = cur.fetchall()
-            conn.close()
         except Exception as e:
             messagebox.showerror("DB Error", f"Gagal membaca kriteria: {e}")
             return
@@ -332,8 +320,12 @@ class PerhitunganFrame(tk.Frame):
                     mat[i,j] = val
                     mat[j,i] = 1.0/val if val != 0 else 0.0
 
-                # compute ahp
-                weights, CI, CR = ahp_method.ahp_from_pairwise(mat)
+                # compute ahp (warm start dari bobot sebelumnya jika ukurannya sama)
+                solver, tol, max_iter = self._ahp_solver_settings()
+                prev = self.weights if hasattr(self, 'weights') and len(self.weights) == n else None
+                weights, CI, CR, solver_info = ahp_method.ahp_from_pairwise(
+                    mat, solver=solver, tol=tol, max_iter=max_iter, x0=prev, return_info=True)
+                self._last_solver_info = solver_info
                 # store
                 self.criteria_pairwise = mat
                 try:
@@ -350,7 +342,8 @@ class PerhitunganFrame(tk.Frame):
 
                 dlg.destroy()
 
-                msg = f"AHP selesai. λ_max info di bawah:\nCI = {CI:.6f}\nCR = {CR:.6f}"
+                msg = f"AHP selesai. λ_max info di bawah:\nλ_max = {solver_info['lambda_max']:.6f}\nCI = {CI:.6f}\nCR = {CR:.6f}"
+                msg += f"\nSolver: {solver_info['solver']} ({solver_info['iterations']} iterasi, residual {solver_info['residual']:.2e})"
                 if CR > 0.1:
                     msg += "\nCR > 0.1 (tidak konsisten). Pertimbangkan mengoreksi input perbandingan."
                 messagebox.showinfo("Hasil AHP", msg)
@@ -448,84 +441,42 @@ class PerhitunganFrame(tk.Frame):
                 messagebox.showerror("Error", "Tidak ada kriteria di database.")
                 return
 
-            cols = self._map_criteria_to_columns(self.criteria)
-            conn = database.get_connection()
-            cur = conn.cursor()
-            select_cols = ", ".join([f'"{c}"' for c in cols])
-            sql = f"SELECT id, nama, {select_cols} FROM nasabah"
-            cur.execute(sql)
-            rows = cur.fetchall()
-            conn.close()
+            snap = self._snapshot(self.criteria, self._compiled_mapping())
+            cols = snap.columns
 
-            if not rows:
+            if not len(snap):
                 messagebox.showinfo("Info", "Data nasabah kosong.")
                 return
 
-            # apply mapping and filter ineligible by age (>50 -> category code 4)
-            usia_idx = None
-            for ci, cname in enumerate(cols):
-                if 'usia' in cname.lower():
-                    usia_idx = ci
-                    break
-
-            eligible_rows = []
-            ineligible_list = []
-            for r in rows:
-                # r: (id, nama, col1, col2, ...)
-                if usia_idx is not None:
-                    raw_age = r[2 + usia_idx]
-                    if self._is_age_ineligible(raw_age):
-                        ineligible_list.append({"id": r[0], "nama": r[1], "reason": "usia > 50"})
-                        continue
-                eligible_rows.append(r)
-
-            if not eligible_rows:
+            # filter usia (>50 -> category code 4) sudah dihitung di snapshot
+            if not snap.n_eligible:
                 messagebox.showinfo("Info", "Tidak ada nasabah memenuhi syarat untuk ditampilkan (semua disaring oleh aturan usia).")
                 return
 
-            alt_names = [r[1] for r in eligible_rows]
-            matrix = []
-            for r in eligible_rows:
-                vals = []
-                for i, c in enumerate(cols):
-                    raw = r[2 + i]
-                    try:
-                        vals.append(self._map_value(c, raw))
-                    except Exception:
-                        raise ValueError(f"Nilai untuk kolom '{c}' pada nasabah '{r[1]}' tidak dapat dimapping: {raw}")
-                matrix.append(vals)
-            M = np.array(matrix, dtype=float)  # shape (n_alt, n_crit)
+            alt_names = snap.eligible_names
+            M = snap.eligible_matrix  # shape (n_alt, n_crit)
             n_alt, n_crit = M.shape
 
             # build local priority matrix using ratio + eigen
             benefit_flags = [(False if 'usia' in c.lower() else True) for c in cols]
-            local_priority_matrix = np.zeros((n_alt, n_crit), dtype=float)
-            pair_matrices = []
-            for j in range(n_crit):
-                col = M[:, j]
-                pair_alt = np.ones((n_alt, n_alt), dtype=float)
-                for i in range(n_alt):
-                    for k in range(n_alt):
-                        vi = col[i]
-                        vk = col[k]
-                        if vi == 0 and vk == 0:
-                            pair_alt[i, k] = 1.0
-                        elif vk == 0:
-                            pair_alt[i, k] = 1e9
-                        else:
-                            ratio = vi / vk
-                            pair_alt[i, k] = ratio if benefit_flags[j] else (vk / vi if vi != 0 else 1e9)
-                pair_matrices.append(pair_alt)
-                w_local, CI_local, CR_local = ahp_method.ahp_from_pairwise(pair_alt)
-                local_priority_matrix[:, j] = w_local
+            # bobot lokal tanpa membangun matriks pairwise; matriks hanya dibangun
+            # saat detail kriteria dibuka
+            # dihitung per profil unik lalu disebar kembali ke tiap nasabah
+            mode, mem_limit = self._ahp_full_settings()
+            profiles_u, inverse, counts = profile_method.unique_profiles(M)
+            local_u, _, _ = ahp_method.ahp_full_local_priorities(
+                profiles_u, benefit_flags, mode=mode, memory_limit_bytes=mem_limit, counts=counts)
 
             # criteria weights (from self.weights)
             crit_weights = np.array(self.weights, dtype=float)
             if not np.isclose(crit_weights.sum(), 1.0):
                 crit_weights = crit_weights / crit_weights.sum()
 
-            global_scores = local_priority_matrix.dot(crit_weights)
-            ranking = np.argsort(-global_scores)
+            global_scores = local_u.dot(crit_weights)[inverse]
+            ranks = ranking_method.rank_desc(global_scores)
+            # bobot lokal per profil unik; baris tabel dibaca dari store per jendela
+            store = result_store.ResultStore(snap.eligible_ids, alt_names, global_scores).set_ranking(ranks)
+            store.add_column("local_priorities", local_u, inverse)
 
             # build window and treeview showing detailed AHP table
             win = tk.Toplevel(self)
@@ -537,27 +488,29 @@ class PerhitunganFrame(tk.Frame):
             info_lbl.pack(fill='x', padx=6, pady=4)
 
             # show count of ineligible if any
-            if ineligible_list:
-                txt_inf = 'Jumlah yang tidak memenuhi syarat (usia>50): ' + str(len(ineligible_list))
+            if snap.n_ineligible:
+                txt_inf = 'Jumlah yang tidak memenuhi syarat (usia>50): ' + str(snap.n_ineligible)
                 lbl_bad = ttk.Label(win, text=txt_inf, foreground='red')
                 lbl_bad.pack(fill='x', padx=6, pady=2)
 
             # tree columns: Nama, then for each criterion show LocalPriority, then GlobalScore, Rank
             tree_cols = ['Nama'] + [f'LP-{c}' for c in self.criteria] + ['GlobalScore', 'Rank']
-            tree = ttk.Treeview(win, columns=tree_cols, show='headings')
-            for c in tree_cols:
-                tree.heading(c, text=c)
-                tree.column(c, width=140)
-            tree.pack(fill='both', expand=True, padx=6, pady=6)
 
-            for idx in range(n_alt):
-                row_vals = [alt_names[idx]] + [f"{local_priority_matrix[idx, j]:.6f}" for j in range(n_crit)] + [f"{global_scores[idx]:.6f}", int(np.where(ranking == idx)[0][0]) + 1]
-                tree.insert('', 'end', values=row_vals)
+            def format_row(item):
+                row_vals = [item['nama']] + [f"{lp:.6f}" for lp in item['local_priorities']] + [f"{item['score']:.6f}", item['rank']]
+                return str(item['id']), row_vals
+
+            table = VirtualTable(win, tree_cols, result_store.ResultPager(store), format_row,
+                                 widths={c: {'width': 140} for c in tree_cols}, sort_keys={'Rank': 'rank'})
+            table.pack(fill='both', expand=True, padx=6, pady=6)
 
             # also show a small matrix viewer for each criterion (pairwise and normalized)
             def show_detail_for_criterion(j):
-                pm = pair_matrices[j]
-                w_local = local_priority_matrix[:, j]
+                if mem_limit is not None and n_alt * n_alt * 8 > mem_limit:
+                    messagebox.showinfo('Info', f'Matriks {n_alt}x{n_alt} melebihi batas memori; detail tidak ditampilkan.')
+                    return
+                pm = ahp_method.build_ratio_matrix(M[:, j], benefit_flags[j])
+                w_local = local_u[inverse, j]
                 detail = tk.Toplevel(win)
                 detail.title(f'Detail Kriteria: {self.criteria[j]}')
                 info = ttk.Label(detail, text=f'Kriteria: {self.criteria[j]} (CI/CR ditampilkan di bawah)')
@@ -586,53 +539,198 @@ class PerhitunganFrame(tk.Frame):
         except Exception as e:
             messagebox.showerror('Error', f'Gagal menampilkan tabel AHP: {e}')
 
-    # ---------------- SAW computation ----------------
-    def _map_criteria_to_columns(self, criteria_list):
+    def _compiled_mapping(self):
         """
-        Map nama kriteria (string) ke column name di tabel nasabah.
-        Returns list of column names (strings), in same order as criteria_list.
-        If a mapping cannot be found for some criteria, raise ValueError.
-        Known mappings:
-          - contains 'usia' -> 'usia'
-          - contains 'pendapatan' or 'gaji' -> 'pendapatan'
-          - contains 'pekerjaan' or 'job' -> 'pekerjaan'
-          - contains 'jaminan' or 'agunan' -> 'jaminan'
-        Otherwise try exact match to nasabah table columns.
+        Mapping kategori terkompilasi; dimuat ulang otomatis jika ahp_mapping.json berubah.
+        Dipanggil di thread UI sebelum job dimulai (key cache dan perhitungan memakai mapping yang sama).
         """
-        # get existing columns from nasabah table
-        conn = database.get_connection()
-        cur = conn.cursor()
-        cur.execute("PRAGMA table_info(nasabah)")
-        cols_info = cur.fetchall()
-        conn.close()
-        existing_cols = [c[1] for c in cols_info]  # name is at index 1
-
-        mapped = []
-        for crit in criteria_list:
-            cn = crit.lower()
-            if "usia" in cn:
-                col = "usia"
-            elif "pendapatan" in cn or "gaji" in cn or "income" in cn:
-                col = "pendapatan"
-            elif "pekerjaan" in cn or "job" in cn:
-                col = "pekerjaan"
-            elif "jaminan" in cn or "agunan" in cn or "collateral" in cn:
-                col = "jaminan"
+        compiled = mapping_method.get_compiled_mapping()
+        self._ahp_map = compiled.cfg
+        return compiled
+
+    def _snapshot(self, criteria, compiled, job=None):
+        """
+        Snapshot matriks keputusan untuk kriteria (dari cache jika data tidak berubah).
+        compiled: hasil _compiled_mapping(); job: progress tahap load / map saat snapshot dibangun di worker.
+        """
+        return snapshot_method.get_snapshot(criteria, compiled,
+                                            progress=job.report if job is not None else None)
+
+    def _job_inputs(self, method, weights, pairwise=None, compiled=None):
+        """
+        Thread UI: salinan input untuk job latar (kriteria, bobot, pairwise, mapping, key cache).
+        Worker hanya membaca dict ini, bukan atribut frame; dialog pairwise / kriteria
+        tetap bisa diubah selama job berjalan tanpa mengubah perhitungan yang sedang jalan.
+        pairwise None -> pairwise dari dialog (key cache memakai yang tersimpan di DB jika tidak ada).
+        compiled None -> mapping dimuat ulang di sini.
+        """
+        if compiled is None:
+            compiled = self._compiled_mapping()
+        if pairwise is None:
+            pairwise = getattr(self, 'criteria_pairwise', None)
+        if pairwise is not None:
+            pairwise = np.array(pairwise, dtype=float)
+        weights = np.array(weights, dtype=float)
+        return {
+            "criteria": list(self.criteria),
+            "weights": weights,
+            "pairwise": pairwise,
+            "compiled": compiled,
+            "cfg": compiled.cfg,
+            "cache_key": self._run_cache_key(method, weights, compiled.cfg, pairwise=pairwise),
+        }
+
+    def _config_section(self, name, cfg=None):
+        """Bagian ahp_mapping.json; cfg: mapping yang dibawa job (default: yang terakhir dimuat di thread UI)."""
+        cfg = self._ahp_map if cfg is None else cfg
+        section = cfg.get(name, {}) if isinstance(cfg, dict) else {}
+        return section if isinstance(section, dict) else {}
+
+    def _ahp_full_settings(self, cfg=None):
+        """
+        Baca setting AHP Full dari ahp_mapping.json:
+        (mode, batas memori dalam byte atau None).
+        """
+        cfg = self._config_section('ahp_full', cfg)
+        mode = cfg.get('mode', 'auto')
+        try:
+            limit_mb = float(cfg.get('memory_limit_mb', 512))
+        except Exception:
+            limit_mb = 512.0
+        mem_limit = int(limit_mb * 2**20) if limit_mb > 0 else None
+        return mode, mem_limit
+
+    def _ahp_solver_settings(self):
+        """Baca setting solver eigen dari ahp_mapping.json: (solver, tol, max_iter)."""
+        cfg = self._config_section('ahp_solver')
+        solver = cfg.get('solver', 'eig')
+        try:
+            tol = float(cfg.get('tol', 1e-10))
+            max_iter = int(cfg.get('max_iter', 1000))
+        except Exception:
+            tol, max_iter = 1e-10, 1000
+        return solver, tol, max_iter
+
+    def _saw_stream_settings(self, cfg=None):
+        """Baca setting SAW streaming dari ahp_mapping.json: (min_rows|None, chunk_size, top_k)."""
+        cfg = self._config_section('saw_stream', cfg)
+        try:
+            min_rows = int(cfg.get('min_rows', 1000000))
+            chunk_size = max(1, int(cfg.get('chunk_size', 50000)))
+            top_k = max(1, int(cfg.get('top_k', 10)))
+        except Exception:
+            min_rows, chunk_size, top_k = 1000000, 50000, 10
+        # min_rows <= 0 -> streaming dimatikan
+        return (min_rows if min_rows > 0 else None), chunk_size, top_k
+
+    def _saw_engine_setting(self, cfg=None):
+        """Engine SAW dari ahp_mapping.json: 'numpy' (default) atau 'sql'."""
+        cfg = self._config_section('saw_engine', cfg)
+        engine = str(cfg.get('engine', 'numpy')).lower()
+        return engine if engine in ('numpy', 'sql') else 'numpy'
+
+    def _run_cache_settings(self, cfg=None):
+        """Batas cache hasil dari ahp_mapping.json ('run_cache'); default lihat run_cache.DEFAULTS."""
+        return self._config_section('run_cache', cfg)
+
+    def _run_cache_key(self, method, weights, cfg, pairwise=None):
+        """
+        Key cache untuk metode + bobot saat ini (pairwise: dialog, atau yang tersimpan di DB).
+        cfg: ahp_mapping.json yang baru dimuat (compiled.cfg), bukan mapping run sebelumnya.
+        """
+        if pairwise is None:
+            pairwise = getattr(self, 'criteria_pairwise', None)
+        if pairwise is None:
+            try:
+                pairwise = kriteria_model.load_pairwise_matrix('default')
+            except Exception:
+                pairwise = None
+        return run_cache.make_key(method, self.criteria, weights, pairwise, cfg)
+
+    def _run_cache_text(self, hit):
+        st = run_cache.stats()
+        src = "hasil dari cache" if hit else "dihitung baru"
+        return (f"({src}; cache hit memori={st['hits']}, hit DB={st['db_hits']}, "
+                f"miss={st['misses']}, entri={st['entries']})")
+
+    # ---------------- Background jobs ----------------
+    def _start_job(self, name, fn, stages, on_done, args=(), error_msg=None):
+        """
+        Jalankan fn(job, *args) di worker latar (methods/worker.py) supaya UI tidak
+        'Not Responding'. on_done(hasil) dipanggil di thread UI oleh _poll_job.
+        Return False jika masih ada perhitungan yang berjalan.
+        """
+        if self._job_active or self._worker.busy:
+            messagebox.showwarning("Perhitungan Berjalan",
+                                   f"Perhitungan '{self._worker.job.name}' masih berjalan. Tunggu selesai atau klik 'Batal'.")
+            return False
+        self._worker.submit(name, fn, stages, *args)
+        self._job_active = True
+        self._job_done = on_done
+        self._job_error = error_msg or f"Gagal menghitung {name}"
+        self._set_busy(True, name)
+        self.after(POLL_MS, self._poll_job)
+        return True
+
+    def _set_busy(self, busy, name=None):
+        for btn in self._compute_buttons:
+            btn.configure(state="disabled" if busy else "normal")
+        self.btn_cancel.configure(state="normal" if busy else "disabled")
+        if busy:
+            self.progress_var.set(0)
+            self.lbl_progress.configure(text=f"{name}: mulai...")
+
+    def _poll_job(self):
+        """Baca event worker (dipanggil lewat after); progress bar + hasil di thread UI."""
+        job = self._worker.job
+        finished = None
+        for ev in self._worker.poll():
+            if ev[0] == "progress":
+                _, _, overall, label = ev
+                self.progress_var.set(overall * 100)
+                self.lbl_progress.configure(text=f"{job.name}: {label} ({overall:.0%})")
             else:
-                # try exact match or safer variant
-                cand = crit.strip().lower()
-                if cand in existing_cols:
-                    col = cand
-                elif crit in existing_cols:
-                    col = crit
-                else:
-                    # not found
-                    raise ValueError(f"Kriteria '{crit}' tidak dapat dimapping ke kolom tabel nasabah.")
-            if col not in existing_cols:
-                raise ValueError(f"Kolom '{col}' (mapping dari kriteria '{crit}') tidak ditemukan di tabel nasabah.")
-            mapped.append(col)
-        return mapped
+                finished = ev
+        if finished is None:
+            self.after(POLL_MS, self._poll_job)
+            return
+        self._job_active = False
+        self._set_busy(False)
+        kind = finished[0]
+        if kind == "done":
+            self.progress_var.set(100)
+            self.lbl_progress.configure(text=f"{job.name}: selesai")
+            try:
+                self._job_done(finished[1])
+            except Exception as e:
+                messagebox.showerror(f"Error {job.name}", f"{self._job_error}:\n{e}")
+        elif kind == "cancelled":
+            self.progress_var.set(0)
+            self.lbl_progress.configure(text=f"{job.name}: dibatalkan")
+        elif kind == "notice":
+            self.lbl_progress.configure(text=f"{job.name}: tidak ada hasil")
+            messagebox.showinfo("Info", finished[1])
+        else:
+            self.lbl_progress.configure(text=f"{job.name}: gagal")
+            messagebox.showerror(f"Error {job.name}", f"{self._job_error}:\n{finished[1]}")
+
+    def _cancel_job(self):
+        if self._worker.busy:
+            self._worker.cancel()
+            self.lbl_progress.configure(text=f"{self._worker.job.name}: membatalkan...")
 
+    def destroy(self):
+        self._worker.shutdown()
+        super().destroy()
+
+    def _set_result(self, data):
+        """Pasang hasil baru ke self._saw_result (spill file hasil streaming lama dibuang)."""
+        old = self._saw_result.get("stream") if self._saw_result else None
+        if old is not None and old is not data.get("stream"):
+            old.close()
+        self._saw_result = data
+
+    # ---------------- SAW computation ----------------
     def hitung_saw(self):
         """
         Core SAW computation:
@@ -642,6 +740,7 @@ class PerhitunganFrame(tk.Frame):
          - normalisasi (benefit/cost)
          - skor = norm.dot(weights)
          - simpan hasil ke self._saw_result dan tampilkan ringkasan di text area
+        Validasi di thread UI; perhitungan di worker latar (_job_saw -> _saw_done).
         """
         try:
             if not hasattr(self, "criteria") or len(self.criteria) == 0:
@@ -658,132 +757,256 @@ class PerhitunganFrame(tk.Frame):
                 messagebox.showwarning('Perlu Input Skala', 'Silakan isi skala perbandingan kriteria terlebih dahulu (Perbandingan Pasangan - AHP) sebelum menampilkan hasil.')
                 return
 
-            # map criteria names to nasabah columns
-            cols = self._map_criteria_to_columns(self.criteria)  # may raise ValueError
-
-            # load nasabah data (id, nama, col1, col2, ...)
-            conn = database.get_connection()
-            cur = conn.cursor()
-            select_cols = ", ".join([f'"{c}"' for c in cols])
-            sql = f"SELECT id, nama, {select_cols} FROM nasabah"
-            cur.execute(sql)
-            rows = cur.fetchall()
-            conn.close()
-
-            if not rows:
-                messagebox.showinfo("Info", "Data nasabah kosong.")
-                return
-
-            # apply mapping and filter ineligible by age (>50 -> category code 4)
-            usia_idx = None
-            for ci, cname in enumerate(cols):
-                if 'usia' in cname.lower():
-                    usia_idx = ci
-                    break
-
-            eligible_rows = []
-            ineligible_list = []
-            for r in rows:
-                if usia_idx is not None:
-                    raw_age = r[2 + usia_idx]
-                    if self._is_age_ineligible(raw_age):
-                        ineligible_list.append({"id": r[0], "nama": r[1], "reason": "usia > 50"})
-                        continue
-                eligible_rows.append(r)
-
-            if not eligible_rows:
-                messagebox.showinfo("Info", "Tidak ada nasabah memenuhi syarat untuk dihitung (semua disaring oleh aturan usia).")
-                return
-
-            # build matrix and names from eligible rows
-            names = [r[1] for r in eligible_rows]
-            ids = [r[0] for r in eligible_rows]
-            matrix = []
-            for r in eligible_rows:
-                vals = []
-                for i, c in enumerate(cols):
-                    raw = r[2 + i]
-                    try:
-                        vals.append(self._map_value(c, raw))
-                    except Exception:
-                        raise ValueError(f"Nilai untuk kolom '{c}' pada nasabah '{r[1]}' tidak dapat dimapping: {raw}")
-                matrix.append(vals)
-            matrix = np.array(matrix, dtype=float)  # shape (n_alt, n_crit)
-
-            # prepare weights (align with criteria order)
+            # bobot dinormalisasi (urutan sama dengan kriteria)
             weights = self.weights.copy()
-            if weights.size != matrix.shape[1]:
-                # mismatch: provide clear message
-                raise ValueError(f"Jumlah bobot ({weights.size}) tidak cocok dengan jumlah kriteria yang dipetakan ({matrix.shape[1]}). Periksa tabel kriteria.")
-            # ensure normalized
-            if not np.isclose(weights.sum(), 1.0):
+            if weights.size and not np.isclose(weights.sum(), 1.0):
                 weights = weights / weights.sum()
+            # mapping dimuat ulang + key cache dibuat di sini, sebelum run_cache.get di worker
+            compiled = self._compiled_mapping()
+            method = "saw_sql" if self._saw_engine_setting(compiled.cfg) == 'sql' else "saw"
+            self._start_job("SAW", self._job_saw, SAW_STAGES, self._saw_done,
+                            args=(self._job_inputs(method, weights, compiled=compiled),))
+        except Exception as e:
+            messagebox.showerror("Error SAW", f"Gagal menghitung SAW:\n{e}")
 
-            # decide benefit flags: usia -> cost, others -> benefit
-            benefit_flags = []
-            for c in cols:
-                if "usia" in c.lower():
-                    benefit_flags.append(False)
-                else:
-                    benefit_flags.append(True)
-
-            # normalization SAW
-            n_alt, n_crit = matrix.shape
-            norm = np.zeros_like(matrix, dtype=float)
-
-            for j in range(n_crit):
-                col = matrix[:, j]
-                if benefit_flags[j]:
-                    maxv = np.max(col)
-                    if maxv == 0:
-                        norm[:, j] = 0.0
-                    else:
-                        norm[:, j] = col / maxv
+    def _job_saw(self, job, inputs):
+        """
+        Worker: pilih engine SAW, pakai cache atau hitung. Return dict untuk _saw_done.
+        inputs: dari _job_inputs (thread UI), bobot sudah dinormalisasi.
+        """
+        t0 = time.perf_counter()
+        job.stage("load")
+
+        # tabel sangat besar: SAW streaming (memori tetap, hanya top-k di memori)
+        min_rows, chunk_size, top_k = self._saw_stream_settings(inputs["cfg"])
+        if min_rows is not None:
+            n_rows = database.get_connection().execute("SELECT COUNT(*) FROM nasabah").fetchone()[0]
+            if n_rows >= min_rows:
+                return self._hitung_saw_stream(inputs, chunk_size, top_k, t0, job)
+
+        # engine "sql": normalisasi + ranking dihitung di dalam SQLite
+        if self._saw_engine_setting(inputs["cfg"]) == 'sql':
+            return self._hitung_saw_sql(inputs, t0, job)
+
+        # data, bobot, pairwise dan mapping tidak berubah -> hasil dari cache
+        cached = run_cache.get(inputs["cache_key"], self._run_cache_settings(inputs["cfg"]))
+        # cfg: mapping untuk engine inkremental (lihat _saw_done)
+        out = {"cfg": inputs["cfg"]}
+        if cached is not None:
+            data = cached
+        else:
+            data = self._compute_saw(inputs, t0, job)
+        results_sorted = data["results"]
+
+        # show brief output
+        out_lines = []
+        out_lines.append("SAW selesai. Contoh 10 teratas:")
+        out_lines.append(self._run_cache_text(cached is not None))
+        for item in results_sorted[:10]:
+            out_lines.append(f"#{item['rank']}  {item['nama']}  -> {item['score']:.6f}")
+        out.update({"data": data, "text": "\n".join(out_lines),
+                    "message": "Perhitungan SAW selesai. Klik 'Tampilkan Hasil' untuk tabel lengkap."})
+        return out
+
+    def _saw_done(self, res):
+        """Thread UI: pasang hasil SAW (+ dasar engine inkremental), tampilkan ringkasan."""
+        data = res["data"]
+        self._set_result(data)
+        if data.get("method") == "saw":
+            # engine inkremental baru dibuat saat NasabahFrame menambah / menghapus nasabah
+            saw_incremental.set_base(data["results"], data["columns"], data["weights"], res["cfg"])
+        else:
+            # mode SQL / streaming tidak memakai engine inkremental
+            saw_incremental.clear_engine()
+        self.txt_saw.delete("1.0", tk.END)
+        self.txt_saw.insert(tk.END, res["text"])
+        messagebox.showinfo("Sukses", res["message"])
+
+    def _compute_saw(self, inputs, t0=None, job=None):
+        """
+        SAW atas snapshot; hasil ke run store + cache. Return hasil.
+        Notice jika tidak ada data yang bisa dihitung.
+        """
+        weights = inputs["weights"]
+        # snapshot matriks keputusan: dibangun sekali per versi data,
+        # dipakai bersama dengan AHP Full dan tabel AHP
+        snap = self._snapshot(inputs["criteria"], inputs["compiled"], job)  # may raise ValueError
+        cols = snap.columns
+
+        if not len(snap):
+            raise worker_method.Notice("Data nasabah kosong.")
+
+        # filter usia (>50 -> category code 4) sudah dihitung di snapshot
+        if not snap.n_eligible:
+            raise worker_method.Notice("Tidak ada nasabah memenuhi syarat untuk dihitung (semua disaring oleh aturan usia).")
+
+        names = snap.eligible_names
+        ids = snap.eligible_ids
+        matrix = snap.eligible_matrix  # shape (n_alt, n_crit)
+
+        # bobot sudah dinormalisasi oleh hitung_saw (urutan sama dengan kriteria)
+        if weights.size != matrix.shape[1]:
+            # mismatch: provide clear message
+            raise ValueError(f"Jumlah bobot ({weights.size}) tidak cocok dengan jumlah kriteria yang dipetakan ({matrix.shape[1]}). Periksa tabel kriteria.")
+
+        # decide benefit flags: usia -> cost, others -> benefit
+        benefit_flags = []
+        for c in cols:
+            if "usia" in c.lower():
+                benefit_flags.append(False)
+            else:
+                benefit_flags.append(True)
+
+        if job is not None:
+            job.stage("rank")
+        # normalization SAW, dihitung per profil unik (max/min kolom sama)
+        n_alt, n_crit = matrix.shape
+        profiles_u, inverse, _ = profile_method.unique_profiles(matrix)
+        norm = np.zeros_like(profiles_u, dtype=float)
+
+        for j in range(n_crit):
+            col = profiles_u[:, j]
+            if benefit_flags[j]:
+                maxv = np.max(col)
+                if maxv == 0:
+                    norm[:, j] = 0.0
                 else:
-                    # cost
-                    minv = np.min(col)
-                    # avoid division by zero
-                    safe_col = np.where(col == 0, 1e-9, col)
-                    norm[:, j] = minv / safe_col
-
-            # compute scores
-            scores = norm.dot(weights)
-
-            # prepare result rows sorted by score desc
-            results = []
-            for idx in range(n_alt):
-                results.append({
-                    "id": ids[idx],
-                    "nama": names[idx],
-                    "score": float(scores[idx]),
-                    "raw_values": matrix[idx,:].tolist(),
-                    "r_values": norm[idx,:].tolist()
-                })
-            # sort
-            results_sorted = sorted(results, key=lambda x: x["score"], reverse=True)
-            # assign rank
-            for i, row in enumerate(results_sorted, start=1):
-                row["rank"] = i
-
-            # store result for later display/export (include ineligible list)
-            self._saw_result = {
-                "criteria": self.criteria,
+                    norm[:, j] = col / maxv
+            else:
+                # cost
+                minv = np.min(col)
+                # avoid division by zero
+                safe_col = np.where(col == 0, 1e-9, col)
+                norm[:, j] = minv / safe_col
+
+        # compute scores, lalu sebar kembali ke tiap nasabah
+        scores = norm.dot(weights)[inverse]
+
+        # hasil kolom: top-k lewat argpartition, ranking penuh / row view baru
+        # dibuat saat jendela hasil atau export memintanya; r_values disimpan
+        # per profil unik. toleransi tie sama dengan engine inkremental
+        results_sorted = result_store.ResultStore(ids, names, scores, tol=1e-12)
+        results_sorted.add_column("raw_values", profiles_u, inverse)
+        results_sorted.add_column("r_values", norm, inverse)
+
+        # store result for later display/export (include ineligible count)
+        data = {
+            "method": "saw",
+            "criteria": inputs["criteria"],
+            "columns": cols,
+            "weights": weights.tolist(),
+            "results": results_sorted,
+            "n_ineligible": snap.n_ineligible,
+            "cache_key": inputs["cache_key"]
+        }
+        if job is not None:
+            job.stage("persist")
+        self._persist_run(data, t0, pairwise=inputs["pairwise"])
+        run_cache.put(inputs["cache_key"], data, self._run_cache_settings(inputs["cfg"]))
+        return data
+
+    def _hitung_saw_sql(self, inputs, t0=None, job=None):
+        """SAW lewat satu statement SQL (lihat methods/saw_sql.py); ranking dari RANK() SQLite."""
+        criteria, weights, cache_key = inputs["criteria"], inputs["weights"], inputs["cache_key"]
+        if weights.size != len(criteria):
+            raise ValueError(f"Jumlah bobot ({weights.size}) tidak cocok dengan jumlah kriteria ({len(criteria)}). Periksa tabel kriteria.")
+
+        cached = run_cache.get(cache_key, self._run_cache_settings(inputs["cfg"]))
+        if cached is not None:
+            data = cached
+        else:
+            conn = database.get_connection()
+            cur = conn.cursor()
+            cur.execute("PRAGMA table_info(nasabah)")
+            existing_cols = [c[1] for c in cur.fetchall()]
+            cols = mapping_method.map_criteria_to_columns(criteria, existing_cols)
+            if job is not None:
+                job.stage("rank")
+            results = saw_sql.saw_sql(conn, cols, weights, inputs["compiled"])
+            usia_col = next((c for c in cols if 'usia' in c.lower()), None)
+            cur.execute(f"SELECT id, nama FROM nasabah WHERE NOT ({saw_sql.eligible_sql(usia_col)})")
+            ineligible_list = [{"id": r[0], "nama": r[1], "reason": "usia > 50"} for r in cur.fetchall()]
+
+            if not results:
+                raise worker_method.Notice("Tidak ada nasabah memenuhi syarat untuk dihitung (data kosong atau semua disaring oleh aturan usia).")
+
+            data = {
+                "method": "saw_sql",
+                "criteria": criteria,
                 "columns": cols,
                 "weights": weights.tolist(),
-                "results": results_sorted,
-                "ineligible": ineligible_list
+                "results": results,
+                "ineligible": ineligible_list,
+                "cache_key": cache_key
             }
+            if job is not None:
+                job.stage("persist")
+            self._persist_run(data, t0, pairwise=inputs["pairwise"])
+            run_cache.put(cache_key, data, self._run_cache_settings(inputs["cfg"]))
+        results = data["results"]
 
-            # show brief output
-            out_lines = []
-            out_lines.append("SAW selesai. Contoh 10 teratas:")
-            for item in results_sorted[:10]:
-                out_lines.append(f"#{item['rank']}  {item['nama']}  -> {item['score']:.6f}")
-            self.txt_saw.delete("1.0", tk.END)
-            self.txt_saw.insert(tk.END, "\n".join(out_lines))
-            messagebox.showinfo("Sukses", "Perhitungan SAW selesai. Klik 'Tampilkan Hasil' untuk tabel lengkap.")
-        except Exception as e:
-            messagebox.showerror("Error SAW", f"Gagal menghitung SAW:\n{e}")
+        out_lines = []
+        out_lines.append("SAW (SQL) selesai. Contoh 10 teratas:")
+        out_lines.append(self._run_cache_text(cached is not None))
+        for item in results[:10]:
+            out_lines.append(f"#{item['rank']}  {item['nama']}  -> {item['score']:.6f}")
+        return {"data": data, "text": "\n".join(out_lines),
+                "message": "Perhitungan SAW selesai. Klik 'Tampilkan Hasil' untuk tabel lengkap."}
+
+    def _hitung_saw_stream(self, inputs, chunk_size, top_k, t0=None, job=None):
+        """
+        SAW dua pass langsung di atas cursor (lihat methods/saw_stream.py).
+        Hanya top-k yang disimpan di memori; ranking lengkap ada di spill file.
+        """
+        criteria, weights = inputs["criteria"], inputs["weights"]
+        if weights.size != len(criteria):
+            raise ValueError(f"Jumlah bobot ({weights.size}) tidak cocok dengan jumlah kriteria ({len(criteria)}). Periksa tabel kriteria.")
+
+        conn = database.get_connection()
+        cur = conn.cursor()
+        cur.execute("PRAGMA table_info(nasabah)")
+        existing_cols = [c[1] for c in cur.fetchall()]
+        cols = mapping_method.map_criteria_to_columns(criteria, existing_cols)
+        if job is not None:
+            job.stage("rank", "Skor per chunk (streaming)")
+        res = saw_stream.stream_saw(conn, cols, weights, inputs["compiled"],
+                                    top_k=top_k, chunk_size=chunk_size,
+                                    progress=job.callback() if job is not None else None)
+
+        if res.n_eligible == 0:
+            res.close()
+            raise worker_method.Notice("Tidak ada nasabah memenuhi syarat untuk dihitung (semua disaring oleh aturan usia).")
+
+        # engine inkremental tidak dipakai di mode ini (dilepas oleh _saw_done)
+        data = {
+            "method": "saw_stream",
+            "criteria": criteria,
+            "columns": cols,
+            "weights": weights.tolist(),
+            "results": res.top,
+            "ineligible": [],
+            "n_ineligible": res.n_ineligible,
+            "stream": res,
+            "peak_rss_mb": sysinfo.peak_rss_mb()
+        }
+        try:
+            if job is not None:
+                job.stage("persist")
+        except worker_method.Cancelled:
+            res.close()
+            raise
+        self._persist_run(data, t0, pairwise=inputs["pairwise"])
+
+        peak = data["peak_rss_mb"]
+        peak_txt = f"{peak:.1f} MB" if peak is not None else "N/A"
+        out_lines = []
+        out_lines.append(f"SAW (streaming) selesai: {res.n_eligible} nasabah dihitung, "
+                         f"{res.n_ineligible} tidak memenuhi syarat; peak RSS proses = {peak_txt}")
+        out_lines.append(f"Contoh {len(res.top)} teratas:")
+        for item in res.top:
+            out_lines.append(f"#{item['rank']}  {item['nama']}  -> {item['score']:.6f}")
+        return {"data": data, "text": "\n".join(out_lines),
+                "message": "Perhitungan SAW (streaming) selesai. 'Tampilkan Hasil' menampilkan top-k."}
 
     def hitung_ahp_full(self):
         """
@@ -793,6 +1016,8 @@ class PerhitunganFrame(tk.Frame):
          - Hitung bobot lokal alternatif per kriteria (eigenvector)
          - Agregasi global score = sum_k (w_k * local_priority_k)
          - Tampilkan CR untuk kriteria dan rata-rata CR alternatif
+        Bobot kriteria + konfirmasi CR di thread UI; sisanya di worker latar
+        (_job_ahp_full -> _ahp_full_done).
         """
         try:
             if not hasattr(self, "criteria") or len(self.criteria) == 0:
@@ -820,9 +1045,6 @@ class PerhitunganFrame(tk.Frame):
                 w = np.array(self.weights, dtype=float)
                 crit_weights, CI_crit, CR_crit, crit_pair = ahp_method.ahp_from_weights(w)
 
-            # map criteria to columns
-            cols = self._map_criteria_to_columns(self.criteria)
-
             # if criteria pairwise is inconsistent, ask confirmation before proceeding
             try:
                 if CR_crit > 0.1:
@@ -834,194 +1056,191 @@ class PerhitunganFrame(tk.Frame):
                 # ignore ask issues and continue
                 pass
 
-            # load nasabah data
-            conn = database.get_connection()
-            cur = conn.cursor()
-            select_cols = ", ".join([f'"{c}"' for c in cols])
-            sql = f"SELECT id, nama, {select_cols} FROM nasabah"
-            cur.execute(sql)
-            rows = cur.fetchall()
-            conn.close()
-
-            if not rows:
-                messagebox.showinfo("Info", "Data nasabah kosong.")
-                return
-
-            # apply mapping and filter ineligible by age (>50 -> category code 4)
-            usia_idx = None
-            for ci, cname in enumerate(cols):
-                if 'usia' in cname.lower():
-                    usia_idx = ci
-                    break
-
-            eligible_rows = []
-            ineligible_list = []
-            for r in rows:
-                if usia_idx is not None:
-                    raw_age = r[2 + usia_idx]
-                    if self._is_age_ineligible(raw_age):
-                        ineligible_list.append({"id": r[0], "nama": r[1], "reason": "usia > 50"})
-                        continue
-                eligible_rows.append(r)
-
-            if not eligible_rows:
-                messagebox.showinfo("Info", "Tidak ada nasabah memenuhi syarat untuk dihitung (semua disaring oleh aturan usia).")
-                return
-
-            ids = [r[0] for r in eligible_rows]
-            names = [r[1] for r in eligible_rows]
-            matrix = []
-            for r in eligible_rows:
-                vals = []
-                for i, c in enumerate(cols):
-                    raw = r[2 + i]
-                    try:
-                        vals.append(self._map_value(c, raw))
-                    except Exception:
-                        raise ValueError(f"Nilai untuk kolom '{c}' pada nasabah '{r[1]}' tidak dapat dimapping: {raw}")
-                matrix.append(vals)
-            M = np.array(matrix, dtype=float)  # shape (n_alt, n_crit)
-            n_alt, n_crit = M.shape
-
-            if crit_weights.size != n_crit:
-                raise ValueError(f"Jumlah bobot kriteria ({crit_weights.size}) tidak cocok dengan jumlah kriteria ({n_crit}).")
-
-            # benefit flags as before
-            benefit_flags = []
-            for c in cols:
-                if "usia" in c.lower():
-                    benefit_flags.append(False)
-                else:
-                    benefit_flags.append(True)
-
-            # For each criterion, build pairwise matrix among alternatives using ratio (always)
-            local_priority_matrix = np.zeros((n_alt, n_crit), dtype=float)
-            alt_crs = []
-            for j in range(n_crit):
-                col = M[:, j]
-                # build pairwise
-                pair_alt = np.ones((n_alt, n_alt), dtype=float)
-                for i in range(n_alt):
-                    for k in range(n_alt):
-                        vi = col[i]
-                        vk = col[k]
-                        # avoid division by zero
-                        if vi == 0 and vk == 0:
-                            pair_alt[i,k] = 1.0
-                        elif vk == 0:
-                            pair_alt[i,k] = 1e9
-                        else:
-                            ratio = vi / vk
-                            if benefit_flags[j]:
-                                pair_alt[i,k] = ratio
-                            else:
-                                # cost: smaller better -> invert
-                                pair_alt[i,k] = vk / vi if vi != 0 else 1e9
-
-                # compute local priorities
-                w_local, CI_local, CR_local = ahp_method.ahp_from_pairwise(pair_alt)
-                local_priority_matrix[:, j] = w_local
-                alt_crs.append(CR_local)
-
-            # aggregate global scores
+            # bobot kriteria dinormalisasi
             crit_weights = np.array(crit_weights, dtype=float)
             if not np.isclose(crit_weights.sum(), 1.0):
                 crit_weights = crit_weights / crit_weights.sum()
 
-            global_scores = local_priority_matrix.dot(crit_weights)
-
-            # prepare results similar to SAW structure
-            results = []
-            for idx in range(n_alt):
-                results.append({
-                    "id": ids[idx],
-                    "nama": names[idx],
-                    "score": float(global_scores[idx]),
-                    "local_priorities": local_priority_matrix[idx,:].tolist(),
-                    "raw_values": M[idx,:].tolist()
-                })
-            results_sorted = sorted(results, key=lambda x: x["score"], reverse=True)
-            for i, row in enumerate(results_sorted, start=1):
-                row["rank"] = i
-
-            # store result
-            self._saw_result = {
-                "method": "ahp_full",
-                "criteria": self.criteria,
-                "columns": cols,
-                "weights": crit_weights.tolist(),
-                "results": results_sorted,
-                "CR_criteria": float(CR_crit),
-                "CR_alternatives_avg": float(np.mean(alt_crs))
-            }
+            # mapping dimuat ulang + key cache dibuat di sini, sebelum run_cache.get di worker
+            self._start_job("AHP Full", self._job_ahp_full, AHP_FULL_STAGES, self._ahp_full_done,
+                            args=(self._job_inputs("ahp_full", crit_weights, pairwise=crit_pair), CR_crit))
+        except Exception as e:
+            messagebox.showerror("Error AHP Full", f"Gagal menghitung AHP Full:\n{e}")
 
-            # show brief output
-            out_lines = []
-            out_lines.append("AHP (Full) selesai. Contoh 10 teratas:")
-            out_lines.append(f"CR Kriteria = {CR_crit:.6f}; Rata-rata CR Alternatif = {np.mean(alt_crs):.6f}")
-            # no manual-used indicator (feature removed)
-            for item in results_sorted[:10]:
-                out_lines.append(f"#{item['rank']}  {item['nama']}  -> {item['score']:.6f}")
-            self.txt_saw.delete("1.0", tk.END)
-            self.txt_saw.insert(tk.END, "\n".join(out_lines))
-            # Notify top 1-5 nasabah yang layak
-            try:
-                topn = results_sorted[:5]
-                if topn:
-                    names = [r['nama'] for r in topn]
-                    if len(names) == 1:
-                        msg = f"Nasabah yang layak mendapatkan kredit: {names[0]}"
-                    else:
-                        msg = "Nasabah yang layak mendapatkan kredit (top {}):\n".format(len(names)) + "\n".join([f"{i+1}. {n}" for i, n in enumerate(names)])
-                    messagebox.showinfo("Hasil AHP - Layak Kredit", msg)
-            except Exception:
-                pass
+    def _job_ahp_full(self, job, inputs, CR_crit):
+        """Worker: AHP Full dari cache atau dihitung. Return dict untuk _ahp_full_done."""
+        t0 = time.perf_counter()
+        job.stage("load")
 
-            # Offer to move processed nasabah to a separate table so they won't be re-counted
-            try:
-                do_move = messagebox.askyesno('Kelompokkan Nasabah', 'Pindahkan nasabah yang sudah dihitung ke grup terpisah (agar tidak dihitung lagi)?')
-                if do_move:
-                    # create table processed_nasabah if not exists and move rows
-                    conn = database.get_connection()
-                    cur = conn.cursor()
-                    cur.execute('''
-                        CREATE TABLE IF NOT EXISTS processed_nasabah (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            original_id INTEGER,
-                            nama TEXT,
-                            usia INTEGER,
-                            pendapatan REAL,
-                            pekerjaan TEXT,
-                            jaminan TEXT,
-                            processed_at TEXT
-                        )
-                    ''')
-                    ids_to_move = [int(r['id']) for r in results_sorted]
-                    # fetch rows and insert into processed_nasabah
-                    q_marks = ','.join(['?'] * len(ids_to_move))
-                    cur.execute(f"SELECT id, nama, usia, pendapatan, pekerjaan, jaminan FROM nasabah WHERE id IN ({q_marks})", ids_to_move)
-                    rows_to_move = cur.fetchall()
-                    import datetime
-                    now = datetime.datetime.now().isoformat()
-                    for row in rows_to_move:
-                        orig_id, nama, usia, pendapatan, pekerjaan, jaminan = row
-                        cur.execute('''INSERT INTO processed_nasabah (original_id, nama, usia, pendapatan, pekerjaan, jaminan, processed_at)
-                                       VALUES (?, ?, ?, ?, ?, ?, ?)''', (orig_id, nama, usia, pendapatan, pekerjaan, jaminan, now))
-                    # delete moved rows from nasabah
-                    cur.execute(f"DELETE FROM nasabah WHERE id IN ({q_marks})", ids_to_move)
-                    conn.commit()
-                    conn.close()
-                    messagebox.showinfo('Sukses', 'Nasabah yang dihitung telah dipindahkan ke grup "processed".')
-            except Exception as e:
-                # non-fatal
-                try:
-                    conn.close()
-                except Exception:
-                    pass
-                messagebox.showinfo('Info', f'Perhitungan selesai tetapi pemindahan nasabah gagal: {e}')
+        # klik ulang tanpa perubahan data / bobot / pairwise / mapping -> hasil dari cache
+        cached = run_cache.get(inputs["cache_key"], self._run_cache_settings(inputs["cfg"]))
+        if cached is not None:
+            data = cached
+        else:
+            data = self._compute_ahp_full(inputs, CR_crit, t0, job)
+        results_sorted = data["results"]
+        summary = data.get("summary") or {}
+
+        # show brief output
+        out_lines = []
+        out_lines.append("AHP (Full) selesai. Contoh 10 teratas:")
+        out_lines.append(self._run_cache_text(cached is not None))
+        out_lines.append(f"CR Kriteria = {data['CR_criteria']:.6f}; Rata-rata CR Alternatif = {data['CR_alternatives_avg']:.6f}")
+        peak = data.get("peak_rss_mb")
+        peak_txt = f"{peak:.1f} MB" if peak is not None else "N/A"
+        mem_limit = summary.get("memory_limit")
+        limit_txt = f"{mem_limit / 2**20:.0f} MB" if mem_limit is not None else "tanpa batas"
+        out_lines.append(f"Mode: {', '.join(summary.get('modes', []))} (batas memori {limit_txt}); peak RSS proses = {peak_txt}; "
+                         f"Profil unik = {summary.get('n_profiles', '-')} dari {summary.get('n_alt', len(results_sorted))} nasabah")
+        # no manual-used indicator (feature removed)
+        for item in results_sorted[:10]:
+            out_lines.append(f"#{item['rank']}  {item['nama']}  -> {item['score']:.6f}")
+        return {"data": data, "text": "\n".join(out_lines), "top": [r['nama'] for r in results_sorted[:5]]}
+
+    def _ahp_full_done(self, res):
+        """Thread UI: pasang hasil AHP Full, tampilkan ringkasan + top 5, tawarkan pindah ke processed."""
+        data = res["data"]
+        self._set_result(data)
+        self.txt_saw.delete("1.0", tk.END)
+        self.txt_saw.insert(tk.END, res["text"])
+        # Notify top 1-5 nasabah yang layak
+        try:
+            names = res["top"]
+            if names:
+                if len(names) == 1:
+                    msg = f"Nasabah yang layak mendapatkan kredit: {names[0]}"
+                else:
+                    msg = "Nasabah yang layak mendapatkan kredit (top {}):\n".format(len(names)) + "\n".join([f"{i+1}. {n}" for i, n in enumerate(names)])
+                messagebox.showinfo("Hasil AHP - Layak Kredit", msg)
+        except Exception:
+            pass
 
+        # Offer to move processed nasabah to a separate table so they won't be re-counted
+        do_move = messagebox.askyesno('Kelompokkan Nasabah', 'Pindahkan nasabah yang sudah dihitung ke grup terpisah (agar tidak dihitung lagi)?')
+        if do_move:
+            # move rows ke processed_nasabah (tabel dibuat oleh database.create_tables), juga di worker
+            ids_to_move = [int(i) for i in data["results"].ids]
+            self._start_job("Pindah ke Processed", self._job_move_processed, ("persist",), self._move_done,
+                            args=(ids_to_move,), error_msg="Perhitungan selesai tetapi pemindahan nasabah gagal")
+
+    def _job_move_processed(self, job, ids_to_move):
+        job.stage("persist", "Memindahkan nasabah")
+        nasabah_model.pindahkan_ke_processed(ids_to_move)
+        return ids_to_move
+
+    def _move_done(self, ids_to_move):
+        # ranking SAW terkini (jika ada hasil SAW) tanpa nasabah yang dipindahkan
+        engine = saw_incremental.get_engine(create=True)
+        if engine is not None:
+            engine.remove_many(ids_to_move)
+        messagebox.showinfo('Sukses', 'Nasabah yang dihitung telah dipindahkan ke grup "processed".')
+
+    def _compute_ahp_full(self, inputs, CR_crit, t0=None, job=None):
+        """AHP Full atas snapshot; hasil ke run store + cache. Return hasil; Notice jika tidak ada data."""
+        crit_weights = inputs["weights"]
+        # snapshot matriks keputusan (kolom, data, mapping, filter usia)
+        snap = self._snapshot(inputs["criteria"], inputs["compiled"], job)
+        cols = snap.columns
+
+        if not len(snap):
+            raise worker_method.Notice("Data nasabah kosong.")
+
+        # filter usia (>50 -> category code 4) sudah dihitung di snapshot
+        if not snap.n_eligible:
+            raise worker_method.Notice("Tidak ada nasabah memenuhi syarat untuk dihitung (semua disaring oleh aturan usia).")
+
+        ids = snap.eligible_ids
+        names = snap.eligible_names
+        M = snap.eligible_matrix  # shape (n_alt, n_crit)
+        n_alt, n_crit = M.shape
+
+        if crit_weights.size != n_crit:
+            raise ValueError(f"Jumlah bobot kriteria ({crit_weights.size}) tidak cocok dengan jumlah kriteria ({n_crit}).")
+
+        # benefit flags as before
+        benefit_flags = []
+        for c in cols:
+            if "usia" in c.lower():
+                benefit_flags.append(False)
+            else:
+                benefit_flags.append(True)
+
+        # For each criterion, local priorities of alternatives from ratio matrices
+        # (closed form / eig / matrix-free power iteration sesuai batas memori)
+        # dedup: eigenproblem cukup berukuran jumlah profil unik (<= 192), bukan n_alt
+        if job is not None:
+            job.stage("pairwise")
+        mode, mem_limit = self._ahp_full_settings(inputs["cfg"])
+        profiles_u, inverse, counts = profile_method.unique_profiles(M)
+        if job is not None:
+            job.stage("eigen")
+        local_u, alt_crs, alt_info = ahp_method.ahp_full_local_priorities(
+            profiles_u, benefit_flags, mode=mode, memory_limit_bytes=mem_limit, counts=counts,
+            progress=job.callback() if job is not None else None)
+        used_modes = sorted(set(i["method"] for i in alt_info))
+
+        if job is not None:
+            job.stage("rank")
+        global_scores = local_u.dot(crit_weights)[inverse]
+
+        # hasil kolom (format sama dengan SAW); top 10 / top 5 tanpa sort penuh,
+        # bobot lokal disimpan per profil unik
+        results_sorted = result_store.ResultStore(ids, names, global_scores)
+        results_sorted.add_column("local_priorities", local_u, inverse)
+        results_sorted.add_column("raw_values", profiles_u, inverse)
+
+        # store result
+        data = {
+            "method": "ahp_full",
+            "criteria": inputs["criteria"],
+            "columns": cols,
+            "weights": crit_weights.tolist(),
+            "results": results_sorted,
+            "CR_criteria": float(CR_crit),
+            "CR_alternatives_avg": float(np.mean(alt_crs)),
+            "n_ineligible": snap.n_ineligible,
+            "alt_info": alt_info,
+            "peak_rss_mb": sysinfo.peak_rss_mb(),
+            "summary": {"modes": used_modes, "n_profiles": len(counts), "n_alt": n_alt,
+                        "memory_limit": mem_limit},
+            "cache_key": inputs["cache_key"]
+        }
+        if job is not None:
+            job.stage("persist")
+        self._persist_run(data, t0, pairwise=inputs["pairwise"])
+        run_cache.put(inputs["cache_key"], data, self._run_cache_settings(inputs["cfg"]))
+        return data
+
+    # ---------------- Run store ----------------
+    def _persist_run(self, data, t0=None, pairwise=None):
+        """
+        Simpan hasil perhitungan (data) ke tabel runs / run_results (models/result_model.py)
+        supaya jendela hasil / export run lama tidak perlu menghitung ulang.
+        pairwise: matriks yang dipakai job (lihat _job_inputs). Gagal simpan tidak membatalkan perhitungan.
+        """
+        duration_ms = (time.perf_counter() - t0) * 1000.0 if t0 is not None else None
+        method = data["method"]
+        results = data["results"]
+        detail_name = "local_priorities" if method == "ahp_full" else "r_values"
+        if method == "saw_stream":
+            # ranking lengkap dari spill file (nama diisi oleh result_model)
+            ids, scores, ranks = data["stream"].ranked()
+            results = result_store.ResultStore(ids, [None] * len(ids), scores).set_ranking(ranks, np.arange(len(ids)))
+            detail_name = None
+        n_ineligible = data.get("n_ineligible", len(data.get("ineligible") or []))
+        try:
+            token = snapshot_method.write_token()
+            data["run_id"] = result_model.simpan_run(
+                method, data["criteria"], data["columns"], data["weights"], results,
+                pairwise=pairwise, cr_criteria=data.get("CR_criteria"),
+                cr_alternatives=data.get("CR_alternatives_avg"), duration_ms=duration_ms,
+                n_ineligible=n_ineligible, detail_name=detail_name, extra=data.get("summary"),
+                cache_key=data.get("cache_key"))
+            # tulis runs tidak mengubah nasabah: snapshot tetap valid
+            snapshot_method.absorb_write(token)
         except Exception as e:
-            messagebox.showerror("Error AHP Full", f"Gagal menghitung AHP Full:\n{e}")
+            data["run_id"] = None
+            data["run_error"] = str(e)
 
     # ---------------- Results Window ----------------
     def show_results_window(self):
@@ -1033,9 +1252,16 @@ class PerhitunganFrame(tk.Frame):
         criteria = data["criteria"]
         cols = data["columns"]
         results = data["results"]
-
+        if data.get("method") == "saw":
+            # input / hapus sejak Hitung SAW: hasil kolom + delta dari engine inkremental
+            engine = saw_incremental.get_engine()
+            if engine is not None and engine.base is results:
+                results = engine.results()
+        self._open_results_window("Hasil SAW - Ranking Nasabah", criteria, cols, results)
+
+    def _open_results_window(self, title, criteria, cols, results):
         win = tk.Toplevel(self)
-        win.title("Hasil SAW - Ranking Nasabah")
+        win.title(title)
         win.geometry("900x500")
 
         # top buttons
@@ -1046,25 +1272,28 @@ class PerhitunganFrame(tk.Frame):
 
         # treeview columns: Rank, ID, Nama, Score, then each criteria
         tree_cols = ["Rank", "ID", "Nama", "Score"] + criteria
-        tree = ttk.Treeview(win, columns=tree_cols, show="headings")
+        widths = {}
         for c in tree_cols:
-            tree.heading(c, text=c)
             # set width
             if c == "Nama":
-                tree.column(c, width=220)
+                widths[c] = {"width": 220}
             elif c == "Score":
-                tree.column(c, width=100, anchor="center")
+                widths[c] = {"width": 100, "anchor": "center"}
             elif c == "Rank":
-                tree.column(c, width=60, anchor="center")
+                widths[c] = {"width": 60, "anchor": "center"}
             else:
-                tree.column(c, width=120)
-        tree.pack(fill="both", expand=True, padx=6, pady=6)
+                widths[c] = {"width": 120}
+
+        # tabel virtual (lihat ui/virtual_table.py): baris dibaca per jendela dari hasil
+        table = VirtualTable(win, tree_cols, result_store.ResultPager(results), self._format_result_row(cols),
+                             widths=widths, sort_keys={"Rank": "rank"})
+        table.pack(fill="both", expand=True, padx=6, pady=6)
 
-        # insert rows
-        for item in results:
+    def _format_result_row(self, cols):
+        def format_row(item):
             row_vals = [item["rank"], item["id"], item["nama"], round(item["score"], 6)]
             # add readable labels for each criterion if mapping known
-            for j, raw in enumerate(item["raw_values"]):
+            for j, raw in enumerate(item.get("raw_values") or []):
                 colname = cols[j]
                 # map some known columns to friendly labels
                 if colname == "usia":
@@ -1078,7 +1307,8 @@ class PerhitunganFrame(tk.Frame):
                 else:
                     v = str(raw)
                 row_vals.append(v)
-            tree.insert("", "end", values=row_vals)
+            return str(item["id"]), row_vals
+        return format_row
 
     def _export_csv(self, results, criteria, cols):
         if not results:
@@ -1095,7 +1325,7 @@ class PerhitunganFrame(tk.Frame):
                 for item in results:
                     row = [item["rank"], item["id"], item["nama"], f"{item['score']:.6f}"]
                     # write raw values (or mapped labels)
-                    for j, raw in enumerate(item["raw_values"]):
+                    for j, raw in enumerate(item.get("raw_values") or []):
                         colname = cols[j]
                         if colname == "usia":
                             v = {1:"<25",2:"25-35",3:"36-50",4:">50"}.get(int(raw), raw)
@@ -1112,3 +1342,74 @@ class PerhitunganFrame(tk.Frame):
             messagebox.showinfo("Sukses", f"Hasil berhasil diexport ke {file_path}")
         except Exception as e:
             messagebox.showerror("Error export", f"Gagal menyimpan CSV: {e}")
+
+    # ---------------- Riwayat perhitungan ----------------
+    def show_runs_window(self):
+        """Daftar run tersimpan; tampilkan / export hasil langsung dari tabel run_results."""
+        try:
+            runs = result_model.ambil_runs(limit=200)
+        except Exception as e:
+            messagebox.showerror("Error", f"Gagal membaca riwayat perhitungan: {e}")
+            return
+        if not runs:
+            messagebox.showinfo("Info", "Belum ada perhitungan yang tersimpan.")
+            return
+
+        win = tk.Toplevel(self)
+        win.title("Riwayat Perhitungan")
+        win.geometry("900x400")
+
+        tree_cols = ["Run", "Metode", "Waktu", "Jumlah", "Tidak Memenuhi", "CR Kriteria", "CR Alternatif", "Durasi (ms)"]
+        tree = ttk.Treeview(win, columns=tree_cols, show="headings")
+        for c in tree_cols:
+            tree.heading(c, text=c)
+            tree.column(c, width=160 if c == "Waktu" else 100, anchor="center")
+
+        def fmt(v, spec):
+            return format(v, spec) if v is not None else "-"
+
+        for r in runs:
+            run_id, method, created_at, n_results, n_inel, cr_c, cr_a, dur = r
+            tree.insert("", "end", iid=str(run_id), values=[
+                run_id, method, created_at, fmt(n_results, "d"), fmt(n_inel, "d"),
+                fmt(cr_c, ".4f"), fmt(cr_a, ".4f"), fmt(dur, ".1f")])
+
+        def selected_run():
+            sel = tree.selection()
+            if not sel:
+                messagebox.showinfo("Info", "Pilih salah satu run terlebih dahulu.")
+                return None, None
+            meta, store = result_model.load_result_store(int(sel[0]))
+            if meta is None:
+                messagebox.showinfo("Info", "Run tidak ditemukan (mungkin sudah dihapus).")
+                return None, None
+            return meta, store
+
+        def show_run():
+            meta, store = selected_run()
+            if meta is not None:
+                self._open_results_window(f"Hasil Run #{meta['id']} ({meta['method']}, {meta['created_at']})",
+                                          meta["criteria"], meta["columns"], store)
+
+        def export_run():
+            meta, store = selected_run()
+            if meta is not None:
+                self._export_csv(store, meta["criteria"], meta["columns"])
+
+        def delete_run():
+            sel = tree.selection()
+            if not sel:
+                return
+            if messagebox.askyesno("Konfirmasi", f"Hapus run #{sel[0]} beserta hasilnya?"):
+                token = snapshot_method.write_token()
+                result_model.hapus_run(int(sel[0]))
+                snapshot_method.absorb_write(token)
+                tree.delete(sel[0])
+
+        btns = tk.Frame(win)
+        btns.pack(fill="x", pady=6, padx=6)
+        ttk.Button(btns, text="Tampilkan", command=show_run).pack(side="left", padx=6)
+        ttk.Button(btns, text="Export CSV", command=export_run).pack(side="left", padx=6)
+        ttk.Button(btns, text="Hapus", command=delete_run).pack(side="left", padx=6)
+        ttk.Button(btns, text="Tutup", command=win.destroy).pack(side="right", padx=6)
+        tree.pack(fill="both", expand=True, padx=6, pady=6)
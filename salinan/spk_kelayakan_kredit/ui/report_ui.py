@@ -6,6 +6,13 @@ import openpyxl
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from models import database
+from models import nasabah_query
+from ui.virtual_table import VirtualTable
+
+USIA_LABELS = {1: "<25 tahun", 2: "25-35 tahun", 3: "36-50 tahun", 4: ">50 tahun"}
+PENDAPATAN_LABELS = {1: "<2 juta", 2: "2-5 juta", 3: "5-10 juta", 4: ">10 juta"}
+PEKERJAAN_LABELS = {1: "PNS/Karyawan Tetap", 2: "Wiraswasta", 3: "Buruh/Kontrak", 4: "Lainnya"}
+JAMINAN_LABELS = {1: "Sertifikat", 2: "BPKB", 3: "Tanpa Jaminan"}
 
 class ReportFrame(tk.Frame):
     def __init__(self, parent):
@@ -23,35 +30,32 @@ class ReportFrame(tk.Frame):
         tk.Button(btn_frame, text="Export Excel", command=self.export_excel, bg="#27ae60", fg="white").pack(side="left", padx=6)
         tk.Button(btn_frame, text="Export PDF", command=self.export_pdf, bg="#34495e", fg="white").pack(side="left", padx=6)
 
-        self.tree = ttk.Treeview(self, columns=("id","nama","usia","pendapatan","pekerjaan","jaminan"), show="headings")
-        for col, w in [("id",50),("nama",180),("usia",120),("pendapatan",120),("pekerjaan",160),("jaminan",160)]:
-            self.tree.heading(col, text=col.capitalize())
-            self.tree.column(col, width=w)
-        self.tree.pack(fill="both", expand=True, padx=12, pady=8)
+        # tabel virtual (lihat ui/virtual_table.py): data per page dari DB, sort lewat heading
+        self.pager = nasabah_query.NasabahPager()
+        cols = ("Id", "Nama", "Usia", "Pendapatan", "Pekerjaan", "Jaminan")
+        widths = {c: {"width": w} for c, w in zip(cols, (50, 180, 120, 120, 160, 160))}
+        sort_keys = dict(zip(cols, nasabah_query.COLUMNS))
+        self.table = VirtualTable(self, cols, self.pager, self._format_row, widths=widths, sort_keys=sort_keys)
+        self.table.pack(fill="both", expand=True, padx=12, pady=8)
+        self.tree = self.table.tree
 
     def load_data(self):
-        for r in self.tree.get_children():
-            self.tree.delete(r)
-        conn = database.get_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT id, nama, usia, pendapatan, pekerjaan, jaminan FROM nasabah")
-        rows = cur.fetchall()
-        conn.close()
+        self.table.refresh()
 
-        usia_map = {1: "<25 tahun", 2: "25-35 tahun", 3: "36-50 tahun", 4: ">50 tahun"}
-        pend_map = {1: "<2 juta", 2: "2-5 juta", 3: "5-10 juta", 4: ">10 juta"}
-        kerja_map = {1: "PNS/Karyawan Tetap", 2: "Wiraswasta", 3: "Buruh/Kontrak", 4: "Lainnya"}
-        jam_map = {1: "Sertifikat", 2: "BPKB", 3: "Tanpa Jaminan"}
+    def _format_row(self, row):
+        id_, nama, usia, pend, kerja, jam = row
+        return str(id_), (
+            id_, nama,
+            USIA_LABELS.get(usia, usia),
+            PENDAPATAN_LABELS.get(pend, pend),
+            PEKERJAAN_LABELS.get(kerja, kerja),
+            JAMINAN_LABELS.get(jam, jam)
+        )
 
-        for row in rows:
-            id_, nama, usia, pend, kerja, jam = row
-            self.tree.insert("", "end", values=(
-                id_, nama,
-                usia_map.get(usia, usia),
-                pend_map.get(pend, pend),
-                kerja_map.get(kerja, kerja),
-                jam_map.get(jam, jam)
-            ))
+    def _all_values(self):
+        # semua baris dalam urutan sort tabel, tanpa lewat Treeview
+        for row in self.pager.iter_all():
+            yield self._format_row(row)[1]
 
     def export_excel(self):
         file_path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel files","*.xlsx")])
@@ -60,8 +64,8 @@ class ReportFrame(tk.Frame):
         wb = openpyxl.Workbook()
         ws = wb.active
         ws.append(["ID","Nama","Usia","Pendapatan","Pekerjaan","Jaminan"])
-        for iid in self.tree.get_children():
-            ws.append(self.tree.item(iid)["values"])
+        for vals in self._all_values():
+            ws.append(list(vals))
         wb.save(file_path)
         messagebox.showinfo("Sukses", f"Disimpan ke {file_path}")
 
@@ -81,8 +85,7 @@ class ReportFrame(tk.Frame):
             c.drawString(x_positions[i], y, h)
         y -= 20
         c.setFont("Helvetica", 9)
-        for iid in self.tree.get_children():
-            vals = self.tree.item(iid)["values"]
+        for vals in self._all_values():
             for i, v in enumerate(vals):
                 c.drawString(x_positions[i], y, str(v))
             y -= 15
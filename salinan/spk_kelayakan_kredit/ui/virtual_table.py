@@ -0,0 +1,177 @@
+# ui/virtual_table.py
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualTable(tk.Frame):
+    """
+    Treeview virtual: hanya baris yang terlihat (+ overscan) yang ada di Treeview,
+    data dibaca per posisi dari source saat di-scroll.
+
+    source: punya count(), rows(start, n), set_sort(kolom_db, desc) dan atribut
+            sort / desc (mis. models.nasabah_query.NasabahPager)
+    format_row(row) -> (iid, values) untuk Treeview
+    sort_keys: {kolom tabel: kolom db} untuk kolom yang bisa di-sort (klik heading)
+    on_sort(kolom_db, desc): pengganti source.set_sort (mis. sort dibaca di thread latar,
+            hasilnya dipasang dengan set_source)
+    """
+
+    def __init__(self, parent, columns, source, format_row, widths=None, sort_keys=None,
+                 overscan=5, on_sort=None, **tree_kw):
+        super().__init__(parent)
+        self.columns = tuple(columns)
+        self.source = source
+        self.format_row = format_row
+        self.sort_keys = dict(sort_keys or {})
+        self.on_sort = on_sort
+        # sort terakhir yang diminta (klik heading berikutnya membalik arah)
+        self._sort = (source.sort, source.desc)
+        self.overscan = overscan
+        self.first = 0
+        self._rowheight = None
+        self._header = 0
+        self._visible = 20
+        self._pending = False
+        self._focus_index = None
+
+        self.tree = ttk.Treeview(self, columns=self.columns, show="headings", **tree_kw)
+        for c in self.columns:
+            self.tree.heading(c, text=c)
+            if c in self.sort_keys:
+                self.tree.heading(c, command=lambda c=c: self.sort_by(c))
+            if widths and c in widths:
+                self.tree.column(c, **widths[c])
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.tree.bind("<Configure>", lambda e: self._schedule())
+        # scroll diatur sendiri (Treeview hanya berisi jendela baris)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_units(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_units(3))
+        self.tree.bind("<Prior>", lambda e: self._scroll_units(-self._visible))
+        self.tree.bind("<Next>", lambda e: self._scroll_units(self._visible))
+        self.tree.bind("<Home>", lambda e: self.scroll_to(0))
+        self.tree.bind("<End>", lambda e: self.scroll_to(self.source.count()))
+        self.tree.bind("<Up>", lambda e: self._on_arrow(-1))
+        self.tree.bind("<Down>", lambda e: self._on_arrow(1))
+
+    # ---------------- data ----------------
+    def refresh(self, keep_position=True):
+        """Baca ulang data dari source (setelah insert / hapus / import)."""
+        self.source.refresh()
+        if not keep_position:
+            self.first = 0
+        self.render()
+
+    def set_source(self, source):
+        """Ganti source (mis. pager hasil cari yang sudah berisi page pertama), mulai dari atas."""
+        self.source = source
+        self._sort = (source.sort, source.desc)
+        self.first = 0
+        self.render()
+
+    def redraw(self):
+        """Gambar ulang jendela saat ini tanpa membuang cache source (mis. simbol ceklist berubah)."""
+        self.render()
+
+    def visible_rows(self):
+        """Baris source yang sedang ada di Treeview."""
+        return self.source.rows(self.first, self._visible + self.overscan)
+
+    def sort_by(self, column):
+        key = self.sort_keys[column]
+        desc = (not self._sort[1]) if self._sort[0] == key else False
+        self._sort = (key, desc)
+        for c, k in self.sort_keys.items():
+            arrow = (" ▼" if desc else " ▲") if k == key else ""
+            self.tree.heading(c, text=c + arrow)
+        if self.on_sort is not None:
+            self.on_sort(key, desc)
+            return
+        self.source.set_sort(key, desc)
+        self.first = 0
+        self.render()
+
+    # ---------------- scroll ----------------
+    def scroll_to(self, first):
+        total = self.source.count()
+        self.first = max(0, min(int(first), total - self._visible))
+        self._schedule()
+        return "break"
+
+    def _scroll_units(self, n):
+        return self.scroll_to(self.first + n)
+
+    def _on_wheel(self, event):
+        # Windows / macOS: delta kelipatan 120 (atau kecil di macOS)
+        step = -event.delta // 120 if abs(event.delta) >= 120 else -event.delta
+        return self._scroll_units(step * 3)
+
+    def _on_arrow(self, step):
+        # pindah fokus; di tepi jendela, jendela digeser
+        children = self.tree.get_children()
+        focus = self.tree.focus()
+        if not children:
+            return "break"
+        idx = children.index(focus) if focus in children else -1
+        target = idx + step
+        limit = min(len(children), self._visible) - 1
+        if target < 0:
+            self.scroll_to(self.first - 1)
+            target = 0
+        elif target > limit:
+            self.scroll_to(self.first + 1)
+            target = limit
+        self._focus_index = target
+        self.after_idle(self._restore_focus)
+        return "break"
+
+    def _restore_focus(self):
+        children = self.tree.get_children()
+        idx = self._focus_index
+        if idx is not None and 0 <= idx < len(children):
+            self.tree.focus(children[idx])
+            self.tree.selection_set(children[idx])
+
+    def _on_scrollbar(self, *args):
+        total = self.source.count()
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * total)
+        elif args[0] == "scroll":
+            n = int(args[1])
+            self._scroll_units(n * self._visible if args[2] == "pages" else n)
+
+    # ---------------- render ----------------
+    def _schedule(self):
+        # event scroll beruntun (drag scrollbar) digabung jadi satu render
+        if not self._pending:
+            self._pending = True
+            self.after_idle(self.render)
+
+    def _measure(self):
+        # tinggi heading + baris dibaca dari baris pertama yang sudah tampil
+        children = self.tree.get_children()
+        if children:
+            bbox = self.tree.bbox(children[0])
+            if bbox:
+                self._header, self._rowheight = bbox[1], bbox[3]
+        height = self.tree.winfo_height()
+        if self._rowheight and height > 1:
+            self._visible = max(1, (height - self._header) // self._rowheight)
+
+    def render(self):
+        self._pending = False
+        self._measure()
+        total = self.source.count()
+        self.first = max(0, min(self.first, total - self._visible))
+        rows = self.visible_rows()
+        self.tree.delete(*self.tree.get_children())
+        for row in rows:
+            iid, values = self.format_row(row)
+            self.tree.insert("", "end", iid=iid, values=values)
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + self._visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)